@@ -0,0 +1,51 @@
+"""
+Adversarial benchmark: hash flooding with and without a seed
+
+The table is sized for n keys up front, so its capacity does not change,
+then it gets n keys which are multiples of that capacity: without a seed
+they all share one home bucket. Random keys are the baseline. Printed is
+the throughput of n puts followed by n gets.
+
+usage: python bench_adversarial.py [n ...]
+"""
+import random
+import sys
+import time
+from ht_linear_probing import HashTableLinearProbing
+from ht_separate_chaining import HashTableSeparateChaining
+
+
+def ops_per_sec(ht, keys) -> float:
+    start = time.perf_counter()
+    for k in keys:
+        ht.put(k, k)
+    for k in keys:
+        ht.get(k)
+    return 2 * len(keys) / (time.perf_counter() - start)
+
+
+def main(sizes):
+    tables = [
+        ("HashTableSeparateChaining", HashTableSeparateChaining),
+        ("HashTableLinearProbing", HashTableLinearProbing),
+    ]
+    for n in sizes:
+        for name, cls in tables:
+            # capacity of a table sized for n keys
+            sized = cls()
+            sized.reserve(n)
+            workloads = [
+                ("random", random.sample(range(1 << 60), n)),
+                ("multiples", [i * sized.capacity for i in range(n)]),
+            ]
+            for seeded in (False, True):
+                for keys_name, keys in workloads:
+                    ht = cls(seeded=seeded)
+                    ht.reserve(n)
+                    rate = ops_per_sec(ht, keys)
+                    label = f"{name} seeded={seeded}"
+                    print(f"{label:<40} {keys_name:<10} n={n:<8} {rate:12,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [3_000])
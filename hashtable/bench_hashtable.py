@@ -0,0 +1,219 @@
+"""
+Benchmark: hashtable strategies against dict
+
+Every table runs every workload on n keys:
+
+    insert   n puts of new keys into an empty table
+    lookup   n gets of present keys
+    miss     n gets of absent keys
+    churn    n rounds of remove one key, put a new one
+    mixed    n random operations: 70% get, 20% put, 10% remove
+
+and reports the throughput (best of --repeat runs), the p99 latency of a
+single operation (from a separate run where every operation is timed) and
+the peak memory of the table (tracemalloc, a third run which builds the
+table and runs the workload).
+Keys come from a seeded generator, so runs are reproducible.
+
+--save writes the results to a JSON file, --compare reads such a file and
+marks the throughputs which dropped by more than --tolerance.
+
+usage: python bench_hashtable.py [--sizes 1e3 1e5] [--tables dict lp]
+           [--workloads lookup miss] [--keys int|str] [--repeat 3]
+           [--save out.json] [--compare base.json]
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from ht_double_hashing import HashTableDoubleHashing
+from ht_linear_probing import HashTableLinearProbing
+from ht_quadratic_probing import HashTableQuadraticProbing
+from ht_separate_chaining import HashTableSeparateChaining
+
+
+class Dict(dict):
+    def put(self, k, v):
+        self[k] = v
+
+    def remove(self, k):
+        return self.pop(k, None)
+
+
+TABLES = {
+    "dict": Dict,
+    "lp": HashTableLinearProbing,
+    "qp": HashTableQuadraticProbing,
+    "dh": HashTableDoubleHashing,
+    "sc": HashTableSeparateChaining,
+}
+
+
+def make_keys(rng, n, kind):
+    ints = rng.sample(range(1 << 62), n)
+    if kind == "str":
+        return [f"key:{x}" for x in ints]
+    return ints
+
+
+# returns the keys the table holds before the workload starts and the list
+# of operations of the workload as (function name, key) pairs
+def prepare(workload, n, keys, absent, rng):
+    if workload == "insert":
+        return [], [("put", k) for k in keys]
+
+    if workload == "lookup":
+        ops = [("get", k) for k in keys]
+        rng.shuffle(ops)
+    elif workload == "miss":
+        ops = [("get", k) for k in absent]
+    elif workload == "churn":
+        ops = []
+        for old, new in zip(keys, absent):
+            ops.append(("remove", old))
+            ops.append(("put", new))
+    elif workload == "mixed":
+        live = list(keys)
+        ops = []
+        for i in range(n):
+            x = rng.random()
+            if x < 0.7:
+                ops.append(("get", rng.choice(live)))
+            elif x < 0.9:
+                ops.append(("put", absent[i]))
+                live.append(absent[i])
+            else:
+                ops.append(("remove", rng.choice(live)))
+    else:
+        raise ValueError(f"Unknown workload: {workload}")
+    return keys, ops
+
+
+def build(factory, keys):
+    ht = factory()
+    for k in keys:
+        ht.put(k, k)
+    return ht
+
+
+def run(ht, ops):
+    put = ht.put
+    get = ht.get
+    remove = ht.remove
+    for name, k in ops:
+        if name == "get":
+            get(k)
+        elif name == "put":
+            put(k, k)
+        else:
+            remove(k)
+
+
+# every operation timed on its own
+def latencies(ht, ops):
+    clock = time.perf_counter_ns
+    fns = {"get": ht.get, "remove": ht.remove}
+    put = ht.put
+    out = []
+    for name, k in ops:
+        if name == "put":
+            start = clock()
+            put(k, k)
+        else:
+            fn = fns[name]
+            start = clock()
+            fn(k)
+        out.append(clock() - start)
+    return out
+
+
+def percentile(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(len(xs) * p))]
+
+
+def measure(workload, factory, n, key_kind, repeat, seed):
+    rng = random.Random(seed)
+    keys = make_keys(rng, 2 * n, key_kind)
+    keys, absent = keys[:n], keys[n:]
+
+    setup, ops = prepare(workload, n, keys, absent, random.Random(seed))
+
+    best = float("inf")
+    for _ in range(repeat):
+        ht = build(factory, setup)
+        start = time.perf_counter()
+        run(ht, ops)
+        best = min(best, time.perf_counter() - start)
+
+    p99 = percentile(latencies(build(factory, setup), ops), 0.99)
+
+    # the table only, keys and operations exist already
+    tracemalloc.start()
+    run(build(factory, setup), ops)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": len(ops) / best,
+        "p99_ns": p99,
+        "peak_bytes": peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e3, 1e4, 1e5])
+    parser.add_argument("--tables", nargs="+", choices=TABLES, default=list(TABLES))
+    parser.add_argument(
+        "--workloads",
+        nargs="+",
+        choices=["insert", "lookup", "miss", "churn", "mixed"],
+        default=["insert", "lookup", "miss", "churn", "mixed"],
+    )
+    parser.add_argument("--keys", choices=["int", "str"], default="int")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=12345)
+    parser.add_argument("--save")
+    parser.add_argument("--compare")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(
+        f"{'table':<6} {'workload':<8} {'n':>9} {'ops/s':>12} "
+        f"{'p99 ns':>9} {'peak MB':>9}"
+    )
+    for size in args.sizes:
+        n = int(size)
+        for workload in args.workloads:
+            for table in args.tables:
+                factory = TABLES[table]
+                r = measure(workload, factory, n, args.keys, args.repeat, args.seed)
+                name = f"{table}/{workload}/{n}/{args.keys}"
+                results[name] = r
+
+                note = ""
+                if name in baseline:
+                    ratio = r["ops_per_sec"] / baseline[name]["ops_per_sec"]
+                    note = f"  {ratio - 1:+.0%}"
+                    if ratio < 1 - args.tolerance:
+                        note += " REGRESSION"
+                print(
+                    f"{table:<6} {workload:<8} {n:>9} {r['ops_per_sec']:>12,.0f} "
+                    f"{r['p99_ns']:>9} {r['peak_bytes'] / 1e6:>9.1f}{note}"
+                )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
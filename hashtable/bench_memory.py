@@ -0,0 +1,44 @@
+"""
+Memory benchmark: bytes per entry of the hashtables
+
+Only memory allocated by the table itself is counted, the keys and values
+are created before the measurement starts.
+
+usage: python bench_memory.py [n ...]
+"""
+import sys
+import tracemalloc
+from ht_linear_probing import HashTableLinearProbing
+from ht_separate_chaining import HashTableSeparateChaining
+
+
+def bytes_per_entry(factory, n: int) -> float:
+    keys = [f"key{i}" for i in range(n)]
+    values = list(range(n))
+    tracemalloc.start()
+    ht = factory()
+    for k, v in zip(keys, values):
+        ht.put(k, v)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / n
+
+
+class Dict(dict):
+    def put(self, k, v):
+        self[k] = v
+
+
+def main(sizes):
+    tables = [
+        ("dict", Dict),
+        ("HashTableSeparateChaining", HashTableSeparateChaining),
+        ("HashTableLinearProbing", HashTableLinearProbing),
+    ]
+    for n in sizes:
+        for name, factory in tables:
+            print(f"{name:<28} n={n:<10} {bytes_per_entry(factory, n):8.1f} B/entry")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [100_000])
@@ -0,0 +1,346 @@
+"""
+HashTable Separate Chaining: bounded cache
+
+A separate chaining table which holds at most max_size keys. The entries are
+threaded on a doubly linked list (entry_prev / entry_after, indexed like the
+other entry arrays), the first entry of the list is evicted when a new key
+does not fit. A hit finds the entry and reorders the list with one lookup.
+
+The order of the list is kept by a policy:
+
+    LRUPolicy       least recently used first
+    LFUPolicy       least frequently used first, LRU among equal counts
+    TinyLFUPolicy   LRU order, but a new key is only admitted if it was
+                    accessed more often than the key it would evict.
+                    Frequencies are estimated by a count-min sketch
+
+https://en.wikipedia.org/wiki/Cache_replacement_policies
+https://arxiv.org/abs/1512.00727 (TinyLFU)
+"""
+import random
+from array import array
+from ht_hashing import mix64
+from ht_separate_chaining import HashTableSeparateChaining
+
+
+class LRUPolicy:
+    cache = None
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def clear(self):
+        pass
+
+    # a new entry, the most recently used one
+    def added(self, e):
+        self.cache.list_insert_after(self.cache.last, e)
+
+    def touched(self, e):
+        cache = self.cache
+        if cache.last != e:
+            cache.list_unlink(e)
+            cache.list_insert_after(cache.last, e)
+
+    # called before the entry leaves the list
+    def removed(self, e):
+        pass
+
+    # every get and put of the key
+    def accessed(self, key_hash):
+        pass
+
+    # whether a new key may evict the victim entry
+    def admit(self, key_hash, victim) -> bool:
+        return True
+
+
+class LFUPolicy(LRUPolicy):
+    # use count of every entry
+    freq = None
+    # count => last entry with that count. Entries with the same count form
+    # a run in the list, the runs are ordered by count
+    tails = None
+
+    def __init__(self, cache):
+        super().__init__(cache)
+        self.clear()
+
+    def clear(self):
+        self.freq = array("q")
+        self.tails = {}
+
+    # the entry becomes the last of the run with count 1
+    def added(self, e):
+        freq = self.freq
+        if e == len(freq):
+            freq.append(1)
+        else:
+            freq[e] = 1
+        self.cache.list_insert_after(self.tails.get(1, -1), e)
+        self.tails[1] = e
+
+    # moves the entry from the end of its run to the end of the next one
+    def touched(self, e):
+        cache = self.cache
+        f = self.freq[e]
+        anchor = self.tails.get(f + 1)
+        old_tail = self.tails[f]
+        self.leave_run(e, f)
+        if anchor is None:
+            anchor = old_tail if old_tail != e else cache.entry_prev[e]
+        if anchor != e:
+            cache.list_unlink(e)
+            cache.list_insert_after(anchor, e)
+        self.freq[e] = f + 1
+        self.tails[f + 1] = e
+
+    def removed(self, e):
+        self.leave_run(e, self.freq[e])
+
+    def leave_run(self, e, f):
+        if self.tails[f] == e:
+            prev = self.cache.entry_prev[e]
+            if prev != -1 and self.freq[prev] == f:
+                self.tails[f] = prev
+            else:
+                del self.tails[f]
+
+
+class TinyLFUPolicy(LRUPolicy):
+    # rows of the count-min sketch
+    DEPTH = 4
+    # 4 bit counters in the paper
+    MAX_COUNT = 15
+
+    rows = None
+    seeds = None
+    width_mask = 0
+    # number of increments, all counters are halved at sample_size so that
+    # old popularity fades
+    additions = 0
+    sample_size = 0
+
+    def __init__(self, cache):
+        super().__init__(cache)
+        width = 1 << max(4, (4 * cache.max_size - 1).bit_length())
+        self.width_mask = width - 1
+        self.sample_size = 10 * cache.max_size
+        self.seeds = [random.getrandbits(64) for _ in range(self.DEPTH)]
+        self.clear()
+
+    def clear(self):
+        self.rows = [bytearray(self.width_mask + 1) for _ in range(self.DEPTH)]
+        self.additions = 0
+
+    def accessed(self, key_hash):
+        mask = self.width_mask
+        for row, seed in zip(self.rows, self.seeds):
+            i = mix64(key_hash ^ seed) & mask
+            if row[i] < self.MAX_COUNT:
+                row[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.age()
+
+    def estimate(self, key_hash) -> int:
+        mask = self.width_mask
+        return min(
+            row[mix64(key_hash ^ seed) & mask]
+            for row, seed in zip(self.rows, self.seeds)
+        )
+
+    def age(self):
+        self.rows = [bytearray(x >> 1 for x in row) for row in self.rows]
+        self.additions //= 2
+
+    def admit(self, key_hash, victim) -> bool:
+        victim_hash = self.cache.entry_hashes[victim]
+        return self.estimate(key_hash) > self.estimate(victim_hash)
+
+
+class HashTableCache(HashTableSeparateChaining):
+    POLICIES = {"lru": LRUPolicy, "lfu": LFUPolicy, "tinylfu": TinyLFUPolicy}
+
+    max_size = 0
+    policy = None
+
+    # recency list, -1 ends it
+    entry_prev = None
+    entry_after = None
+    first = -1
+    last = -1
+
+    hits = 0
+    misses = 0
+    evictions = 0
+    # new keys turned away by the admission policy
+    rejections = 0
+
+    # policy is a name from POLICIES or a policy class
+    def __init__(
+        self, max_size, policy="lru", max_load_factor=0.75, seeded=False, seed=None
+    ):
+        if max_size is None or max_size <= 0:
+            raise ValueError("Max size must be > 0 and not None")
+        if isinstance(policy, str):
+            if policy not in self.POLICIES:
+                raise ValueError(f"Unknown policy: {policy}")
+            policy = self.POLICIES[policy]
+        self.max_size = max_size
+        # the chains are sized for max_size, the cache never resizes
+        capacity = max(3, int(max_size / max_load_factor) + 1)
+        self.policy = policy(self)
+        super().__init__(capacity, max_load_factor, seeded=seeded, seed=seed)
+
+    def clear(self):
+        super().clear()
+        self.entry_prev = array("q")
+        self.entry_after = array("q")
+        self.first = self.last = -1
+        self.policy.clear()
+
+    # the chains are sized for max_size, a batch never grows the table
+    def reserve(self, n):
+        pass
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = self.rejections = 0
+
+    def hit_rate(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+    # the entry indices are part of the recency list and the policy state,
+    # so the cache is pickled as it is, without the compaction of the base.
+    # The hash function of a seeded cache is a closure, it is made again
+    # from the seed
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("hash_key", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.seed is not None:
+            self.use_seed(self.seed)
+
+    # recency list
+    def list_insert_after(self, anchor, e):
+        entry_prev = self.entry_prev
+        entry_after = self.entry_after
+        after = self.first if anchor == -1 else entry_after[anchor]
+        entry_prev[e] = anchor
+        entry_after[e] = after
+        if anchor == -1:
+            self.first = e
+        else:
+            entry_after[anchor] = e
+        if after == -1:
+            self.last = e
+        else:
+            entry_prev[after] = e
+
+    def list_unlink(self, e):
+        prev = self.entry_prev[e]
+        after = self.entry_after[e]
+        if prev == -1:
+            self.first = after
+        else:
+            self.entry_after[prev] = after
+        if after == -1:
+            self.last = prev
+        else:
+            self.entry_prev[after] = prev
+
+    def alloc_entry(self, key_hash, key, value, next_) -> int:
+        e = super().alloc_entry(key_hash, key, value, next_)
+        if e == len(self.entry_prev):
+            self.entry_prev.append(-1)
+            self.entry_after.append(-1)
+        return e
+
+    # looks the key up without counting a hit or changing the order
+    def peek(self, key):
+        if key is None:
+            return None
+        key_hash = self.hash_key(key)
+        e = self.seek(self.heads[abs(key_hash) % self.capacity], key_hash, key)
+        return self.entry_values[e] if e != -1 else None
+
+    def get(self, key):
+        if key is None:
+            return None
+        key_hash = self.hash_key(key)
+        e = self.seek(self.heads[abs(key_hash) % self.capacity], key_hash, key)
+        self.policy.accessed(key_hash)
+        if e == -1:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.policy.touched(e)
+        return self.entry_values[e]
+
+    # returns the old value of the key or None. A new key evicts the first
+    # entry of the list when the cache is full, unless the policy does not
+    # admit it; then it is not stored at all
+    def insert(self, key, value):
+        if key is None:
+            raise ValueError("Key is None")
+        key_hash = self.hash_key(key)
+        heads = self.heads
+        bucket_index = abs(key_hash) % self.capacity
+        e = self.seek(heads[bucket_index], key_hash, key)
+        self.policy.accessed(key_hash)
+        if e != -1:
+            old_val = self.entry_values[e]
+            self.entry_values[e] = value
+            self.policy.touched(e)
+            self.modification_count += 1
+            return old_val
+
+        if self.sz >= self.max_size:
+            victim = self.first
+            if not self.policy.admit(key_hash, victim):
+                self.rejections += 1
+                return None
+            self.evict(victim)
+            self.evictions += 1
+
+        e = self.link(heads, bucket_index, key_hash, key, value)
+        self.sz += 1
+        self.policy.added(e)
+        self.modification_count += 1
+        return None
+
+    def remove(self, key):
+        if key is None:
+            return None
+        key_hash = self.hash_key(key)
+        e = self.unlink(self.heads, abs(key_hash) % self.capacity, key_hash, key)
+        if e == -1:
+            return None
+        value = self.entry_values[e]
+        self.drop(e)
+        self.modification_count += 1
+        return value
+
+    def evict(self, e):
+        key_hash = self.entry_hashes[e]
+        bucket_index = abs(key_hash) % self.capacity
+        self.unlink(self.heads, bucket_index, key_hash, self.entry_keys[e])
+        self.drop(e)
+
+    # takes an entry which is out of its chain off the list
+    def drop(self, e):
+        self.policy.removed(e)
+        self.list_unlink(e)
+        self.free_entry(e)
+        self.sz -= 1
+
+    # keys from the first to be evicted to the last
+    def __iter__(self):
+        e = self.first
+        while e != -1:
+            yield self.entry_keys[e]
+            e = self.entry_after[e]
@@ -0,0 +1,217 @@
+"""
+HashTable Separate Chaining: concurrent
+
+Thread-safe separate chaining table. The buckets are split into STRIPES
+contiguous ranges and every range has its own lock, so writers of different
+ranges do not wait for each other. Only taking an entry from (or returning
+it to) the shared entry arrays goes through a short global lock.
+
+Reads take no lock. Every stripe has a version counter which its writers
+make odd before they change a chain and even again afterwards (a seqlock).
+A reader remembers the version, walks the chain and checks the version did
+not change; if it did, or the stripe was being written, the read is repeated
+under the lock. Entries are never moved while a chain is walked, a removed
+entry can only be reused after the writer bumped the version, so a reader
+can get a stale answer but never a wrong one.
+
+A resize takes all stripe locks in order, and bumps resize_version the same
+way, so optimistic reads which overlap a resize are repeated as well.
+Incremental resizing is not supported: it would move chains on reads.
+"""
+import threading
+from contextlib import contextmanager
+from ht_separate_chaining import HashTableSeparateChaining
+
+
+class HashTableConcurrent(HashTableSeparateChaining):
+    STRIPES = 16
+
+    stripes = 0
+    locks = None
+    # seqlock version of every stripe, odd while a writer changes a chain
+    versions = None
+    # odd while the table is resized
+    resize_version = 0
+    # guards the free list, the entry arrays when they grow, and sz
+    alloc_lock = None
+    # only one thread resizes
+    resize_lock = None
+
+    def __init__(
+        self,
+        capacity=16,
+        max_load_factor=0.75,
+        stripes=STRIPES,
+        seeded=False,
+        seed=None,
+    ):
+        if stripes is None or stripes <= 0:
+            raise ValueError("Stripes must be > 0 and not None")
+        # clear() in the base constructor already takes the locks
+        self.init_locks(stripes)
+        super().__init__(capacity, max_load_factor, seeded=seeded, seed=seed)
+
+    def init_locks(self, stripes):
+        self.stripes = stripes
+        self.locks = [threading.Lock() for _ in range(stripes)]
+        self.versions = [0] * stripes
+        self.alloc_lock = threading.Lock()
+        self.resize_lock = threading.Lock()
+
+    # stripe of a bucket, the stripes are contiguous bucket ranges
+    def stripe(self, bucket_index, capacity) -> int:
+        return bucket_index * self.stripes // capacity
+
+    # takes the lock of the stripe the key hash belongs to, returns the
+    # stripe and the bucket index. Retries when a resize moved the bucket
+    # while waiting for the lock
+    def lock_bucket(self, key_hash):
+        while True:
+            capacity = self.capacity
+            bucket_index = abs(key_hash) % capacity
+            s = self.stripe(bucket_index, capacity)
+            self.locks[s].acquire()
+            if self.capacity == capacity:
+                return s, bucket_index
+            self.locks[s].release()
+
+    # holds all stripe locks, nothing else changes the table meanwhile
+    @contextmanager
+    def locked(self):
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self.locks):
+                lock.release()
+
+    # returns (found, value). Optimistic read first, locked read if a
+    # writer or a resize got in the way
+    def read(self, key_hash, key):
+        resize_version = self.resize_version
+        if resize_version & 1 == 0:
+            heads = self.heads
+            # not self.capacity, a resize may have replaced heads already
+            capacity = len(heads)
+            bucket_index = abs(key_hash) % capacity
+            s = self.stripe(bucket_index, capacity)
+            version = self.versions[s]
+            if version & 1 == 0:
+                try:
+                    e = self.seek(heads[bucket_index], key_hash, key)
+                    value = self.entry_values[e] if e != -1 else None
+                except IndexError:
+                    # clear() replaced the entry arrays under the reader
+                    e = value = None
+                if (
+                    e is not None
+                    and self.versions[s] == version
+                    and self.resize_version == resize_version
+                ):
+                    return e != -1, value
+
+        s, bucket_index = self.lock_bucket(key_hash)
+        try:
+            e = self.seek(self.heads[bucket_index], key_hash, key)
+            return e != -1, self.entry_values[e] if e != -1 else None
+        finally:
+            self.locks[s].release()
+
+    def has_key(self, key) -> bool:
+        return self.read(self.hash_key(key), key)[0]
+
+    def get(self, key):
+        if key is None:
+            return None
+        return self.read(self.hash_key(key), key)[1]
+
+    def insert(self, key, value):
+        if key is None:
+            raise ValueError("Key is None")
+        key_hash = self.hash_key(key)
+        s, bucket_index = self.lock_bucket(key_hash)
+        try:
+            heads = self.heads
+            e = self.seek(heads[bucket_index], key_hash, key)
+            if e != -1:
+                # a single store, readers see the old or the new value
+                old_val = self.entry_values[e]
+                self.entry_values[e] = value
+                return old_val
+
+            with self.alloc_lock:
+                e = self.alloc_entry(key_hash, key, value, heads[bucket_index])
+                self.sz += 1
+            # the entry is complete before the single store which makes it
+            # reachable, readers need no version bump for that
+            heads[bucket_index] = e
+        finally:
+            self.locks[s].release()
+
+        if self.sz > self.threshold:
+            self.resize_table()
+        return None
+
+    def remove(self, key):
+        if key is None:
+            return None
+        key_hash = self.hash_key(key)
+        s, bucket_index = self.lock_bucket(key_hash)
+        try:
+            self.versions[s] += 1
+            try:
+                e = self.unlink(self.heads, bucket_index, key_hash, key)
+                if e == -1:
+                    return None
+                value = self.entry_values[e]
+                with self.alloc_lock:
+                    self.free_entry(e)
+                    self.sz -= 1
+                return value
+            finally:
+                self.versions[s] += 1
+        finally:
+            self.locks[s].release()
+
+    def clear(self):
+        with self.locked():
+            self.resize_version += 1
+            super().clear()
+            self.resize_version += 1
+
+    # grows the table under all stripe locks. Called without a capacity it
+    # only doubles the table if it is still over the threshold, another
+    # thread may have resized it already
+    def resize_table(self, capacity=None):
+        with self.resize_lock:
+            if capacity is None and self.sz <= self.threshold:
+                return
+            with self.locked():
+                self.resize_version += 1
+                try:
+                    super().resize_table(capacity)
+                finally:
+                    self.resize_version += 1
+
+    # locks are not pickled, the restored table gets new ones
+    def __getstate__(self):
+        with self.locked():
+            state = super().__getstate__()
+        state["stripes"] = self.stripes
+        return state
+
+    def __setstate__(self, state):
+        self.init_locks(state["stripes"])
+        super().__setstate__(state)
+
+    # the views iterate over a snapshot taken under all locks, other threads
+    # can go on writing meanwhile
+    def iter_items(self):
+        with self.locked():
+            items = list(zip(self.entry_keys, self.entry_values))
+        return ((k, v) for k, v in items if k is not None)
+
+    def __str__(self):
+        with self.locked():
+            return super().__str__()
@@ -0,0 +1,110 @@
+"""
+HashTable Open Addressing: counter
+
+A linear probing table which maps keys to integer counts, a multiset.
+increment(k, delta) walks the probe sequence once: it adds delta to the
+count of the bucket where the key is found, or stores delta in the first
+free bucket, instead of get(k) followed by put(k, ...), which probes twice.
+A key whose count drops to 0 or below is removed, missing keys count 0.
+
+    ht = HashTableCounter()
+    ht.update(["a", "b", "a"])
+    ht.count("a")   # 2
+    ht.top_k(1)     # [("a", 2)]
+"""
+import heapq
+from ht_linear_probing import HashTableLinearProbing
+
+
+class HashTableCounter(HashTableLinearProbing):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def count(self, k) -> int:
+        value = self.get(k)
+        return 0 if value is None else value
+
+    # returns the new count of the key
+    def increment(self, k, delta=1) -> int:
+        if k is None:
+            raise ValueError("None key")
+
+        if self.used_buckets >= self.threshold:
+            self.resize_table()
+
+        h = self.hash_key(k)
+        if self.old_keys is not None:
+            self.migrate(self.migrate_step)
+            # the count in the old table moves to the new one, as in insert
+            if self.old_keys is not None:
+                i = self.find_old_slot(k, h)
+                if i != -1:
+                    delta += self.old_values[i]
+                    self.old_keys[i] = self.TOMBSTONE
+                    self.old_values[i] = None
+                    self.key_count -= 1
+                    self.modification_count += 1
+
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        mask = self.mask
+        capacity = self.capacity
+        tombstone = self.TOMBSTONE
+        step = self.LINEAR_CONSTANT
+        i = abs(h) & mask if mask else abs(h) % capacity
+        j = -1
+        while True:
+            key = keys[i]
+            if key is None:
+                break
+            if key is tombstone:
+                if j == -1:
+                    j = i
+            elif hashes[i] == h and (key is k or key == k):
+                values = self.slot_values
+                n = values[i] + delta
+                if n <= 0:
+                    self.remove(k)
+                    return 0
+                if j == -1:
+                    values[i] = n
+                else:
+                    # moved to the first deleted bucket, like insert does
+                    keys[i] = tombstone
+                    values[i] = None
+                    keys[j] = k
+                    values[j] = n
+                    hashes[j] = h
+                self.modification_count += 1
+                return n
+            i = (i + step) & mask if mask else (i + step) % capacity
+
+        if delta <= 0:
+            return 0
+        if j == -1:
+            self.used_buckets += 1
+        else:
+            i = j
+        keys[i] = k
+        hashes[i] = h
+        self.slot_values[i] = delta
+        self.key_count += 1
+        self.modification_count += 1
+        return delta
+
+    def decrement(self, k, delta=1) -> int:
+        return self.increment(k, -delta)
+
+    # counts every key of the iterable once
+    def update(self, keys):
+        increment = self.increment
+        for k in keys:
+            increment(k)
+
+    # sum of all counts
+    def total(self) -> int:
+        return sum(self.values())
+
+    # k pairs (key, count) with the highest counts, highest first
+    def top_k(self, k):
+        return heapq.nlargest(k, self.iter_items(), key=lambda item: item[1])
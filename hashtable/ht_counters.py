@@ -0,0 +1,94 @@
+"""
+HashTable Counters
+
+Optional instrumentation of the hashtables: number of operations, probe
+counts (chain entries inspected for separate chaining), their histogram,
+number and duration of resizes.
+
+Counters are attached at construction with instrument=True. They replace
+get/insert/remove/resize_table of that one table instance by counting
+wrappers, so a table without counters runs the plain methods and pays
+nothing.
+"""
+import time
+
+
+class HashTableCounters:
+    __slots__ = ("ops", "probes", "max_probes", "histogram", "resizes", "resize_time")
+
+    OPERATIONS = ("get", "insert", "remove")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.ops = dict.fromkeys(self.OPERATIONS, 0)
+        self.probes = dict.fromkeys(self.OPERATIONS, 0)
+        self.max_probes = dict.fromkeys(self.OPERATIONS, 0)
+        # probe count => number of operations with that many probes
+        self.histogram = {}
+        self.resizes = 0
+        # seconds spent in resize_table
+        self.resize_time = 0.0
+
+    def record(self, op, n):
+        self.ops[op] += 1
+        self.probes[op] += n
+        if n > self.max_probes[op]:
+            self.max_probes[op] = n
+        self.histogram[n] = self.histogram.get(n, 0) + 1
+
+    def avg_probes(self, op=None) -> float:
+        ops = self.OPERATIONS if op is None else (op,)
+        n = sum(self.ops[x] for x in ops)
+        if n == 0:
+            return 0.0
+        return sum(self.probes[x] for x in ops) / n
+
+    # wraps the operations of the table instance, probes are counted before
+    # the operation changes the table
+    def attach(self, table):
+        get = table.get
+        insert = table.insert
+        remove = table.remove
+        resize_table = table.resize_table
+        probe_count = table.probe_count
+        record = self.record
+        counters = self
+
+        def counted_get(k):
+            if k is not None:
+                record("get", probe_count(k))
+            return get(k)
+
+        def counted_insert(k, v):
+            if k is not None:
+                record("insert", probe_count(k))
+            return insert(k, v)
+
+        def counted_remove(k):
+            if k is not None:
+                record("remove", probe_count(k))
+            return remove(k)
+
+        def counted_resize_table(*args):
+            start = time.perf_counter()
+            resize_table(*args)
+            counters.resize_time += time.perf_counter() - start
+            counters.resizes += 1
+
+        table.get = counted_get
+        table.insert = counted_insert
+        table.remove = counted_remove
+        table.resize_table = counted_resize_table
+
+    def __str__(self):
+        ops = ", ".join(
+            f"{x}: {self.ops[x]} ops {self.avg_probes(x):.2f} avg "
+            f"{self.max_probes[x]} max"
+            for x in self.OPERATIONS
+        )
+        return f"{ops}; resizes: {self.resizes} in {self.resize_time * 1000:.2f} ms"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,311 @@
+"""
+HashTable Cuckoo Hashing
+
+Every key has two candidate buckets, one from hash(k) and one from a seeded
+mix of it, and every bucket holds SLOTS entries. A lookup inspects at most
+these two buckets. An insert into two full buckets kicks a random entry out
+to its other bucket, and so on, at most MAX_KICKS times; if that fails the
+entry goes to a small stash. When the stash is full the table is rebuilt
+with a new seed, in the same number of buckets: only the load makes the
+table grow.
+
+Keys with an identical hash always share both buckets, neither a seed nor
+more buckets can split them. The ones which do not fit stay in the stash:
+when a rebuild leaves more than MAX_STASH entries there, the stash may
+grow to twice that size before the next rebuild. So such keys cost a
+rebuild per doubling of the stash and longer lookups, never memory.
+
+https://en.wikipedia.org/wiki/Cuckoo_hashing
+"""
+import random
+from ht_hashing import MASK64, mix64
+
+
+class HashTableCuckoo:
+    # slots per bucket, 4 slots allow a load of ~95%
+    SLOTS = 4
+    MAX_KICKS = 500
+    MAX_STASH = 4
+
+    # number of buckets, always a power of two
+    capacity = 0
+    mask = 0
+    load_factor = 0.0
+    threshold = 0
+    seed = 0
+    key_count = 0
+    modification_count = 0
+
+    # bucket b owns slots b * SLOTS ... b * SLOTS + SLOTS - 1, empty slots
+    # have None key
+    slot_keys = []
+    slot_values = []
+    slot_hashes = []
+
+    # [key, value, hash] entries which did not fit into their buckets
+    stash = []
+    # the table is rebuilt when the stash holds more entries
+    stash_limit = MAX_STASH
+
+    def __init__(self, capacity=8, load_factor=0.9, seed=None):
+        if capacity is None or capacity <= 0:
+            raise ValueError(f"Illegal capacity: {capacity}")
+        if load_factor is None or not 0 < load_factor < 1:
+            raise ValueError(f"Illegal load_factor: {load_factor}")
+        self.capacity = 1 << (capacity - 1).bit_length()
+        self.load_factor = load_factor
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.allocate_table()
+        self.stash = []
+
+    def allocate_table(self):
+        n = self.capacity * self.SLOTS
+        self.mask = self.capacity - 1
+        self.threshold = int(n * self.load_factor)
+        self.slot_keys = n * [None]
+        self.slot_values = n * [None]
+        self.slot_hashes = n * [0]
+
+    def clear(self):
+        self.allocate_table()
+        self.stash = []
+        self.stash_limit = self.MAX_STASH
+        self.key_count = 0
+        self.modification_count += 1
+
+    def size(self) -> int:
+        return self.key_count
+
+    def get_capacity(self) -> int:
+        return self.capacity
+
+    def is_empty(self) -> bool:
+        return self.key_count == 0
+
+    def put(self, key, value):
+        return self.insert(key, value)
+
+    def add(self, key, value):
+        return self.insert(key, value)
+
+    def contains(self, key):
+        return self.has_key(key)
+
+    # first slots of the two buckets of the hash. find_slot and get inline
+    # this and the scan of the buckets
+    def buckets(self, key_hash):
+        mask = self.mask
+        b1 = abs(key_hash) & mask
+        b2 = mix64(key_hash ^ self.seed) & mask
+        return b1 * self.SLOTS, b2 * self.SLOTS
+
+    # returns the slot of the key, -1 if it is not in the buckets
+    def find_slot(self, k, key_hash) -> int:
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        mask = self.mask
+        slots = self.SLOTS
+
+        i = (abs(key_hash) & mask) * slots
+        end = i + slots
+        while i < end:
+            if hashes[i] == key_hash:
+                key = keys[i]
+                if key is not None and (key is k or key == k):
+                    return i
+            i += 1
+
+        # mix64(key_hash ^ seed)
+        x = (key_hash ^ self.seed) & MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+        i = ((x ^ (x >> 31)) & mask) * slots
+        end = i + slots
+        while i < end:
+            if hashes[i] == key_hash:
+                key = keys[i]
+                if key is not None and (key is k or key == k):
+                    return i
+            i += 1
+        return -1
+
+    # returns index of the key in the stash or -1
+    def find_stashed(self, k, key_hash) -> int:
+        for i, entry in enumerate(self.stash):
+            if entry[2] == key_hash and (entry[0] is k or entry[0] == k):
+                return i
+        return -1
+
+    def has_key(self, k) -> bool:
+        if k is None:
+            raise ValueError("None key")
+        h = hash(k)
+        if self.find_slot(k, h) != -1:
+            return True
+        return bool(self.stash) and self.find_stashed(k, h) != -1
+
+    def get(self, k):
+        if k is None:
+            raise ValueError("None key")
+        h = hash(k)
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        mask = self.mask
+        slots = self.SLOTS
+
+        # find_slot inlined
+        i = (abs(h) & mask) * slots
+        end = i + slots
+        while i < end:
+            if hashes[i] == h:
+                key = keys[i]
+                if key is not None and (key is k or key == k):
+                    return self.slot_values[i]
+            i += 1
+
+        x = (h ^ self.seed) & MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+        i = ((x ^ (x >> 31)) & mask) * slots
+        end = i + slots
+        while i < end:
+            if hashes[i] == h:
+                key = keys[i]
+                if key is not None and (key is k or key == k):
+                    return self.slot_values[i]
+            i += 1
+
+        if self.stash:
+            i = self.find_stashed(k, h)
+            if i != -1:
+                return self.stash[i][1]
+        return None
+
+    def insert(self, k, v):
+        if k is None:
+            raise ValueError("None key")
+        h = hash(k)
+        i = self.find_slot(k, h)
+        if i != -1:
+            self.slot_values[i] = v
+            self.modification_count += 1
+            return v
+        if self.stash:
+            i = self.find_stashed(k, h)
+            if i != -1:
+                self.stash[i][1] = v
+                self.modification_count += 1
+                return v
+
+        if self.key_count >= self.threshold:
+            self.resize_table()
+
+        homeless = self.place(k, v, h)
+        if homeless is not None:
+            self.stash.append(homeless)
+            if len(self.stash) > self.stash_limit:
+                self.rebuild()
+        self.key_count += 1
+        self.modification_count += 1
+        return v
+
+    # puts a key which is known to be absent, kicking entries out of the way.
+    # Returns None or the [key, value, hash] entry which has no slot left
+    def place(self, k, v, h):
+        keys = self.slot_keys
+        values = self.slot_values
+        hashes = self.slot_hashes
+        slots = self.SLOTS
+
+        first, second = self.buckets(h)
+        for base in (first, second):
+            for i in range(base, base + slots):
+                if keys[i] is None:
+                    keys[i] = k
+                    values[i] = v
+                    hashes[i] = h
+                    return None
+
+        base = random.choice((first, second))
+        for _ in range(self.MAX_KICKS):
+            # evict a random entry of the full bucket
+            i = base + random.randrange(slots)
+            k, keys[i] = keys[i], k
+            v, values[i] = values[i], v
+            h, hashes[i] = hashes[i], h
+
+            # and move it to its other bucket
+            first, second = self.buckets(h)
+            base = second if base == first else first
+            for i in range(base, base + slots):
+                if keys[i] is None:
+                    keys[i] = k
+                    values[i] = v
+                    hashes[i] = h
+                    return None
+        return [k, v, h]
+
+    # doubles the number of buckets
+    def resize_table(self):
+        self.capacity *= 2
+        self.rebuild()
+
+    # places all entries again with a new seed. Entries which still do not
+    # fit go to the stash, and if they are too many for MAX_STASH, which
+    # keys with identical hashes are, the stash may double first
+    def rebuild(self):
+        old_keys = self.slot_keys
+        old_values = self.slot_values
+        old_hashes = self.slot_hashes
+        stash = self.stash
+
+        self.seed = random.getrandbits(64)
+        self.allocate_table()
+        self.stash = []
+        self.modification_count += 1
+
+        for i, k in enumerate(old_keys):
+            if k is not None:
+                homeless = self.place(k, old_values[i], old_hashes[i])
+                if homeless is not None:
+                    self.stash.append(homeless)
+        for k, v, h in stash:
+            homeless = self.place(k, v, h)
+            if homeless is not None:
+                self.stash.append(homeless)
+        self.stash_limit = max(self.MAX_STASH, 2 * len(self.stash))
+
+    def remove(self, k):
+        if k is None:
+            raise ValueError("None key")
+        h = hash(k)
+        i = self.find_slot(k, h)
+        if i != -1:
+            old_value = self.slot_values[i]
+            self.slot_keys[i] = None
+            self.slot_values[i] = None
+        else:
+            i = self.find_stashed(k, h) if self.stash else -1
+            if i == -1:
+                return None
+            old_value = self.stash.pop(i)[1]
+        self.key_count -= 1
+        self.modification_count += 1
+        return old_value
+
+    def __iter__(self):
+        for k in self.slot_keys:
+            if k is not None:
+                yield k
+        for entry in self.stash:
+            yield entry[0]
+
+    def __str__(self):
+        s = "{ "
+        for k in self:
+            s += f"{k} => {self.get(k)}, "
+        s += "}"
+        return s
+
+    def __repr__(self):
+        return self.__str__()
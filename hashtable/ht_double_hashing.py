@@ -24,6 +24,13 @@ class HashTableDoubleHashing(HashTableOpenAddressing):
     def probe(self, x) -> int:
         return x * self.chash
 
+    # same as setup_probing, but the step is returned instead of being cached
+    def probe_step(self, key_hash, capacity) -> int:
+        step = abs(key_hash) % capacity
+        if step == 0:
+            step = 1
+        return step
+
     # adjust until it is a prime number
     def adjust_capacity(self):
         while not self.is_prime(self.capacity):
@@ -0,0 +1,61 @@
+"""
+Hash mixing helpers shared by the hashtables
+"""
+
+MASK64 = (1 << 64) - 1
+
+
+# finalizer of splitmix64: a bijection on 64 bit integers where every input
+# bit affects every output bit
+# https://xorshift.di.unimi.it/splitmix64.c
+def mix64(x: int) -> int:
+    x &= MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+# hash() of str and bytes is salted per process (PYTHONHASHSEED). Hashes
+# cached in a snapshot are only valid in a process with the same fingerprint
+def hash_fingerprint() -> int:
+    return hash("ht_hashing fingerprint")
+
+
+# types whose hash() follows from the value alone. Other objects may hash by
+# identity (the default __hash__), a copy of such a key gets another hash
+VALUE_HASHED = frozenset((str, bytes, int, float, bool))
+
+
+def value_hashed(k) -> bool:
+    t = type(k)
+    if t in VALUE_HASHED:
+        return True
+    if t is tuple or t is frozenset:
+        return all(value_hashed(x) for x in k)
+    return False
+
+
+# fingerprint stored in a snapshot of the keys: None, which never matches,
+# unless every key is value hashed, so that restoring hashes all keys again
+def snapshot_fingerprint(keys):
+    if all(value_hashed(k) for k in keys):
+        return hash_fingerprint()
+    return None
+
+
+# hash function of a seeded table: hash(k) keyed with the seed and mixed
+# (mix64 inlined). Without the seed, keys whose hashes are equal modulo the
+# capacity, such as multiples of it, share one chain or probe sequence, and
+# anyone who can pick the keys can pick such ones. The result is 63 bits,
+# it fits the int64 arrays of the tables and is never negative.
+# Keys with equal hash() still collide, no seed can split them
+def seeded_hash(seed: int):
+    seed &= MASK64
+
+    def hash_key(k) -> int:
+        x = hash(k) & MASK64 ^ seed
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+        return (x ^ (x >> 31)) >> 1
+
+    return hash_key
@@ -20,6 +20,9 @@ class HashTableLinearProbing(HashTableOpenAddressing):
     def probe(self, x) -> int:
         return self.LINEAR_CONSTANT * x
 
+    def probe_step(self, key_hash, capacity) -> int:
+        return self.LINEAR_CONSTANT
+
     def adjust_capacity(self):
         while super().gcd(self.LINEAR_CONSTANT, super().get_capacity()) != 1:
             self.capacity += 1
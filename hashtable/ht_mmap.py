@@ -0,0 +1,375 @@
+"""
+HashTable Open Addressing: memory-mapped file
+
+Persistent linear probing table. The slot array lives in a memory-mapped
+file, every slot has a fixed width (hash, key offset, value offset), and
+keys and values are written into an append-only heap file next to it:
+
+    <path>        header | slot 0 | slot 1 | ...
+    <path>.heap   magic | len key | key | len value | value | ...
+
+Opening an existing table only maps the files, nothing is rebuilt. Opened
+with readonly=True the table can be shared by several processes, the OS
+keeps a single copy of the pages. There can be only one writer; it flushes
+the records of a key to the heap file before the slot points at them, so a
+reader opened next to it finds every record the slots refer to. A reader
+keeps the capacity it opened with, it does not see keys the writer puts
+after growing the slot file.
+
+hash() of str/bytes differs between processes, so the slots use a stable
+64 bit blake2b hash of the encoded key, and keys are compared by their
+encoded bytes. Equal keys must have equal bytes, which pickle does not
+guarantee (memoized strings, the order of sets), so keys are encoded by
+encode_key and may only be str, bytes, int and tuples of those; other
+types raise TypeError. Values are pickled.
+"""
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+
+
+class HashTableMmap:
+    MAGIC = b"HTMMAP02"
+    HEAP_MAGIC = b"HTHEAP02"
+
+    # magic, capacity, key_count, used_buckets
+    HEADER = struct.Struct("<8sQQQ")
+    # hash, key offset, value offset
+    SLOT = struct.Struct("<QQQ")
+    RECORD_LEN = struct.Struct("<I")
+    # type tag and length of an encoded key
+    KEY_HEAD = struct.Struct("<cI")
+
+    # key offsets which do not point into the heap (the heap magic is there)
+    EMPTY = 0
+    TOMBSTONE = 1
+
+    capacity = 0
+    mask = 0
+    load_factor = 0.0
+    threshold = 0
+    key_count = 0
+    used_buckets = 0
+    readonly = False
+
+    path = None
+    heap_path = None
+    slot_file = None
+    slots = None
+    heap_file = None
+    heap = None
+    # end of the heap file, new records are appended there
+    heap_size = 0
+
+    def __init__(self, path, capacity=1024, load_factor=0.65, readonly=False):
+        if capacity is None or capacity <= 0:
+            raise ValueError(f"Illegal capacity: {capacity}")
+        if load_factor is None or not 0 < load_factor < 1:
+            raise ValueError(f"Illegal load_factor: {load_factor}")
+        self.path = os.fspath(path)
+        self.heap_path = self.path + ".heap"
+        self.load_factor = load_factor
+        self.readonly = readonly
+
+        if not os.path.exists(self.path):
+            if readonly:
+                raise ValueError(f"Table does not exist: {self.path}")
+            self.create(1 << (capacity - 1).bit_length())
+        self.open()
+
+    # creates empty slot and heap files
+    def create(self, capacity):
+        self.write_slot_file(self.path, capacity)
+        with open(self.heap_path, "wb") as f:
+            f.write(self.HEAP_MAGIC)
+
+    def write_slot_file(self, path, capacity):
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, capacity, 0, 0))
+            f.truncate(self.HEADER.size + capacity * self.SLOT.size)
+
+    def open(self):
+        mode = "rb" if self.readonly else "r+b"
+        access = mmap.ACCESS_READ if self.readonly else mmap.ACCESS_WRITE
+
+        self.slot_file = open(self.path, mode)
+        self.slots = mmap.mmap(self.slot_file.fileno(), 0, access=access)
+        magic, capacity, key_count, used = self.HEADER.unpack_from(self.slots, 0)
+        if magic != self.MAGIC:
+            self.slots.close()
+            self.slot_file.close()
+            raise ValueError(f"Not a hashtable file: {self.path}")
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.threshold = int(capacity * self.load_factor)
+        self.key_count = key_count
+        self.used_buckets = used
+
+        self.heap_file = open(self.heap_path, mode)
+        self.heap_size = self.heap_file.seek(0, os.SEEK_END)
+        self.map_heap()
+
+    def map_heap(self):
+        if self.heap is not None:
+            self.heap.close()
+        self.heap = mmap.mmap(self.heap_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def flush(self):
+        if self.readonly:
+            return
+        self.write_header()
+        self.slots.flush()
+        self.heap_file.flush()
+
+    def close(self):
+        if self.slots is not None and not self.slots.closed:
+            self.flush()
+            self.slots.close()
+        if self.heap is not None:
+            self.heap.close()
+            self.heap = None
+        for f in (self.slot_file, self.heap_file):
+            if f is not None:
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_header(self):
+        self.HEADER.pack_into(
+            self.slots, 0, self.MAGIC, self.capacity, self.key_count, self.used_buckets
+        )
+
+    def writable_or_throw(self):
+        if self.readonly:
+            raise ValueError("Table is read-only")
+
+    def size(self) -> int:
+        return self.key_count
+
+    def get_capacity(self) -> int:
+        return self.capacity
+
+    def is_empty(self) -> bool:
+        return self.key_count == 0
+
+    def put(self, key, value):
+        return self.insert(key, value)
+
+    def add(self, key, value):
+        return self.insert(key, value)
+
+    def contains(self, key):
+        return self.has_key(key)
+
+    # stable hash of the encoded key, the same in every process
+    def stable_hash(self, data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+    def serialize(self, key):
+        if key is None:
+            raise ValueError("None key")
+        return self.encode_key(key)
+
+    # the one encoding of a key: type tag, length, payload. Exact types only,
+    # True == 1 but it would come back as 1
+    def encode_key(self, key) -> bytes:
+        t = type(key)
+        if t is str:
+            tag, payload = b"s", key.encode("utf-8", "surrogatepass")
+        elif t is bytes:
+            tag, payload = b"b", key
+        elif t is int:
+            n = (key.bit_length() + 8) // 8
+            tag, payload = b"i", key.to_bytes(n, "little", signed=True)
+        elif t is tuple:
+            tag, payload = b"t", b"".join(self.encode_key(x) for x in key)
+        else:
+            raise TypeError(f"Unsupported key type: {t.__name__}")
+        return self.KEY_HEAD.pack(tag, len(payload)) + payload
+
+    def decode_key(self, data: bytes):
+        key, _ = self.read_key(data, 0)
+        return key
+
+    # returns the key encoded at offset and the offset after it
+    def read_key(self, data: bytes, offset: int):
+        tag, n = self.KEY_HEAD.unpack_from(data, offset)
+        start = offset + self.KEY_HEAD.size
+        end = start + n
+        if tag == b"s":
+            return bytes(data[start:end]).decode("utf-8", "surrogatepass"), end
+        if tag == b"b":
+            return bytes(data[start:end]), end
+        if tag == b"i":
+            return int.from_bytes(data[start:end], "little", signed=True), end
+        items = []
+        while start < end:
+            x, start = self.read_key(data, start)
+            items.append(x)
+        return tuple(items), end
+
+    # heap
+    def append_record(self, data: bytes) -> int:
+        offset = self.heap_size
+        self.heap_file.seek(offset)
+        self.heap_file.write(self.RECORD_LEN.pack(len(data)))
+        self.heap_file.write(data)
+        self.heap_size += self.RECORD_LEN.size + len(data)
+        return offset
+
+    # whether the record at offset is whole in the mapping
+    def is_mapped(self, offset: int) -> bool:
+        start = offset + self.RECORD_LEN.size
+        if start > len(self.heap):
+            return False
+        (n,) = self.RECORD_LEN.unpack_from(self.heap, offset)
+        return start + n <= len(self.heap)
+
+    def read_record(self, offset: int) -> bytes:
+        # records appended after the heap was mapped, or only partly written
+        # to the file when it was mapped
+        if not self.is_mapped(offset):
+            self.heap_file.flush()
+            self.map_heap()
+            if not self.is_mapped(offset):
+                raise ValueError(f"Record {offset} is beyond the end of the heap file")
+        start = offset + self.RECORD_LEN.size
+        (n,) = self.RECORD_LEN.unpack_from(self.heap, offset)
+        return self.heap[start : start + n]
+
+    # slots
+    def slot_offset(self, i: int) -> int:
+        return self.HEADER.size + i * self.SLOT.size
+
+    # returns index of the slot with the key, or -(first free slot) - 1
+    def find_slot(self, key_bytes: bytes, h: int) -> int:
+        slots = self.slots
+        unpack_from = self.SLOT.unpack_from
+        mask = self.mask
+        free = -1
+        i = h & mask
+        while True:
+            slot_h, key_off, _ = unpack_from(slots, self.slot_offset(i))
+            if key_off == self.EMPTY:
+                return -(i if free == -1 else free) - 1
+            if key_off == self.TOMBSTONE:
+                if free == -1:
+                    free = i
+            elif slot_h == h and self.read_record(key_off) == key_bytes:
+                return i
+            i = (i + 1) & mask
+
+    def has_key(self, key) -> bool:
+        key_bytes = self.serialize(key)
+        return self.find_slot(key_bytes, self.stable_hash(key_bytes)) >= 0
+
+    def get(self, key):
+        key_bytes = self.serialize(key)
+        i = self.find_slot(key_bytes, self.stable_hash(key_bytes))
+        if i < 0:
+            return None
+        _, _, val_off = self.SLOT.unpack_from(self.slots, self.slot_offset(i))
+        return pickle.loads(self.read_record(val_off))
+
+    def insert(self, key, value):
+        self.writable_or_throw()
+        key_bytes = self.serialize(key)
+        h = self.stable_hash(key_bytes)
+
+        if self.used_buckets >= self.threshold:
+            self.resize_table()
+
+        i = self.find_slot(key_bytes, h)
+        val_off = self.append_record(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if i >= 0:
+            # update only the value, the old record stays in the heap
+            self.heap_file.flush()
+            slot = self.slot_offset(i)
+            slot_h, key_off, _ = self.SLOT.unpack_from(self.slots, slot)
+            self.SLOT.pack_into(self.slots, slot, slot_h, key_off, val_off)
+            return value
+
+        i = -i - 1
+        slot = self.slot_offset(i)
+        _, old_key_off, _ = self.SLOT.unpack_from(self.slots, slot)
+        if old_key_off == self.EMPTY:
+            self.used_buckets += 1
+        key_off = self.append_record(key_bytes)
+        # the records reach the file before a reader can follow the slot
+        self.heap_file.flush()
+        self.SLOT.pack_into(self.slots, slot, h, key_off, val_off)
+        self.key_count += 1
+        self.write_header()
+        return value
+
+    def remove(self, key):
+        self.writable_or_throw()
+        key_bytes = self.serialize(key)
+        i = self.find_slot(key_bytes, self.stable_hash(key_bytes))
+        if i < 0:
+            return None
+        slot = self.slot_offset(i)
+        _, _, val_off = self.SLOT.unpack_from(self.slots, slot)
+        value = pickle.loads(self.read_record(val_off))
+        self.SLOT.pack_into(self.slots, slot, 0, self.TOMBSTONE, 0)
+        self.key_count -= 1
+        self.write_header()
+        return value
+
+    # doubles the slot array. Hashes are stored in the slots, so only the
+    # slots are moved, the heap is not read
+    def resize_table(self):
+        capacity = 2 * self.capacity
+        tmp_path = self.path + ".tmp"
+        self.write_slot_file(tmp_path, capacity)
+
+        with open(tmp_path, "r+b") as f:
+            new_slots = mmap.mmap(f.fileno(), 0)
+            mask = capacity - 1
+            for i in range(self.capacity):
+                h, key_off, val_off = self.SLOT.unpack_from(
+                    self.slots, self.slot_offset(i)
+                )
+                if key_off == self.EMPTY or key_off == self.TOMBSTONE:
+                    continue
+                j = h & mask
+                while self.SLOT.unpack_from(new_slots, self.slot_offset(j))[1]:
+                    j = (j + 1) & mask
+                self.SLOT.pack_into(new_slots, self.slot_offset(j), h, key_off, val_off)
+            self.HEADER.pack_into(
+                new_slots, 0, self.MAGIC, capacity, self.key_count, self.key_count
+            )
+            new_slots.flush()
+            new_slots.close()
+
+        self.heap_file.flush()
+        self.close()
+        os.replace(tmp_path, self.path)
+        self.open()
+
+    def items(self):
+        slots = self.slots
+        for i in range(self.capacity):
+            _, key_off, val_off = self.SLOT.unpack_from(slots, self.slot_offset(i))
+            if key_off != self.EMPTY and key_off != self.TOMBSTONE:
+                yield (
+                    self.decode_key(self.read_record(key_off)),
+                    pickle.loads(self.read_record(val_off)),
+                )
+
+    def __iter__(self):
+        for k, _ in self.items():
+            yield k
+
+    def __str__(self):
+        s = "{ "
+        for k, v in self.items():
+            s += f"{k} => {v}, "
+        s += "}"
+        return s
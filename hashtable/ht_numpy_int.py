@@ -0,0 +1,233 @@
+"""
+HashTable Open Addressing: NumPy int64 keys
+
+Linear probing table for 64 bit integer keys and values stored in NumPy
+arrays. The bulk operations take and return arrays and work on a whole
+batch at once: the home slots of all keys are computed with one vectorized
+splitmix64, then every round looks at the current slot of all keys which
+are still unresolved, settles the ones it can and moves the rest one slot
+further. The set of unresolved keys shrinks every round, so the later
+rounds only see the few keys which collided.
+
+When several new keys of a batch reach the same empty slot in one round,
+one of them takes it and the others see an occupied slot in the next round.
+
+The capacity is a power of two. Removed slots are marked DELETED and not
+reused, they are dropped by the next rebuild.
+"""
+import numpy as np
+
+
+EMPTY = 0
+FULL = 1
+DELETED = 2
+
+C1 = np.uint64(0xBF58476D1CE4E5B9)
+C2 = np.uint64(0x94D049BB133111EB)
+
+
+# splitmix64 finalizer of a uint64 array, like ht_hashing.mix64.
+# Multiplications wrap around, NumPy does not warn for arrays
+def mix64(x):
+    x = x ^ (x >> np.uint64(30))
+    x = x * C1
+    x ^= x >> np.uint64(27)
+    x *= C2
+    x ^= x >> np.uint64(31)
+    return x
+
+
+class HashTableInt64:
+    capacity = 0
+    mask = 0
+    load_factor = 0.0
+    threshold = 0
+    key_count = 0
+    # FULL and DELETED slots
+    used_buckets = 0
+
+    slot_keys = None
+    slot_values = None
+    slot_state = None
+
+    def __init__(self, capacity=16, load_factor=0.5):
+        if capacity is None or capacity <= 0:
+            raise ValueError(f"Illegal capacity: {capacity}")
+        if load_factor is None or not 0 < load_factor < 1:
+            raise ValueError(f"Illegal load_factor: {load_factor}")
+        self.load_factor = load_factor
+        self.allocate_table(1 << (capacity - 1).bit_length())
+
+    def allocate_table(self, capacity):
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.threshold = int(capacity * self.load_factor)
+        self.slot_keys = np.zeros(capacity, dtype=np.int64)
+        self.slot_values = np.zeros(capacity, dtype=np.int64)
+        self.slot_state = np.zeros(capacity, dtype=np.uint8)
+        self.key_count = 0
+        self.used_buckets = 0
+
+    def clear(self):
+        self.allocate_table(self.capacity)
+
+    def size(self) -> int:
+        return self.key_count
+
+    def get_capacity(self) -> int:
+        return self.capacity
+
+    def is_empty(self) -> bool:
+        return self.key_count == 0
+
+    # home slots of an int64 key array
+    def home(self, keys):
+        return (mix64(keys.view(np.uint64)) & np.uint64(self.mask)).astype(np.intp)
+
+    # makes room for n more keys. Rebuilds at the same capacity if only the
+    # deleted slots are in the way
+    def reserve(self, n):
+        if self.used_buckets + n <= self.threshold:
+            return
+        capacity = self.capacity
+        while int(capacity * self.load_factor) < self.key_count + n:
+            capacity *= 2
+        self.rebuild(capacity)
+
+    def rebuild(self, capacity):
+        live = self.slot_state == FULL
+        keys = self.slot_keys[live]
+        values = self.slot_values[live]
+        self.allocate_table(capacity)
+        self.place(keys, values)
+
+    # puts a batch of distinct keys, the table must have room for all
+    def place(self, keys, values):
+        mask = self.mask
+        slot_keys = self.slot_keys
+        slot_values = self.slot_values
+        slot_state = self.slot_state
+
+        idx = np.arange(len(keys))
+        pos = self.home(keys)
+        while len(idx):
+            state = slot_state[pos]
+            match = (state == FULL) & (slot_keys[pos] == keys[idx])
+            if match.any():
+                slot_values[pos[match]] = values[idx[match]]
+
+            empty = state == EMPTY
+            settled = match
+            if empty.any():
+                # the first key of every empty slot takes it
+                empty_at = np.flatnonzero(empty)
+                _, first = np.unique(pos[empty_at], return_index=True)
+                won = empty_at[first]
+                won_pos = pos[won]
+                slot_state[won_pos] = FULL
+                slot_keys[won_pos] = keys[idx[won]]
+                slot_values[won_pos] = values[idx[won]]
+                self.key_count += len(won)
+                self.used_buckets += len(won)
+                settled = settled.copy()
+                settled[won] = True
+
+            # the losers of an empty slot look at it again in the next round
+            advance = ~settled & ~empty
+            pos[advance] = (pos[advance] + 1) & mask
+            keep = ~settled
+            idx = idx[keep]
+            pos = pos[keep]
+
+    # returns the slot of every key, -1 for missing keys
+    def find_many(self, keys):
+        keys = np.asarray(keys, dtype=np.int64).ravel()
+        mask = self.mask
+        slot_keys = self.slot_keys
+        slot_state = self.slot_state
+
+        slots = np.full(len(keys), -1, dtype=np.intp)
+        idx = np.arange(len(keys))
+        pos = self.home(keys)
+        while len(idx):
+            state = slot_state[pos]
+            hit = (state == FULL) & (slot_keys[pos] == keys[idx])
+            slots[idx[hit]] = pos[hit]
+            keep = ~hit & (state != EMPTY)
+            idx = idx[keep]
+            pos = (pos[keep] + 1) & mask
+        return slots
+
+    # keys and values are array-likes of the same length, or values is a
+    # scalar. The last value of a key repeated in the batch wins
+    def put_many(self, keys, values):
+        keys = np.asarray(keys, dtype=np.int64).ravel()
+        values = np.broadcast_to(np.asarray(values, dtype=np.int64), keys.shape)
+        if len(keys) == 0:
+            return
+        keys, last = np.unique(keys[::-1], return_index=True)
+        values = values[::-1][last]
+        self.reserve(len(keys))
+        self.place(keys, values)
+
+    # value of every key, default for the missing ones
+    def get_many(self, keys, default=0):
+        slots = self.find_many(keys)
+        found = slots >= 0
+        out = np.full(len(slots), default, dtype=np.int64)
+        out[found] = self.slot_values[slots[found]]
+        return out
+
+    def contains_many(self, keys):
+        return self.find_many(keys) >= 0
+
+    # removes the keys, returns one boolean per key: whether it was there
+    def remove_many(self, keys):
+        slots = self.find_many(keys)
+        found = slots >= 0
+        removed = np.unique(slots[found])
+        self.slot_state[removed] = DELETED
+        self.key_count -= len(removed)
+        return found
+
+    # single keys go through the batch code
+    def put(self, key, value):
+        self.put_many([key], [value])
+
+    def add(self, key, value):
+        self.put(key, value)
+
+    def get(self, key):
+        i = self.find_many([key])[0]
+        return None if i < 0 else int(self.slot_values[i])
+
+    def contains(self, key) -> bool:
+        return bool(self.find_many([key])[0] >= 0)
+
+    def remove(self, key):
+        i = self.find_many([key])[0]
+        if i < 0:
+            return None
+        self.remove_many([key])
+        return int(self.slot_values[i])
+
+    def keys(self):
+        return self.slot_keys[self.slot_state == FULL]
+
+    def values(self):
+        return self.slot_values[self.slot_state == FULL]
+
+    def items(self):
+        live = self.slot_state == FULL
+        return self.slot_keys[live], self.slot_values[live]
+
+    def __iter__(self):
+        return iter(self.keys().tolist())
+
+    def __str__(self):
+        keys, values = self.items()
+        s = "{ "
+        for k, v in zip(keys.tolist(), values.tolist()):
+            s += f"{k} => {v}, "
+        s += "}"
+        return s
@@ -1,11 +1,18 @@
 """
-HashTable Open Addressing: base 
+HashTable Open Addressing: base
 
 Inspired by William Fiset
 https://github.com/williamfiset/
 """
 import math
+import pickle
+import random
 from abc import ABC, abstractmethod
+from array import array
+from itertools import compress
+from ht_counters import HashTableCounters
+from ht_hashing import hash_fingerprint, seeded_hash, snapshot_fingerprint
+from ht_views import HashTableItemsView, HashTableKeysView, HashTableValuesView
 
 
 class HashTableOpenAddressing(ABC):
@@ -17,25 +24,86 @@ class HashTableOpenAddressing(ABC):
     used_buckets = 0
     key_count = 0
 
-    keys = []
-    value = []
+    slot_keys = []
+    slot_values = []
+    # cached hash_key(k) of every key, parallel to keys and values. It allows
+    # to resize without rehashing and to skip most __eq__ calls during probing
+    slot_hashes = []
+
+    # capacity - 1 if the capacity is a power of two, so the index can be
+    # computed with a bitmask instead of modulo; 0 otherwise
+    mask = 0
+
+    # incremental resize: instead of rehashing everything at once, the old
+    # tables are kept next to the new ones and every operation migrates
+    # migrate_step buckets of them. old_keys is None when nothing is migrated
+    incremental = False
+    migrate_step = 0
+    migrate_index = 0
+    old_keys = None
+    old_values = None
+    old_hashes = None
+    old_capacity = 0
+    old_mask = 0
+
+    # table is compacted when the number of tombstones exceeds
+    # compact_threshold * capacity, None disables the compaction
+    compact_threshold = None
+    tombstone_limit = 0
+
+    # HashTableCounters when the table is created with instrument=True
+    counters = None
+
+    # hash function of the keys. A seeded table (seeded=True or a given
+    # seed) mixes hash(k) with its seed, see ht_hashing.seeded_hash
+    hash_key = hash
+    seed = None
+
+    # probe sequence is walked incrementally:
+    #   i(x + 1) = i(x) + step; step += PROBE_GROWTH
+    # where the first step is given by probe_step
+    PROBE_GROWTH = 0
 
     # marker token for deletion k-v
     # it should be an unique object, in this case we can mark deleted elements
     # with it and during get_value operations do not return None
     TOMBSTONE = object()
 
-    def __init__(self, capacity=7, load_factor=0.65):
+    def __init__(
+        self,
+        capacity=7,
+        load_factor=0.65,
+        incremental=False,
+        migrate_step=16,
+        compact_threshold=0.25,
+        instrument=False,
+        seeded=False,
+        seed=None,
+    ):
         if capacity is None or capacity <= 0:
             raise ValueError(f"Illegal capacity: {capacity}")
         if load_factor is None or load_factor <= 0 or math.isinf(load_factor):
             raise ValueError(f"Illegal load_factor: {load_factor}")
+        if migrate_step is None or migrate_step <= 0:
+            raise ValueError(f"Illegal migrate_step: {migrate_step}")
+        if compact_threshold is not None and not 0 < compact_threshold <= 1:
+            raise ValueError(f"Illegal compact_threshold: {compact_threshold}")
         self.capacity = capacity
         self.load_factor = load_factor
+        self.incremental = incremental
+        self.migrate_step = migrate_step
+        self.compact_threshold = compact_threshold
+        if seeded or seed is not None:
+            self.use_seed(random.getrandbits(64) if seed is None else seed)
         self.adjust_capacity()
-        self.threshold = int(self.capacity * self.load_factor)
-        self.keys = self.capacity * [None]
-        self.values = self.capacity * [None]
+        self.allocate_table()
+        if instrument:
+            self.counters = HashTableCounters()
+            self.counters.attach(self)
+
+    def use_seed(self, seed):
+        self.seed = seed
+        self.hash_key = seeded_hash(seed)
 
     @abstractmethod
     def setup_probing(self, key):
@@ -45,6 +113,14 @@ class HashTableOpenAddressing(ABC):
     def probe(self, x) -> int:
         pass
 
+    # gap between the first and the second probe for the key hash in a table
+    # of the given capacity. Together with PROBE_GROWTH it must produce the
+    # same sequence as normalize_index(offset + probe(x)), but without calling
+    # probe per step
+    @abstractmethod
+    def probe_step(self, key_hash, capacity) -> int:
+        pass
+
     @abstractmethod
     def adjust_capacity(self):
         pass
@@ -52,10 +128,22 @@ class HashTableOpenAddressing(ABC):
     def increase_capacity(self):
         self.capacity = 2 * self.capacity + 1
 
+    # allocates empty tables for the current capacity
+    def allocate_table(self):
+        self.threshold = int(self.capacity * self.load_factor)
+        if self.compact_threshold is not None:
+            self.tombstone_limit = int(self.capacity * self.compact_threshold)
+        if self.capacity & (self.capacity - 1) == 0:
+            self.mask = self.capacity - 1
+        else:
+            self.mask = 0
+        self.slot_keys = self.capacity * [None]
+        self.slot_values = self.capacity * [None]
+        self.slot_hashes = self.capacity * [0]
+
     def clear(self):
-        for i in range(self.capacity):
-            self.keys[i] = None
-            self.values[i] = None
+        self.allocate_table()
+        self.old_keys = self.old_values = self.old_hashes = None
         self.key_count = self.used_buckets = 0
         self.modification_count += 1
 
@@ -68,6 +156,9 @@ class HashTableOpenAddressing(ABC):
     def is_empty(self) -> bool:
         return self.key_count == 0
 
+    def is_migrating(self) -> bool:
+        return self.old_keys is not None
+
     def put(self, key, value):
         return self.insert(key, value)
 
@@ -77,51 +168,144 @@ class HashTableOpenAddressing(ABC):
     def contains(self, key):
         return self.has_key(key)
 
-    # returns list of keys
+    # live views like the ones of dict, nothing is copied
     def keys(self):
-        ht = []
-        for i in range(self.capacity):
-            if keys[i] is not None and keys[i] != self.TOMBSTONE:
-                ht.append(keys[i])
-        return ht
+        return HashTableKeysView(self)
 
-    # return list of values
     def values(self):
-        ht = []
-        for i in range(self.capacity):
-            if keys[i] is not None and keys[i] != self.TOMBSTONE:
-                ht.append(values[i])
-        return ht
+        return HashTableValuesView(self)
+
+    def items(self):
+        return HashTableItemsView(self)
+
+    # generator of (key, value) pairs which fails if the table changes
+    # between two steps
+    def iter_items(self):
+        self.finish_migration()
+        modification_count = self.modification_count
+        keys = self.slot_keys
+        values = self.slot_values
+        tombstone = self.TOMBSTONE
+        for i, k in enumerate(keys):
+            if k is not None and k is not tombstone:
+                yield k, values[i]
+                if self.modification_count != modification_count:
+                    raise RuntimeError("Hashtable changed during iteration")
+
+    # grows the table once, so that n more keys fit without resize_table
+    def reserve(self, n):
+        self.finish_migration()
+        if self.used_buckets + n <= self.threshold:
+            return
+        while int(self.capacity * self.load_factor) < self.key_count + n:
+            self.increase_capacity()
+            self.adjust_capacity()
+        self.rehash()
+
+    # bulk operations pre-size the table from the input length and return a
+    # list with the result of every single operation
+    def put_many(self, items):
+        if hasattr(items, "items"):
+            items = items.items()
+        if not hasattr(items, "__len__"):
+            items = list(items)
+        self.reserve(len(items))
+        insert = self.insert
+        return [insert(k, v) for k, v in items]
+
+    def get_many(self, keys):
+        get = self.get
+        return [get(k) for k in keys]
+
+    def remove_many(self, keys):
+        remove = self.remove
+        return [remove(k) for k in keys]
 
     # double size of the hashtable
     def resize_table(self):
-        self.increase_capacity()
-        self.adjust_capacity()
-
-        self.threshold = int(self.capacity * self.load_factor)
+        # a migration which is still in progress is finished first
+        if self.old_keys is not None:
+            self.migrate(self.old_capacity)
 
-        old_key_table = self.capacity * [None]
-        old_value_table = self.capacity * [None]
+        self.old_keys = self.slot_keys
+        self.old_values = self.slot_values
+        self.old_hashes = self.slot_hashes
+        self.old_capacity = self.capacity
+        self.old_mask = self.mask
+        self.migrate_index = 0
 
-        # key table pointer swap
-        key_table_tmp = self.keys
-        self.keys = old_key_table
-        old_key_table = key_table_tmp
-
-        # value table pointer swap
-        value_table_tmp = self.values
-        self.values = old_value_table
-        old_value_table = value_table_tmp
+        self.increase_capacity()
+        self.adjust_capacity()
+        self.allocate_table()
+        # the new table is empty, old tables are counted by key_count only
+        self.used_buckets = 0
+        self.modification_count += 1
 
-        # reset key count and buckets used
-        # re-insert all keys into the hashtable
-        self.key_count = self.used_buckets = 0
+        if not self.incremental:
+            self.migrate(self.old_capacity)
+
+    # moves live entries of the next n old buckets into the new table
+    def migrate(self, n):
+        old_keys = self.old_keys
+        old_values = self.old_values
+        old_hashes = self.old_hashes
+        tombstone = self.TOMBSTONE
+        place = self.place
+
+        start = self.migrate_index
+        end = min(start + n, self.old_capacity)
+        partial = end < self.old_capacity
+        moved = 0
+        for x in range(start, end):
+            k = old_keys[x]
+            if k is None or k is tombstone:
+                continue
+            place(k, old_hashes[x], old_values[x])
+            # probe chains of the old table must stay intact for the keys
+            # which are not migrated yet, so the bucket is not set to None.
+            # Nothing is looked up in the old table after the last chunk
+            if partial:
+                old_keys[x] = tombstone
+                old_values[x] = None
+            moved += 1
+        self.used_buckets += moved
+        self.migrate_index = end
+
+        if end == self.old_capacity:
+            self.old_keys = self.old_values = self.old_hashes = None
+
+    # re-inserts all live entries into fresh tables of the current capacity
+    def rehash(self):
+        old_keys = self.slot_keys
+        old_values = self.slot_values
+        old_hashes = self.slot_hashes
+        self.allocate_table()
+
+        tombstone = self.TOMBSTONE
+        place = self.place
+        for x, k in enumerate(old_keys):
+            if k is not None and k is not tombstone:
+                place(k, old_hashes[x], old_values[x])
+
+        # tombstones are gone
+        self.used_buckets = self.key_count
+        self.modification_count += 1
 
-        for i in range(len(old_key_table)):
-            if old_key_table[i] is not None and old_key_table[i] != self.TOMBSTONE:
-                self.insert(old_key_table[i], old_value_table[i])
-            old_value_table[i] = None
-            old_key_table[i] = None
+    # puts a key which is known to be absent into the first empty bucket.
+    # The hash is cached, so neither hash() nor __eq__ is called
+    def place(self, k, h, v):
+        keys = self.slot_keys
+        mask = self.mask
+        capacity = self.capacity
+        growth = self.PROBE_GROWTH
+        step = self.probe_step(h, capacity)
+        i = abs(h) & mask if mask else abs(h) % capacity
+        while keys[i] is not None:
+            i = (i + step) & mask if mask else (i + step) % capacity
+            step += growth
+        keys[i] = k
+        self.slot_values[i] = v
+        self.slot_hashes[i] = h
 
     def normalize_index(self, key_hash) -> int:
         return abs(key_hash) % self.capacity
@@ -131,6 +315,9 @@ class HashTableOpenAddressing(ABC):
             return a
         return self.gcd(b, a % b)
 
+    # the probe loops of insert and get are inlined on purpose: locals
+    # instead of attributes, cached hashes compared before __eq__ and no
+    # method calls per probe
     def insert(self, k, v):
         if k is None:
             raise ValueError("None key")
@@ -138,167 +325,337 @@ class HashTableOpenAddressing(ABC):
         if self.used_buckets >= self.threshold:
             self.resize_table()
 
-        self.setup_probing(k)
-        offset = self.normalize_index(hash(k))
+        h = self.hash_key(k)
+        if self.old_keys is not None:
+            self.migrate(self.migrate_step)
+            # the key is moved to the new table right away
+            if self.old_keys is not None:
+                i = self.find_old_slot(k, h)
+                if i != -1:
+                    self.old_keys[i] = self.TOMBSTONE
+                    self.old_values[i] = None
+                    self.key_count -= 1
+
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        mask = self.mask
+        capacity = self.capacity
+        growth = self.PROBE_GROWTH
+        tombstone = self.TOMBSTONE
+        step = self.probe_step(h, capacity)
+        i = abs(h) & mask if mask else abs(h) % capacity
         j = -1
-        x = 1
-        i = offset
         while True:
+            key = keys[i]
+            # current cell is None, insertion can occur
+            if key is None:
+                break
             # current slot was previously deleted
-            if self.keys[i] is not None and self.keys[i] == self.TOMBSTONE:
+            if key is tombstone:
                 if j == -1:
                     j = i
-            elif self.keys[i] is not None:
-                # key already exists in the hashtable, so update its value
-                if self.keys[i] == k:
-                    old_value = self.values[i]
-                    if j == -1:
-                        self.values[i] = v
-                    else:
-                        self.keys[i] = self.TOMBSTONE
-                        self.values[i] = None
-                        self.keys[j] = k
-                        self.values[j] = v
-                    self.modification_count += 1
-                    return v  # old_value
-            else:  # current cell is None, insertion can occur
-                # no previously encountered deleted buckets
+            # key already exists in the hashtable, so update its value
+            elif hashes[i] == h and (key is k or key == k):
+                values = self.slot_values
                 if j == -1:
-                    self.used_buckets += 1
-                    self.key_count += 1
-                    self.keys[i] = k
-                    self.values[i] = v
-                    return v
-                # previously seen deleted bucket
+                    values[i] = v
                 else:
-                    self.key_count += 1
-                    self.keys[i] = k
-                    self.values[i] = v
+                    # move the entry to the first deleted bucket, so the next
+                    # time we search for this key it will be found faster
+                    keys[i] = tombstone
+                    values[i] = None
+                    keys[j] = k
+                    values[j] = v
+                    hashes[j] = h
                 self.modification_count += 1
-                return None
-
-            i = self.normalize_index(offset + self.probe(x))
-            x += 1
+                return v
+            i = (i + step) & mask if mask else (i + step) % capacity
+            step += growth
+
+        # no previously encountered deleted buckets
+        if j == -1:
+            self.used_buckets += 1
+        # previously seen deleted bucket
+        else:
+            i = j
+        keys[i] = k
+        hashes[i] = h
+        self.slot_values[i] = v
+        self.key_count += 1
+        self.modification_count += 1
+        return v
+
+    # returns index of the bucket with the key or -1
+    def find_slot(self, k) -> int:
+        h = self.hash_key(k)
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        mask = self.mask
+        capacity = self.capacity
+        growth = self.PROBE_GROWTH
+        tombstone = self.TOMBSTONE
+        step = self.probe_step(h, capacity)
+        i = abs(h) & mask if mask else abs(h) % capacity
+        while True:
+            key = keys[i]
+            if key is None:
+                return -1
+            if key is not tombstone and hashes[i] == h and (key is k or key == k):
+                return i
+            i = (i + step) & mask if mask else (i + step) % capacity
+            step += growth
+
+    # same as find_slot, but in the table which is being migrated
+    def find_old_slot(self, k, h) -> int:
+        keys = self.old_keys
+        hashes = self.old_hashes
+        mask = self.old_mask
+        capacity = self.old_capacity
+        growth = self.PROBE_GROWTH
+        tombstone = self.TOMBSTONE
+        step = self.probe_step(h, capacity)
+        i = abs(h) & mask if mask else abs(h) % capacity
+        while True:
+            key = keys[i]
+            if key is None:
+                return -1
+            if key is not tombstone and hashes[i] == h and (key is k or key == k):
+                return i
+            i = (i + step) & mask if mask else (i + step) % capacity
+            step += growth
 
     def has_key(self, k) -> bool:
-        return self.get(k) != None
-        """
         if k is None:
             raise ValueError("None key")
-
-        self.setup_probing(k)
-        offset = self.normalize_index(hash(k))
-
-        j = -1
-        x = 1
-        i = offset
-        while True:
-            if self.keys[i] is not None and self.keys[i] == self.TOMBSTONE:
-                if j == -1:
-                    j = i
-            elif self.keys[i] is not None:
-                if self.keys[i] == k:
-                    # if j != -1 => we previously encountered a deleted cell
-                    # we can do an optimization by swapping the entries in cells
-                    # i and j so that the next time we search for this key it
-                    # will be found faster. This is called lazy
-                    # deletion/relocation
-                    if j != -1:
-                        self.keys[j] = self.keys[i]
-                        self.values[j] = self.values[i]
-                        self.keys[i] = self.TOMBSTONE
-                        self.values[i] = None
-                    return True
-            else:  # key was not found
-                return False
-            i = self.normalize_index(offset + self.probe(x))
-            x += 1
-        """
-
-    # returns None if value is None or key does not exist
+        if self.old_keys is not None:
+            self.migrate(self.migrate_step)
+        if self.find_slot(k) != -1:
+            return True
+        if self.old_keys is None:
+            return False
+        return self.find_old_slot(k, self.hash_key(k)) != -1
+
+    # returns None if value is None or key does not exist. get only reads,
+    # keys found behind a tombstone are moved closer by insert, not here, so
+    # lookups do not disturb iterations over the table
     def get(self, k):
         if k is None:
             raise ValueError("None key")
 
-        self.setup_probing(k)
-        offset = self.normalize_index(hash(k))
-
-        j = -1
-        x = 1
-        i = offset
+        h = self.hash_key(k)
+        if self.old_keys is not None:
+            self.migrate(self.migrate_step)
+
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        mask = self.mask
+        capacity = self.capacity
+        growth = self.PROBE_GROWTH
+        tombstone = self.TOMBSTONE
+        step = self.probe_step(h, capacity)
+        i = abs(h) & mask if mask else abs(h) % capacity
         while True:
-            if self.keys[i] is not None and self.keys[i] == self.TOMBSTONE:
-                if j == -1:
-                    j = i
-            elif self.keys[i] is not None:
-                if self.keys[i] == k:
-                    if j != -1:
-                        self.keys[j] = self.keys[i]
-                        self.values[j] = self.values[i]
-                        self.keys[i] = self.TOMBSTONE
-                        self.values[i] = None
-                        return self.values[j]
-                    else:
-                        return self.values[i]
-            else:
-                return None
-            i = self.normalize_index(offset + self.probe(x))
-            x += 1
+            key = keys[i]
+            if key is None:
+                break
+            if key is not tombstone and hashes[i] == h and (key is k or key == k):
+                return self.slot_values[i]
+            i = (i + step) & mask if mask else (i + step) % capacity
+            step += growth
+
+        if self.old_keys is not None:
+            i = self.find_old_slot(k, h)
+            if i != -1:
+                return self.old_values[i]
+        return None
 
     def remove(self, k):
         if k is None:
             raise ValueError("None key")
 
-        self.setup_probing(k)
-        offset = self.normalize_index(hash(k))
-        j = -1
-        x = 0
-        i = offset - 1
-        while True:
-            i = self.normalize_index(offset + self.probe(x))
-            x += 1
+        if self.old_keys is not None:
+            self.migrate(self.migrate_step)
 
-            if self.keys[i] is None or self.keys[i] == self.TOMBSTONE:
-                continue
+        keys = self.slot_keys
+        values = self.slot_values
+        i = self.find_slot(k)
+        if i == -1 and self.old_keys is not None:
+            keys = self.old_keys
+            values = self.old_values
+            i = self.find_old_slot(k, self.hash_key(k))
+        if i == -1:
+            return None
 
-            if self.keys[i] is None:
-                return None
+        self.key_count -= 1
+        self.modification_count += 1
+        old_value = values[i]
+        keys[i] = self.TOMBSTONE
+        values[i] = None
+
+        # key_count includes keys of the old table during a migration, which
+        # is going to drop its tombstones anyway
+        if (
+            self.compact_threshold is not None
+            and self.old_keys is None
+            and self.used_buckets - self.key_count > self.tombstone_limit
+        ):
+            self.compact()
+        return old_value
+
+    # rebuilds the table with the same capacity and without tombstones
+    def compact(self):
+        self.finish_migration()
+        self.rehash()
+
+    # number of buckets inspected by a lookup of the key
+    def probe_count(self, k) -> int:
+        h = self.hash_key(k)
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        mask = self.mask
+        capacity = self.capacity
+        growth = self.PROBE_GROWTH
+        tombstone = self.TOMBSTONE
+        step = self.probe_step(h, capacity)
+        i = abs(h) & mask if mask else abs(h) % capacity
+        count = 1
+        while True:
+            key = keys[i]
+            if key is None:
+                return count
+            if key is not tombstone and hashes[i] == h and (key is k or key == k):
+                return count
+            i = (i + step) & mask if mask else (i + step) % capacity
+            step += growth
+            count += 1
+
+    # health of the table: live keys, tombstones and probe lengths of the
+    # live keys (1 means the key is in its home bucket)
+    def stats(self):
+        self.finish_migration()
+        tombstone = self.TOMBSTONE
+        probe_count = self.probe_count
+        total = 0
+        longest = 0
+        for k in self.slot_keys:
+            if k is None or k is tombstone:
+                continue
+            n = probe_count(k)
+            total += n
+            longest = max(longest, n)
+        return {
+            "capacity": self.capacity,
+            "keys": self.key_count,
+            "tombstones": self.used_buckets - self.key_count,
+            "load": self.used_buckets / self.capacity,
+            "avg_probe_length": total / self.key_count if self.key_count else 0.0,
+            "max_probe_length": longest,
+        }
+
+    # pickled state holds the live slots only: a byte per slot which tells
+    # whether it is live, then cached hashes, keys and values of the live
+    # slots. TOMBSTONE cannot be pickled (a copy would not be the same
+    # object) and None padding is a waste
+    def __getstate__(self):
+        self.finish_migration()
+        tombstone = self.TOMBSTONE
+        live = bytearray(self.capacity)
+        for i, k in enumerate(self.slot_keys):
+            if k is not None and k is not tombstone:
+                live[i] = 1
+        slots = list(compress(range(self.capacity), live))
+        keys = [self.slot_keys[i] for i in slots]
+        values = self.slot_values
+        hashes = self.slot_hashes
+        return {
+            "capacity": self.capacity,
+            "load_factor": self.load_factor,
+            "incremental": self.incremental,
+            "migrate_step": self.migrate_step,
+            "compact_threshold": self.compact_threshold,
+            "instrument": self.counters is not None,
+            "fingerprint": snapshot_fingerprint(keys),
+            "seed": self.seed,
+            # probe chains which run over a tombstone would break without it
+            "has_tombstones": self.used_buckets != self.key_count,
+            "live": live,
+            "hashes": array("q", [hashes[i] for i in slots]),
+            "keys": keys,
+            "values": [values[i] for i in slots],
+        }
+
+    # the entries go back to their slots when the hashes are still valid,
+    # i.e. hash() gives the same values in this process and every key hashes
+    # by value (see snapshot_fingerprint), and the table had no tombstones.
+    # Otherwise they are placed again, with the saved hashes if possible
+    def __setstate__(self, state):
+        self.capacity = state["capacity"]
+        self.load_factor = state["load_factor"]
+        self.incremental = state["incremental"]
+        self.migrate_step = state["migrate_step"]
+        self.compact_threshold = state["compact_threshold"]
+        if state["seed"] is not None:
+            self.use_seed(state["seed"])
+        self.allocate_table()
+
+        keys = state["keys"]
+        values = state["values"]
+        hashes = state["hashes"]
+        if state["fingerprint"] != hash_fingerprint():
+            hashes = [self.hash_key(k) for k in keys]
+        elif not state["has_tombstones"]:
+            table_keys = self.slot_keys
+            table_values = self.slot_values
+            table_hashes = self.slot_hashes
+            slots = compress(range(self.capacity), state["live"])
+            for i, k, v, h in zip(slots, keys, values, hashes):
+                table_keys[i] = k
+                table_values[i] = v
+                table_hashes[i] = h
+            keys = ()
+        place = self.place
+        for k, v, h in zip(keys, values, hashes):
+            place(k, h, v)
+        self.key_count = self.used_buckets = len(state["keys"])
+
+        if state["instrument"]:
+            self.counters = HashTableCounters()
+            self.counters.attach(self)
+
+    # compact binary snapshot, see __getstate__
+    def dump(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            ht = pickle.load(f)
+        if not isinstance(ht, cls):
+            raise ValueError(f"Not a {cls.__name__} snapshot: {path}")
+        return ht
 
-            if self.keys[i] == k:
-                self.key_count -= 1
-                self.modification_count += 1
-                old_value = self.values[i]
-                self.keys[i] = self.TOMBSTONE
-                self.values[i] = None
-                return old_value
+    # iteration visits every bucket anyway, so a migration in progress is
+    # finished first and only the new table has to be walked
+    def finish_migration(self):
+        if self.old_keys is not None:
+            self.migrate(self.old_capacity)
 
     def __str__(self):
         s = "{ "
-        for i in range(self.capacity):
-            if self.keys[i] is not None and self.keys[i] != self.TOMBSTONE:
-                s += f"{self.keys[i]} => {self.values[i]}, "
+        for k, v in self.iter_items():
+            s += f"{k} => {v}, "
         s += "}"
         return s
 
     def __repr__(self):
         s = "{"
-        for i in range(self.capacity):
-            if self.keys[i] is not None and self.keys[i] != self.TOMBSTONE:
-                s += f"{self.keys[i]}: {self.values[i]}"
+        for k, v in self.iter_items():
+            s += f"{k}: {v}"
         s += "}"
         return s
 
-    curr = None
-    end = None
-
+    # every call returns a new iterator, so iterations can be nested
     def __iter__(self):
-        self.curr = 0
-        return self
-
-    def __next__(self):
-        while self.curr < self.capacity:
-            x = self.keys[self.curr]
-            self.curr += 1
-            if x is not None and x != self.TOMBSTONE:
-                return x
-        raise StopIteration
+        for k, _ in self.iter_items():
+            yield k
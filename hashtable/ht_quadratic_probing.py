@@ -11,6 +11,9 @@ class HashTableQuadraticProbing(HashTableOpenAddressing):
     # const for linear probing
     LINEAR_CONSTANT = 17
 
+    # gaps between probes are 1, 2, 3, ... (triangular numbers)
+    PROBE_GROWTH = 1
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -26,6 +29,9 @@ class HashTableQuadraticProbing(HashTableOpenAddressing):
     def probe(self, x) -> int:
         return (x * x + x) >> 1
 
+    def probe_step(self, key_hash, capacity) -> int:
+        return 1
+
     def increase_capacity(self):
         self.capacity = self.next_power_of_two(self.capacity)
 
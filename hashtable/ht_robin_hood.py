@@ -0,0 +1,193 @@
+"""
+HashTable Open Addressing: Robin Hood Hashing
+
+Linear probing where on insert an entry that is closer to its home bucket
+("richer") gives its place to the entry that travelled further ("poorer").
+Probe sequence lengths stay short and even, and a lookup can stop as soon
+as it meets an entry that is closer to home than the searched key would be.
+
+Deletion uses backward shift instead of TOMBSTONE markers, so the table
+does not degrade under insert/delete churn.
+"""
+from ht_linear_probing import HashTableLinearProbing
+
+
+class HashTableRobinHood(HashTableLinearProbing):
+    # classic robin hood walks neighbour buckets
+    LINEAR_CONSTANT = 1
+
+    # probe sequence length (distance from the home bucket) of every slot
+    dists = []
+
+    def __init__(self, **kwargs):
+        # probe loops below do not look into the tables being migrated
+        if kwargs.get("incremental"):
+            raise ValueError("Incremental resize is not supported")
+        super().__init__(**kwargs)
+
+    # capacity is kept as a power of two, so the index is always a bitmask
+    def increase_capacity(self):
+        self.capacity *= 2
+
+    def adjust_capacity(self):
+        self.capacity = 1 << (self.capacity - 1).bit_length()
+
+    def allocate_table(self):
+        super().allocate_table()
+        self.dists = self.capacity * [0]
+
+    # puts a key which is known to be absent, displacing richer entries
+    def place(self, k, h, v):
+        keys = self.slot_keys
+        values = self.slot_values
+        hashes = self.slot_hashes
+        dists = self.dists
+        mask = self.mask
+        i = abs(h) & mask
+        d = 0
+        while True:
+            if keys[i] is None:
+                keys[i] = k
+                values[i] = v
+                hashes[i] = h
+                dists[i] = d
+                return
+            if dists[i] < d:
+                k, keys[i] = keys[i], k
+                v, values[i] = values[i], v
+                h, hashes[i] = hashes[i], h
+                d, dists[i] = dists[i], d
+            i = (i + 1) & mask
+            d += 1
+
+    def insert(self, k, v):
+        if k is None:
+            raise ValueError("None key")
+
+        if self.used_buckets >= self.threshold:
+            self.resize_table()
+
+        h = self.hash_key(k)
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        dists = self.dists
+        mask = self.mask
+        i = abs(h) & mask
+        d = 0
+        while True:
+            key = keys[i]
+            # key cannot be further than the first empty or richer bucket
+            if key is None or dists[i] < d:
+                break
+            if hashes[i] == h and (key is k or key == k):
+                self.slot_values[i] = v
+                self.modification_count += 1
+                return v
+            i = (i + 1) & mask
+            d += 1
+
+        self.place(k, h, v)
+        self.key_count += 1
+        self.used_buckets += 1
+        self.modification_count += 1
+        return v
+
+    def find_slot(self, k) -> int:
+        h = self.hash_key(k)
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        dists = self.dists
+        mask = self.mask
+        i = abs(h) & mask
+        d = 0
+        while True:
+            key = keys[i]
+            if key is None or dists[i] < d:
+                return -1
+            if hashes[i] == h and (key is k or key == k):
+                return i
+            i = (i + 1) & mask
+            d += 1
+
+    def probe_count(self, k) -> int:
+        h = self.hash_key(k)
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        dists = self.dists
+        mask = self.mask
+        i = abs(h) & mask
+        d = 0
+        while True:
+            key = keys[i]
+            if key is None or dists[i] < d:
+                return d + 1
+            if hashes[i] == h and (key is k or key == k):
+                return d + 1
+            i = (i + 1) & mask
+            d += 1
+
+    def get(self, k):
+        if k is None:
+            raise ValueError("None key")
+
+        h = self.hash_key(k)
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        dists = self.dists
+        mask = self.mask
+        i = abs(h) & mask
+        d = 0
+        while True:
+            key = keys[i]
+            # a miss terminates at the first richer entry
+            if key is None or dists[i] < d:
+                return None
+            if hashes[i] == h and (key is k or key == k):
+                return self.slot_values[i]
+            i = (i + 1) & mask
+            d += 1
+
+    def remove(self, k):
+        if k is None:
+            raise ValueError("None key")
+
+        i = self.find_slot(k)
+        if i == -1:
+            return None
+
+        keys = self.slot_keys
+        values = self.slot_values
+        hashes = self.slot_hashes
+        dists = self.dists
+        mask = self.mask
+        old_value = values[i]
+
+        # backward shift: pull the following entries one bucket closer to
+        # their home until an empty bucket or an entry already at home
+        j = (i + 1) & mask
+        while keys[j] is not None and dists[j] > 0:
+            keys[i] = keys[j]
+            values[i] = values[j]
+            hashes[i] = hashes[j]
+            dists[i] = dists[j] - 1
+            i = j
+            j = (j + 1) & mask
+        keys[i] = None
+        values[i] = None
+        dists[i] = 0
+
+        self.key_count -= 1
+        self.used_buckets -= 1
+        self.modification_count += 1
+        return old_value
+
+    # the distances follow from the restored slots and hashes
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        dists = self.dists
+        mask = self.mask
+        for i, k in enumerate(keys):
+            if k is not None:
+                dists[i] = (i - (abs(hashes[i]) & mask)) & mask
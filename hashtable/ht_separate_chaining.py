@@ -7,28 +7,18 @@ https://github.com/williamfiset/
 Separate chaining is hash collision resolution technique.
 It maintains a DS (linked list, array, balanced tree etc) to hold all the
 different values which hashed to a particular value.
-"""
-
-
-class Entry:
-    chash = None
-    key = None
-    value = None
-
-    def __init__(self, key, value):
-        self.key = key
-        self.value = value
-        self.chash = hash(key)
-
-    def hash_equals(self, entry, other) -> bool:
-        return self.chash == other.chash
 
-    # override __str__
-    def __str__(self):
-        return f"Key=>value: {self.key} => {self.value}"
-
-    def __repr__(self):
-        return f"{self.key} => {self.value}"
+Here the linked lists are flat: an entry is an index into parallel arrays of
+keys, values, cached hashes and "next" links, and every bucket stores the
+index of the first entry of its chain. There is no object per entry and no
+list per bucket. Removed entries are linked into a free list and reused.
+"""
+import pickle
+import random
+from array import array
+from ht_counters import HashTableCounters
+from ht_hashing import hash_fingerprint, seeded_hash, snapshot_fingerprint
+from ht_views import HashTableItemsView, HashTableKeysView, HashTableValuesView
 
 
 class HashTableSeparateChaining:
@@ -36,21 +26,71 @@ class HashTableSeparateChaining:
     capacity = 0
     threshold = 0
     sz = 0
-
-    # instead of using linked list, I use a list due to simplicity in python
-    table = []
+    modification_count = 0
+
+    # index of the first entry of every bucket chain, -1 for an empty bucket
+    heads = None
+
+    # entries, entry_keys[e] is None for an entry in the free list
+    entry_keys = []
+    entry_values = []
+    entry_hashes = None
+    # next entry in the same chain (or in the free list), -1 ends the chain
+    entry_next = None
+    # first entry of the free list
+    free = -1
+
+    # incremental resize: the old heads are kept next to the new ones and
+    # every operation migrates migrate_step of its buckets. Buckets with index
+    # below migrate_index are already moved. old_heads is None when nothing is
+    # migrated
+    incremental = False
+    migrate_step = 0
+    migrate_index = 0
+    old_heads = None
+    old_capacity = 0
+
+    # HashTableCounters when the table is created with instrument=True
+    counters = None
+
+    # hash function of the keys. A seeded table (seeded=True or a given
+    # seed) mixes hash(k) with its seed, see ht_hashing.seeded_hash
+    hash_key = hash
+    seed = None
 
     # not necessary to define DEFAULT_CAPACITY and DEFAULT_LOAD_FACTOR
     # I use them as optional values in the constructor
-    def __init__(self, capacity=3, max_load_factor=0.75):
+    def __init__(
+        self,
+        capacity=3,
+        max_load_factor=0.75,
+        incremental=False,
+        migrate_step=16,
+        instrument=False,
+        seeded=False,
+        seed=None,
+    ):
         if capacity < 0 or capacity is None:
             raise ValueError("Capacity must be > 0 and not None")
         if max_load_factor <= 0 or max_load_factor is None:
             raise ValueError("Max load factor must be > 0 and not None")
+        if migrate_step is None or migrate_step <= 0:
+            raise ValueError("Migrate step must be > 0 and not None")
         self.capacity = capacity
         self.max_load_factor = max_load_factor
+        self.incremental = incremental
+        self.migrate_step = migrate_step
+        if seeded or seed is not None:
+            self.use_seed(random.getrandbits(64) if seed is None else seed)
         self.threshold = int(self.capacity * self.max_load_factor)
-        self.table = self.capacity * [None]
+        self.clear()
+        if instrument:
+            self.counters = HashTableCounters()
+            self.counters.attach(self)
+
+    def use_seed(self, seed):
+        self.seed = seed
+        self.hash_key = seeded_hash(seed)
 
     def size(self) -> int:
         return self.sz
@@ -58,19 +98,42 @@ class HashTableSeparateChaining:
     def is_empty(self) -> bool:
         return self.sz == 0
 
+    def is_migrating(self) -> bool:
+        return self.old_heads is not None
+
     # converts a hash value to an index
     def normalize_index(self, key_hash: int) -> int:
         return abs(key_hash) % self.capacity
 
+    # returns heads and index of the bucket the key hash belongs to. During
+    # a migration it is the old heads for buckets which are not moved yet
+    def locate(self, key_hash: int):
+        if self.old_heads is not None:
+            self.migrate(self.migrate_step)
+            if self.old_heads is not None:
+                old_index = abs(key_hash) % self.old_capacity
+                if old_index >= self.migrate_index:
+                    return self.old_heads, old_index
+        return self.heads, self.normalize_index(key_hash)
+
     def clear(self):
-        self.table = [[None] for x in self.table]
+        self.heads = array("q", [-1]) * self.capacity
+        self.entry_keys = []
+        self.entry_values = []
+        self.entry_hashes = array("q")
+        self.entry_next = array("q")
+        self.free = -1
+        self.old_heads = None
+        self.sz = 0
+        self.modification_count += 1
 
     def contains_key(self, key) -> bool:
         return self.has_key(key)
 
     def has_key(self, key) -> bool:
-        bucket_index = self.normalize_index(hash(key))
-        return self.bucket_seek_entry(bucket_index, key) is not None
+        key_hash = self.hash_key(key)
+        heads, bucket_index = self.locate(key_hash)
+        return self.seek(heads[bucket_index], key_hash, key) != -1
 
     def put(self, key, value):
         return self.insert(key, value)
@@ -81,125 +144,343 @@ class HashTableSeparateChaining:
     def insert(self, key, value):
         if key is None:
             raise ValueError("Key is None")
-        entry = Entry(key, value)
-        bucket_index = self.normalize_index(entry.chash)
-        return self.bucket_insert_entry(bucket_index, entry)
+        key_hash = self.hash_key(key)
+        heads, bucket_index = self.locate(key_hash)
+        e = self.seek(heads[bucket_index], key_hash, key)
+        if e != -1:
+            old_val = self.entry_values[e]
+            self.entry_values[e] = value
+            self.modification_count += 1
+            return old_val
+
+        self.link(heads, bucket_index, key_hash, key, value)
+        self.sz += 1
+        self.modification_count += 1
+        if self.sz > self.threshold:
+            self.resize_table()
+        return None
 
     def get(self, key):
         if key is None:
             return None
-        bucket_index = self.normalize_index(hash(key))
-        entry = self.bucket_seek_entry(bucket_index, key)
-        if entry is not None:
-            return entry.value
+        key_hash = self.hash_key(key)
+        if self.old_heads is None:
+            e = self.heads[abs(key_hash) % self.capacity]
+        else:
+            heads, bucket_index = self.locate(key_hash)
+            e = heads[bucket_index]
+
+        # seek inlined, get is the hot path
+        entry_keys = self.entry_keys
+        entry_hashes = self.entry_hashes
+        entry_next = self.entry_next
+        while e != -1:
+            if entry_hashes[e] == key_hash:
+                k = entry_keys[e]
+                if k is key or k == key:
+                    return self.entry_values[e]
+            e = entry_next[e]
         return None
 
     def remove(self, key):
         if key is None:
             return None
-        bucket_index = self.normalize_index(hash(key))
-        return self.bucket_remove_entry(bucket_index, key)
-
-    def bucket_remove_entry(self, bucket_index, key):
-        entry = self.bucket_seek_entry(bucket_index, key)
-        if entry is not None:
-            links = self.table[bucket_index]
-            links.remove(entry)
-            self.sz -= 1
-            return entry.value
-        else:
-            return None
-
-    def bucket_insert_entry(self, bucket_index, entry):
-        bucket = self.table[bucket_index]
-        if bucket is None:
-            bucket = []
-            self.table[bucket_index] = bucket
-
-        existent_entry = self.bucket_seek_entry(bucket_index, entry.key)
-        if existent_entry is None:
-            bucket.append(entry)
-            self.sz += 1
-            if self.sz > self.threshold:
-                self.resize_table()
+        key_hash = self.hash_key(key)
+        heads, bucket_index = self.locate(key_hash)
+        e = self.unlink(heads, bucket_index, key_hash, key)
+        if e == -1:
             return None
+        value = self.entry_values[e]
+        self.free_entry(e)
+        self.sz -= 1
+        self.modification_count += 1
+        return value
+
+    # returns index of the entry with the key in the chain starting at e or -1
+    def seek(self, e, key_hash, key) -> int:
+        entry_keys = self.entry_keys
+        entry_hashes = self.entry_hashes
+        entry_next = self.entry_next
+        while e != -1:
+            if entry_hashes[e] == key_hash:
+                k = entry_keys[e]
+                if k is key or k == key:
+                    return e
+            e = entry_next[e]
+        return -1
+
+    # number of chain entries inspected by a lookup of the key
+    def probe_count(self, key) -> int:
+        key_hash = self.hash_key(key)
+        heads = self.heads
+        bucket_index = self.normalize_index(key_hash)
+        if self.old_heads is not None:
+            old_index = abs(key_hash) % self.old_capacity
+            if old_index >= self.migrate_index:
+                heads = self.old_heads
+                bucket_index = old_index
+        n = 0
+        e = heads[bucket_index]
+        while e != -1:
+            n += 1
+            if self.entry_keys[e] == key:
+                break
+            e = self.entry_next[e]
+        return n
+
+    # creates an entry in front of the bucket chain and returns its index
+    def link(self, heads, bucket_index, key_hash, key, value) -> int:
+        e = self.alloc_entry(key_hash, key, value, heads[bucket_index])
+        heads[bucket_index] = e
+        return e
+
+    # takes an entry from the free list or appends a new one
+    def alloc_entry(self, key_hash, key, value, next_) -> int:
+        e = self.free
+        if e != -1:
+            self.free = self.entry_next[e]
+            self.entry_keys[e] = key
+            self.entry_values[e] = value
+            self.entry_hashes[e] = key_hash
+            self.entry_next[e] = next_
         else:
-            old_val = existent_entry.value
-            existent_entry.value = entry.value
-            return old_val
-
-    def bucket_seek_entry(self, bucket_index, key):
-        if key is None:
-            return None
-        bucket = self.table[bucket_index]
-        if bucket is None:
-            return None
-        for e in bucket:
-            if e is not None and e.key == key:
-                return e
-        return None
-
-    def resize_table(self):
-        self.capacity *= 2
+            e = len(self.entry_keys)
+            self.entry_keys.append(key)
+            self.entry_values.append(value)
+            self.entry_hashes.append(key_hash)
+            self.entry_next.append(next_)
+        return e
+
+    # takes the entry with the key out of the bucket chain and returns its
+    # index or -1. The entry has to be released by free_entry
+    def unlink(self, heads, bucket_index, key_hash, key) -> int:
+        entry_keys = self.entry_keys
+        entry_hashes = self.entry_hashes
+        entry_next = self.entry_next
+        prev = -1
+        e = heads[bucket_index]
+        while e != -1:
+            if entry_hashes[e] == key_hash:
+                k = entry_keys[e]
+                if k is key or k == key:
+                    if prev == -1:
+                        heads[bucket_index] = entry_next[e]
+                    else:
+                        entry_next[prev] = entry_next[e]
+                    return e
+            prev = e
+            e = entry_next[e]
+        return -1
+
+    # puts an unlinked entry into the free list
+    def free_entry(self, e):
+        self.entry_keys[e] = None
+        self.entry_values[e] = None
+        self.entry_next[e] = self.free
+        self.free = e
+
+    # grows the table once, so that n more keys fit without resize_table
+    def reserve(self, n):
+        capacity = max(self.capacity, 1)
+        while int(capacity * self.max_load_factor) < self.sz + n:
+            capacity *= 2
+        if capacity != self.capacity:
+            self.resize_table(capacity)
+            self.finish_migration()
+
+    # bulk operations pre-size the table from the input length and return a
+    # list with the result of every single operation
+    def put_many(self, items):
+        if hasattr(items, "items"):
+            items = items.items()
+        if not hasattr(items, "__len__"):
+            items = list(items)
+        self.reserve(len(items))
+        insert = self.insert
+        return [insert(k, v) for k, v in items]
+
+    def get_many(self, keys):
+        get = self.get
+        return [get(k) for k in keys]
+
+    def remove_many(self, keys):
+        remove = self.remove
+        return [remove(k) for k in keys]
+
+    # doubles the capacity by default. Entries stay where they are, only the
+    # chains are rebuilt
+    def resize_table(self, capacity=None):
+        # a migration which is still in progress is finished first
+        if self.old_heads is not None:
+            self.migrate(self.old_capacity)
+
+        self.old_heads = self.heads
+        self.old_capacity = self.capacity
+        self.migrate_index = 0
+
+        self.capacity = 2 * self.capacity if capacity is None else capacity
         self.threshold = int(self.capacity * self.max_load_factor)
-        new_table = self.capacity * [None]
-
-        for i in range(len(self.table)):
-            if self.table[i] is not None:
-                for e in self.table[i]:
-                    if e is not None:
-                        bucket_index = self.normalize_index(e.chash)
-                        bucket = new_table[bucket_index]
-                        if bucket is None:
-                            bucket = []
-                            new_table[bucket_index] = bucket
-                            bucket.append(e)
-
-                    # not necessary step in python
-                    self.table[i] = None
-        self.table = new_table
-
+        self.heads = array("q", [-1]) * self.capacity
+
+        if not self.incremental:
+            self.migrate(self.old_capacity)
+
+    # moves chains of the next n old buckets into the new heads
+    def migrate(self, n):
+        old_heads = self.old_heads
+        heads = self.heads
+        entry_hashes = self.entry_hashes
+        entry_next = self.entry_next
+        capacity = self.capacity
+        start = self.migrate_index
+        end = min(start + n, self.old_capacity)
+
+        for i in range(start, end):
+            e = old_heads[i]
+            while e != -1:
+                next_ = entry_next[e]
+                bucket_index = abs(entry_hashes[e]) % capacity
+                entry_next[e] = heads[bucket_index]
+                heads[bucket_index] = e
+                e = next_
+            old_heads[i] = -1
+        self.migrate_index = end
+
+        if end == self.old_capacity:
+            self.old_heads = None
+
+    def finish_migration(self):
+        if self.old_heads is not None:
+            self.migrate(self.old_capacity)
+
+    # pickled state holds the live entries only, chain after chain, so there
+    # are no free entries and the entry arrays restore as they are
+    def __getstate__(self):
+        self.finish_migration()
+        entry_keys = self.entry_keys
+        entry_values = self.entry_values
+        entry_hashes = self.entry_hashes
+        entry_next = self.entry_next
+        keys = []
+        values = []
+        hashes = array("q")
+        nexts = array("q")
+        heads = array("q", [-1]) * self.capacity
+        for b, e in enumerate(self.heads):
+            if e == -1:
+                continue
+            heads[b] = len(keys)
+            while e != -1:
+                keys.append(entry_keys[e])
+                values.append(entry_values[e])
+                hashes.append(entry_hashes[e])
+                nexts.append(len(keys))
+                e = entry_next[e]
+            nexts[-1] = -1
+        return {
+            "capacity": self.capacity,
+            "max_load_factor": self.max_load_factor,
+            "incremental": self.incremental,
+            "migrate_step": self.migrate_step,
+            "instrument": self.counters is not None,
+            "fingerprint": snapshot_fingerprint(keys),
+            "seed": self.seed,
+            "heads": heads,
+            "next": nexts,
+            "hashes": hashes,
+            "keys": keys,
+            "values": values,
+        }
+
+    # the chains are restored as they were when the hashes are still valid
+    # (see snapshot_fingerprint), otherwise every entry is hashed and linked
+    # again
+    def __setstate__(self, state):
+        self.capacity = state["capacity"]
+        self.max_load_factor = state["max_load_factor"]
+        self.incremental = state["incremental"]
+        self.migrate_step = state["migrate_step"]
+        if state["seed"] is not None:
+            self.use_seed(state["seed"])
+        self.threshold = int(self.capacity * self.max_load_factor)
+        self.clear()
+
+        keys = state["keys"]
+        values = state["values"]
+        if state["fingerprint"] == hash_fingerprint():
+            self.heads = state["heads"]
+            self.entry_keys = keys
+            self.entry_values = values
+            self.entry_hashes = state["hashes"]
+            self.entry_next = state["next"]
+        else:
+            heads = self.heads
+            capacity = self.capacity
+            for k, v in zip(keys, values):
+                h = self.hash_key(k)
+                self.link(heads, abs(h) % capacity, h, k, v)
+        self.sz = len(keys)
+
+        if state["instrument"]:
+            self.counters = HashTableCounters()
+            self.counters.attach(self)
+
+    # compact binary snapshot, see __getstate__
+    def dump(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            ht = pickle.load(f)
+        if not isinstance(ht, cls):
+            raise ValueError(f"Not a {cls.__name__} snapshot: {path}")
+        return ht
+
+    # live views like the ones of dict. They read the entry arrays directly,
+    # free entries have None key
     def keys(self):
-        list_keys = []
-        for bucket in self.table:
-            if bucket is not None:
-                for e in bucket:
-                    list_keys.append(e.key)
-        return list_keys
+        return HashTableKeysView(self)
 
     def values(self):
-        list_values = []
-        for bucket in self.table:
-            if bucket is not None:
-                for e in bucket:
-                    list_values.append(e.value)
-        return list_values
+        return HashTableValuesView(self)
+
+    def items(self):
+        return HashTableItemsView(self)
+
+    # generator of (key, value) pairs which fails if the table changes
+    # between two steps. Resizing moves no entry, only chains
+    def iter_items(self):
+        modification_count = self.modification_count
+        values = self.entry_values
+        for e, k in enumerate(self.entry_keys):
+            if k is not None:
+                yield k, values[e]
+                if self.modification_count != modification_count:
+                    raise RuntimeError("Hashtable changed during iteration")
+
+    def __iter__(self):
+        for k, _ in self.iter_items():
+            yield k
 
     # generator
     def hash_iterator(self):
-        if self.sz < 1:
-            return None
-        for i in range(self.sz):
-            if self.table[i] is not None:
-                continue
-            for e in self.table[i]:
-                yield e
+        return iter(self)
 
     def __str__(self):
         r = ""
-        for i in range(self.capacity):
-            if self.table[i] is None:
-                continue
-            for e in self.table[i]:
-                r += f"{e}, "
+        for k, v in zip(self.entry_keys, self.entry_values):
+            if k is not None:
+                r += f"Key=>value: {k} => {v}, "
         return r
 
 
+"""
 ht = HashTableSeparateChaining()
 ht.add(1, 1)
 print(ht.sz)
 print(ht.capacity)
-print(ht.table)
 print(ht)
 print(ht.get(1))
 ht.add(1, 5)
@@ -207,21 +488,22 @@ ht.add(0, 101)
 ht.add(4, 2)
 # for k in range(25):
 #    ht.add(k, k)
-print(ht.table)
+print(ht)
 print("ht.get(4): ", ht.get(4))
 ht.remove(4)
-print(ht.table)
+print(ht)
 ht.remove(0)
-print(ht.table)
+print(ht)
 ht.add(0, 201)
 ht.put(11, 99)
-print(ht.table)
+print(ht)
 arr = []
 for i in range(9):
     random_val = 17
     arr.append(random_val)
     ht.put(i, random_val)
-    print(i, ht.table)
+    print(i, ht)
 
 ht.clear()
-print(ht.table)
+print(ht)
+"""
@@ -0,0 +1,249 @@
+"""
+HashTable Open Addressing: Swiss table
+
+Every slot has a control byte next to it:
+
+    EMPTY     0x80
+    DELETED   0xFE
+    0 ... 127 the slot is full, the 7 low bits of the key hash (h2)
+
+hash(k) is mixed first (ht_hashing.mix64): ints hash to themselves, and
+consecutive ints would otherwise share h1 and pile up in one group. The
+mixed hash is cached per slot, resizing does not mix again.
+
+Slots come in groups of GROUP. The rest of the hash (h1) picks the first
+group, then groups are probed with a triangular sequence. A lookup searches
+a group's control bytes for h2 with bytearray.find, which scans in C, and
+only compares the keys of the matching slots; a non-matching slot costs no
+Python __eq__ and almost no bytecode. The probe ends at the first group
+with an EMPTY byte.
+
+Inspired by Abseil's flat_hash_map
+https://abseil.io/about/design/swisstables
+"""
+from ht_hashing import mix64
+
+
+class HashTableSwiss:
+    GROUP = 16
+    EMPTY = 0x80
+    DELETED = 0xFE
+    # max load of the slots, FULL and DELETED count
+    LOAD_FACTOR = 7 / 8
+
+    # number of groups, a power of two
+    groups = 0
+    group_mask = 0
+    threshold = 0
+    key_count = 0
+    # FULL and DELETED slots
+    used_slots = 0
+    modification_count = 0
+
+    ctrl = None
+    slot_keys = []
+    slot_values = []
+    slot_hashes = []
+
+    def __init__(self, capacity=16):
+        if capacity is None or capacity <= 0:
+            raise ValueError(f"Illegal capacity: {capacity}")
+        groups = -(-capacity // self.GROUP)
+        self.allocate_table(1 << (groups - 1).bit_length())
+
+    def allocate_table(self, groups):
+        n = groups * self.GROUP
+        self.groups = groups
+        self.group_mask = groups - 1
+        self.threshold = int(n * self.LOAD_FACTOR)
+        self.ctrl = bytearray([self.EMPTY]) * n
+        self.slot_keys = n * [None]
+        self.slot_values = n * [None]
+        self.slot_hashes = n * [0]
+        self.key_count = 0
+        self.used_slots = 0
+
+    def clear(self):
+        self.allocate_table(self.groups)
+        self.modification_count += 1
+
+    def size(self) -> int:
+        return self.key_count
+
+    # number of slots
+    def get_capacity(self) -> int:
+        return self.groups * self.GROUP
+
+    def is_empty(self) -> bool:
+        return self.key_count == 0
+
+    def put(self, key, value):
+        return self.insert(key, value)
+
+    def add(self, key, value):
+        return self.insert(key, value)
+
+    def contains(self, key):
+        return self.has_key(key)
+
+    # returns the slot of the key or -1
+    def find_slot(self, k, h) -> int:
+        find = self.ctrl.find
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        size = self.GROUP
+        mask = self.group_mask
+        empty = self.EMPTY
+        h2 = h & 0x7F
+        g = (h >> 7) & mask
+        step = 0
+        while True:
+            base = g * size
+            end = base + size
+            i = find(h2, base, end)
+            while i != -1:
+                if hashes[i] == h:
+                    key = keys[i]
+                    if key is k or key == k:
+                        return i
+                i = find(h2, i + 1, end)
+            if find(empty, base, end) != -1:
+                return -1
+            step += 1
+            g = (g + step) & mask
+
+    # first EMPTY or DELETED slot on the probe sequence of the hash
+    def find_free(self, h) -> int:
+        ctrl = self.ctrl
+        size = self.GROUP
+        mask = self.group_mask
+        g = (h >> 7) & mask
+        step = 0
+        while True:
+            base = g * size
+            end = base + size
+            i = ctrl.find(self.EMPTY, base, end)
+            j = ctrl.find(self.DELETED, base, end)
+            if i != -1 or j != -1:
+                return j if i == -1 or (j != -1 and j < i) else i
+            step += 1
+            g = (g + step) & mask
+
+    def has_key(self, k) -> bool:
+        if k is None:
+            raise ValueError("None key")
+        return self.find_slot(k, mix64(hash(k))) != -1
+
+    def get(self, k):
+        if k is None:
+            raise ValueError("None key")
+        i = self.find_slot(k, mix64(hash(k)))
+        return None if i == -1 else self.slot_values[i]
+
+    def insert(self, k, v):
+        if k is None:
+            raise ValueError("None key")
+        h = mix64(hash(k))
+        i = self.find_slot(k, h)
+        if i != -1:
+            self.slot_values[i] = v
+            self.modification_count += 1
+            return v
+
+        if self.used_slots >= self.threshold:
+            self.resize_table()
+        self.place(k, v, h)
+        self.key_count += 1
+        self.modification_count += 1
+        return v
+
+    # puts a key which is known to be absent
+    def place(self, k, v, h):
+        i = self.find_free(h)
+        if self.ctrl[i] == self.EMPTY:
+            self.used_slots += 1
+        self.ctrl[i] = h & 0x7F
+        self.slot_keys[i] = k
+        self.slot_values[i] = v
+        self.slot_hashes[i] = h
+
+    def remove(self, k):
+        if k is None:
+            raise ValueError("None key")
+        i = self.find_slot(k, mix64(hash(k)))
+        if i == -1:
+            return None
+        old_value = self.slot_values[i]
+        self.slot_keys[i] = None
+        self.slot_values[i] = None
+        # a group which still has an EMPTY slot never made a probe go on to
+        # the next group, so the slot can become EMPTY again
+        base = i - i % self.GROUP
+        if self.ctrl.find(self.EMPTY, base, base + self.GROUP) != -1:
+            self.ctrl[i] = self.EMPTY
+            self.used_slots -= 1
+        else:
+            self.ctrl[i] = self.DELETED
+        self.key_count -= 1
+        self.modification_count += 1
+        return old_value
+
+    # number of groups inspected by a lookup of the key
+    def probe_count(self, k) -> int:
+        h = mix64(hash(k))
+        find = self.ctrl.find
+        keys = self.slot_keys
+        hashes = self.slot_hashes
+        size = self.GROUP
+        mask = self.group_mask
+        h2 = h & 0x7F
+        g = (h >> 7) & mask
+        step = 0
+        while True:
+            base = g * size
+            end = base + size
+            i = find(h2, base, end)
+            while i != -1:
+                key = keys[i]
+                if hashes[i] == h and (key is k or key == k):
+                    return step + 1
+                i = find(h2, i + 1, end)
+            if find(self.EMPTY, base, end) != -1:
+                return step + 1
+            step += 1
+            g = (g + step) & mask
+
+    # doubles the groups, or only drops the DELETED slots when at most half
+    # of the used slots hold keys
+    def resize_table(self):
+        ctrl = self.ctrl
+        keys = self.slot_keys
+        values = self.slot_values
+        hashes = self.slot_hashes
+
+        key_count = self.key_count
+        groups = self.groups
+        if key_count > self.threshold // 2:
+            groups *= 2
+        self.allocate_table(groups)
+        for i, c in enumerate(ctrl):
+            if c < 0x80:
+                self.place(keys[i], values[i], hashes[i])
+        self.key_count = key_count
+
+    def __iter__(self):
+        keys = self.slot_keys
+        for i, c in enumerate(self.ctrl):
+            if c < 0x80:
+                yield keys[i]
+
+    def __str__(self):
+        s = "{ "
+        for i, c in enumerate(self.ctrl):
+            if c < 0x80:
+                s += f"{self.slot_keys[i]} => {self.slot_values[i]}, "
+        s += "}"
+        return s
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,74 @@
+"""
+HashTable views
+
+Live views of the keys, values and items of a hashtable, like the views of
+dict. They copy nothing: iteration walks the storage of the table lazily,
+len() and membership of keys and items ask the table in O(1). Keys and
+items views are sets, so &, |, - and friends work as with dict views.
+
+The table provides size(), has_key(k), get(k) and iter_items(), a generator
+of (key, value) pairs which raises RuntimeError when the table changes
+during the iteration (its modification_count moves).
+"""
+from collections.abc import Collection, Set
+
+
+class HashTableView:
+    __slots__ = ("table",)
+
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self):
+        return self.table.size()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)})"
+
+
+class HashTableKeysView(HashTableView, Set):
+    __slots__ = ()
+
+    # results of the set operations are plain sets
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def __contains__(self, key):
+        return key is not None and self.table.has_key(key)
+
+    def __iter__(self):
+        for k, _ in self.table.iter_items():
+            yield k
+
+
+class HashTableValuesView(HashTableView, Collection):
+    __slots__ = ()
+
+    def __contains__(self, value):
+        for _, v in self.table.iter_items():
+            if v is value or v == value:
+                return True
+        return False
+
+    def __iter__(self):
+        for _, v in self.table.iter_items():
+            yield v
+
+
+class HashTableItemsView(HashTableView, Set):
+    __slots__ = ()
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def __contains__(self, item):
+        k, v = item
+        if k is None or not self.table.has_key(k):
+            return False
+        value = self.table.get(k)
+        return value is v or value == v
+
+    def __iter__(self):
+        return self.table.iter_items()
@@ -0,0 +1,129 @@
+"""
+Tests for HashTable Separate Chaining: bounded cache
+"""
+import pickle
+import random
+import unittest
+from collections import Counter, OrderedDict
+from ht_cache import HashTableCache
+
+
+class TestHTCache(unittest.TestCase):
+    LOOPS = 20
+
+    def test_illegal_creation(self):
+        with self.assertRaises(ValueError):
+            HashTableCache(0)
+        with self.assertRaises(ValueError):
+            HashTableCache(10, policy="fifo")
+
+    def test_lru_like_ordered_dict(self):
+        for _ in range(self.LOOPS):
+            max_size = random.randint(1, 50)
+            cache = HashTableCache(max_size)
+            od = OrderedDict()
+            for i in range(1000):
+                key = random.randint(0, 80)
+                if random.random() < 0.5:
+                    value = od.get(key)
+                    if key in od:
+                        od.move_to_end(key)
+                    self.assertEqual(cache.get(key), value)
+                elif random.random() < 0.9:
+                    old = od.get(key)
+                    od[key] = i
+                    od.move_to_end(key)
+                    if len(od) > max_size:
+                        od.popitem(last=False)
+                    self.assertEqual(cache.put(key, i), old)
+                else:
+                    self.assertEqual(cache.remove(key), od.pop(key, None))
+                self.assertEqual(cache.size(), len(od))
+                self.assertEqual(list(cache), list(od))
+
+    def test_lfu_evicts_least_frequent(self):
+        for _ in range(self.LOOPS):
+            max_size = random.randint(1, 30)
+            cache = HashTableCache(max_size, policy="lfu")
+            counts = Counter()
+            for i in range(1000):
+                key = random.randint(0, 60)
+                if random.random() < 0.1:
+                    cache.remove(key)
+                    counts.pop(key, None)
+                    continue
+                if cache.contains_key(key):
+                    counts[key] += 1
+                    cache.get(key)
+                    continue
+                if cache.size() == max_size:
+                    # the victim has the smallest count
+                    victim = next(iter(cache))
+                    self.assertEqual(counts[victim], min(counts.values()))
+                    del counts[victim]
+                cache.put(key, i)
+                counts[key] = 1
+                self.assertEqual(cache.size(), len(counts))
+                freqs = [counts[k] for k in cache]
+                self.assertEqual(freqs, sorted(freqs))
+
+    def test_tinylfu_protects_frequent_keys(self):
+        cache = HashTableCache(100, policy="tinylfu")
+        hot = list(range(100))
+        for _ in range(5):
+            for k in hot:
+                if cache.get(k) is None:
+                    cache.put(k, k)
+        # a scan of keys used once does not push out the hot keys which are
+        # still in use
+        for k in range(1000, 5000):
+            cache.put(k, k)
+            cache.get(hot[k % 100])
+        self.assertGreater(cache.rejections, 3500)
+        self.assertGreater(sum(cache.peek(k) == k for k in hot), 90)
+
+    def test_counters(self):
+        cache = HashTableCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.peek("c"), 3)
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (1, 1, 1))
+        self.assertEqual(cache.hit_rate(), 0.5)
+        cache.reset_stats()
+        self.assertEqual(cache.hit_rate(), 0.0)
+        cache.clear()
+        self.assertTrue(cache.is_empty())
+        self.assertEqual(list(cache), [])
+
+    def test_put_many_keeps_capacity(self):
+        cache = HashTableCache(10)
+        capacity = cache.capacity
+        cache.put_many((i, i) for i in range(100000))
+        self.assertEqual(cache.size(), 10)
+        self.assertEqual(cache.capacity, capacity)
+        self.assertEqual(len(cache.heads), capacity)
+        self.assertEqual(list(cache), list(range(99990, 100000)))
+
+    def test_pickle_seeded(self):
+        for policy in HashTableCache.POLICIES:
+            cache = HashTableCache(10, policy=policy, seeded=True)
+            for i in range(20):
+                cache.put(i, str(i))
+                cache.get(i - 3)
+            copy = pickle.loads(pickle.dumps(cache))
+            self.assertEqual(copy.seed, cache.seed)
+            self.assertEqual(list(copy), list(cache))
+            for i in range(20):
+                self.assertEqual(copy.peek(i), cache.peek(i))
+            # the copy goes on like the original
+            for i in range(20, 40):
+                copy.put(i, str(i))
+                cache.put(i, str(i))
+            self.assertEqual(list(copy), list(cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for HashTable Separate Chaining: concurrent
+"""
+import random
+import sys
+import threading
+import unittest
+from ht_concurrent import HashTableConcurrent
+
+
+class TestHTConcurrent(unittest.TestCase):
+    THREADS = 8
+
+    def setUp(self):
+        # switch threads often, so that operations really interleave
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def run_threads(self, target, n):
+        errors = []
+
+        def run(i):
+            try:
+                target(i)
+            except Exception as e:  # reported by the main thread
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+
+    def test_illegal_creation(self):
+        with self.assertRaises(ValueError):
+            HashTableConcurrent(stripes=0)
+
+    def test_random_map_operations(self):
+        ht = HashTableConcurrent(capacity=1)
+        d = {}
+        for i in range(3000):
+            key = random.randint(-200, 200)
+            if random.random() < 0.3:
+                self.assertEqual(ht.remove(key), d.pop(key, None))
+            else:
+                self.assertEqual(ht.put(key, i), d.get(key))
+                d[key] = i
+            self.assertEqual(ht.get(key), d.get(key))
+            self.assertEqual(ht.has_key(key), key in d)
+            self.assertEqual(ht.size(), len(d))
+        self.assertEqual(sorted(ht.keys()), sorted(d))
+
+    def test_concurrent_writers(self):
+        ht = HashTableConcurrent(capacity=1)
+        n = 2000
+
+        # every thread owns its keys: puts all, removes the odd ones
+        def write(t):
+            for i in range(n):
+                ht.put((t, i), i)
+            for i in range(1, n, 2):
+                self.assertEqual(ht.remove((t, i)), i)
+
+        self.run_threads(write, self.THREADS)
+        self.assertEqual(ht.size(), self.THREADS * n // 2)
+        expected = {(t, i) for t in range(self.THREADS) for i in range(0, n, 2)}
+        self.assertEqual(set(ht.keys()), expected)
+        for t, i in expected:
+            self.assertEqual(ht.get((t, i)), i)
+
+    def test_readers_during_resize(self):
+        ht = HashTableConcurrent(capacity=1)
+        stable = 500
+        for i in range(stable):
+            ht.put(i, -i)
+        done = threading.Event()
+
+        # the writer grows the table many times and churns its own keys,
+        # the readers must always find the stable keys
+        def work(t):
+            if t == 0:
+                for i in range(stable, 20000):
+                    ht.put(i, -i)
+                    if i % 3 == 0:
+                        ht.remove(i - 1)
+                done.set()
+            else:
+                while not done.is_set():
+                    i = random.randrange(stable)
+                    self.assertEqual(ht.get(i), -i)
+                    self.assertTrue(ht.contains_key(i))
+
+        self.run_threads(work, self.THREADS)
+        for i in range(stable):
+            self.assertEqual(ht.get(i), -i)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Tests for HashTable Open Addressing: counter
+"""
+import random
+import unittest
+from collections import Counter
+from ht_counter import HashTableCounter
+
+
+class TestHTCounter(unittest.TestCase):
+    LOOPS = 20
+
+    def test_none_key(self):
+        with self.assertRaises(ValueError):
+            HashTableCounter().increment(None)
+
+    def test_increment(self):
+        ht = HashTableCounter()
+        self.assertEqual(ht.count("a"), 0)
+        self.assertEqual(ht.increment("a"), 1)
+        self.assertEqual(ht.increment("a", 5), 6)
+        self.assertEqual(ht.decrement("a", 2), 4)
+        self.assertEqual(ht.count("a"), 4)
+        self.assertEqual(ht.size(), 1)
+
+    def test_drop_to_zero(self):
+        ht = HashTableCounter()
+        ht.increment("a", 2)
+        self.assertEqual(ht.decrement("a", 2), 0)
+        self.assertFalse(ht.has_key("a"))
+        self.assertEqual(ht.decrement("b"), 0)
+        self.assertTrue(ht.is_empty())
+
+    def test_top_k(self):
+        ht = HashTableCounter()
+        ht.update("abracadabra")
+        self.assertEqual([n for _, n in ht.top_k(3)], [5, 2, 2])
+        self.assertEqual(ht.top_k(1), [("a", 5)])
+        self.assertEqual(sorted(ht.top_k(10)), sorted(Counter("abracadabra").items()))
+        self.assertEqual(ht.total(), 11)
+
+    def test_random(self):
+        for incremental in (False, True):
+            for _ in range(self.LOOPS):
+                ht = HashTableCounter(incremental=incremental, migrate_step=2)
+                expected = Counter()
+                for _ in range(500):
+                    k = random.randint(0, 60)
+                    delta = random.randint(-3, 5)
+                    expected[k] += delta
+                    if expected[k] <= 0:
+                        del expected[k]
+                    self.assertEqual(ht.increment(k, delta), expected[k])
+                self.assertEqual(ht.size(), len(expected))
+                self.assertEqual(dict(ht.items()), dict(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
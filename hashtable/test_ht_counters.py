@@ -0,0 +1,77 @@
+"""
+Tests for HashTable Counters
+"""
+import random
+import unittest
+from ht_double_hashing import HashTableDoubleHashing
+from ht_linear_probing import HashTableLinearProbing
+from ht_quadratic_probing import HashTableQuadraticProbing
+from ht_separate_chaining import HashTableSeparateChaining
+
+
+class TestHTCounters(unittest.TestCase):
+    CLASSES = [
+        HashTableLinearProbing,
+        HashTableQuadraticProbing,
+        HashTableDoubleHashing,
+        HashTableSeparateChaining,
+    ]
+
+    def test_not_instrumented(self):
+        for cls in self.CLASSES:
+            ht = cls()
+            self.assertIsNone(ht.counters)
+            # plain class methods, no wrappers on the instance
+            self.assertNotIn("get", vars(ht))
+            self.assertNotIn("insert", vars(ht))
+
+    def test_same_results(self):
+        for cls in self.CLASSES:
+            ht1 = cls()
+            ht2 = cls(instrument=True)
+            for i in range(1000):
+                key = random.randint(-100, 100)
+                if random.random() < 0.3:
+                    self.assertEqual(ht1.remove(key), ht2.remove(key))
+                else:
+                    self.assertEqual(ht1.put(key, i), ht2.put(key, i))
+                self.assertEqual(ht1.get(key), ht2.get(key))
+                self.assertEqual(ht1.size(), ht2.size())
+
+    def test_counting(self):
+        for cls in self.CLASSES:
+            ht = cls(instrument=True)
+            for i in range(100):
+                ht.add(i, i)
+            ht.put_many([(i, i) for i in range(100, 200)])
+            for i in range(200):
+                ht.get(i)
+            ht.remove(5)
+            ht.remove(-1)
+
+            c = ht.counters
+            self.assertEqual(c.ops, {"get": 200, "insert": 200, "remove": 2})
+            self.assertEqual(sum(c.histogram.values()), 402)
+            self.assertGreater(c.resizes, 0)
+            self.assertGreater(c.resize_time, 0)
+            self.assertGreaterEqual(c.max_probes["get"], 1)
+            self.assertGreaterEqual(c.avg_probes("get"), 1)
+            self.assertIn("resizes", str(c))
+
+            c.reset()
+            self.assertEqual(c.ops["get"], 0)
+            self.assertEqual(c.avg_probes(), 0)
+
+    def test_collisions(self):
+        ht = HashTableLinearProbing(capacity=100, instrument=True)
+        cap = ht.get_capacity()
+        for x in range(5):
+            ht.put(x * cap, x)
+        ht.get(4 * cap)
+        self.assertEqual(ht.counters.max_probes["insert"], 5)
+        self.assertEqual(ht.counters.max_probes["get"], 5)
+        self.assertEqual(ht.counters.histogram, {x: 1 for x in range(1, 6)} | {5: 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
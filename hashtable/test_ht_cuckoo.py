@@ -0,0 +1,118 @@
+"""
+HashTable Cuckoo Hashing
+"""
+import random
+import unittest
+from ht_cuckoo import HashTableCuckoo
+
+
+class TestHTCuckoo(unittest.TestCase):
+    LOOPS = 100
+    MAX_SIZE = random.randint(1, 750)
+    MAX_RAND_NUM = random.randint(1, 350)
+
+    class SameHash:
+        def __init__(self, data):
+            self.data = data
+
+        def __hash__(self):
+            return 42
+
+        def __eq__(self, other):
+            return isinstance(other, type(self)) and self.data == other.data
+
+    def test_none_key(self):
+        with self.assertRaises(ValueError):
+            HashTableCuckoo().put(None, 5)
+
+    def test_illegal_creation(self):
+        with self.assertRaises(ValueError):
+            HashTableCuckoo(capacity=-3)
+        with self.assertRaises(ValueError):
+            HashTableCuckoo(load_factor=1.5)
+
+    def test_update_value(self):
+        ht = HashTableCuckoo()
+        ht.add(1, 1)
+        self.assertEqual(ht.get(1), 1)
+        ht.add(1, -7)
+        self.assertEqual(ht.get(1), -7)
+        self.assertEqual(ht.size(), 1)
+
+    def test_two_bucket_lookups(self):
+        ht = HashTableCuckoo(capacity=2, seed=7)
+        for i in range(10000):
+            ht.put(i, i)
+        # every key sits in one of its two buckets or in the small stash
+        self.assertLessEqual(len(ht.stash), ht.MAX_STASH)
+        stashed = {entry[0] for entry in ht.stash}
+        for i in range(10000):
+            self.assertEqual(ht.find_slot(i, hash(i)) == -1, i in stashed)
+            self.assertEqual(ht.get(i), i)
+        self.assertEqual(ht.get(10000), None)
+
+    def test_lookup_matches_buckets(self):
+        # find_slot and get inline buckets(), negative and 64 bit hashes too
+        ht = HashTableCuckoo()
+        keys = [f"k{i}" for i in range(2000)] + list(range(-2000, 0))
+        keys += [(1 << 62) + i for i in range(2000)]
+        for k in keys:
+            ht.put(k, k)
+        stashed = {entry[0] for entry in ht.stash}
+        for k in keys:
+            i = ht.find_slot(k, hash(k))
+            if k not in stashed:
+                first, second = ht.buckets(hash(k))
+                self.assertTrue(
+                    first <= i < first + ht.SLOTS or second <= i < second + ht.SLOTS
+                )
+            self.assertEqual(ht.get(k), k)
+
+    def test_identical_hashes_go_to_stash(self):
+        ht = HashTableCuckoo()
+        keys = [self.SameHash(x) for x in range(20)]
+        for k in keys:
+            ht.put(k, k.data)
+        self.assertEqual(ht.size(), 20)
+        self.assertGreater(len(ht.stash), 0)
+        # the stash grows instead of the table
+        self.assertEqual(ht.get_capacity(), 8)
+        for k in keys:
+            self.assertEqual(ht.get(k), k.data)
+        for k in keys[::2]:
+            self.assertEqual(ht.remove(k), k.data)
+        for k in keys:
+            self.assertEqual(ht.contains(k), k.data % 2 == 1)
+        self.assertEqual(ht.size(), 10)
+
+    def test_many_identical_hashes(self):
+        ht = HashTableCuckoo()
+        keys = [self.SameHash(x) for x in range(300)]
+        for k in keys:
+            ht.put(k, k.data)
+        # grown by the load only: 300 keys need 300 / 0.9 / 4 buckets
+        self.assertLessEqual(ht.get_capacity(), 128)
+        for k in keys:
+            self.assertEqual(ht.get(k), k.data)
+
+    def test_random_map_operations(self):
+        for _ in range(self.LOOPS):
+            ht = HashTableCuckoo()
+            d = {}
+            for i in range(self.MAX_SIZE):
+                key = random.randint(-self.MAX_RAND_NUM, self.MAX_RAND_NUM)
+                if random.random() < 0.3:
+                    self.assertEqual(ht.remove(key), d.pop(key, None))
+                else:
+                    d[key] = i
+                    self.assertEqual(ht.put(key, i), i)
+                self.assertEqual(ht.get(key), d.get(key))
+                self.assertEqual(ht.contains(key), key in d)
+                self.assertEqual(ht.size(), len(d))
+            self.assertEqual(sorted(ht), sorted(d))
+            ht.clear()
+            self.assertTrue(ht.is_empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
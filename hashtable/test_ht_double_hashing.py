@@ -52,6 +52,20 @@ class TestHTDoubleHashing(unittest.TestCase):
         self.ht.add(2, 2)
         self.assertEqual(self.ht.get(1), -7)
 
+    def test_probe_sequence(self):
+        # incremental walk of the engine must match probe(x)
+        ht = HashTableDoubleHashing(capacity=17)
+        for k in range(-50, 50):
+            h = hash(k)
+            ht.setup_probing(k)
+            offset = ht.normalize_index(h)
+            step = ht.probe_step(h, ht.capacity)
+            i = offset
+            for x in range(1, ht.capacity):
+                i = (i + step) % ht.capacity
+                step += ht.PROBE_GROWTH
+                self.assertEqual(i, ht.normalize_index(offset + ht.probe(x)))
+
     def test_is_prime(self):
         self.assertTrue(self.ht.is_prime(2))
         self.assertFalse(self.ht.is_prime(21))
@@ -108,7 +122,7 @@ class TestHTDoubleHashing(unittest.TestCase):
 
             self.assertEqual(ht.size(), len(keys_set))
 
-            keys = [x for x in ht.keys if x is not None]
+            keys = [x for x in ht.slot_keys if x is not None]
             for k in keys:
                 ht.remove(k)
 
@@ -217,6 +231,26 @@ class TestHTDoubleHashing(unittest.TestCase):
                 self.assertEqual(l1, l2)
     """
 
+    def test_incremental_resize(self):
+        ht = HashTableDoubleHashing(incremental=True, migrate_step=1)
+        d = {}
+        migrated = False
+        for i in range(2000):
+            key = random.randint(-self.MAX_RAND_NUM, self.MAX_RAND_NUM)
+            if random.random() < 0.3:
+                self.assertEqual(ht.remove(key), d.pop(key, None))
+            else:
+                d[key] = i
+                ht.put(key, i)
+            migrated = migrated or ht.is_migrating()
+            self.assertEqual(ht.get(key), d.get(key))
+            self.assertEqual(ht.contains(key), key in d)
+            self.assertEqual(ht.size(), len(d))
+        self.assertTrue(migrated)
+        for k in d:
+            self.assertEqual(ht.get(k), d[k])
+        self.assertEqual(sorted(ht), sorted(d))
+
     def get_rand_list(self, sz: int):
         # for simplicity we are not going to use sz for creationg of the list
         # however, it is possible to do something like this:
@@ -4,9 +4,14 @@ HashTable Open Addressing: Linear Probing
 Inspired by William Fiset
 https://github.com/williamfiset/
 """
+import copy
+import os
+import pickle
 import random
+import tempfile
 import unittest
 from ht_linear_probing import HashTableLinearProbing
+from ht_separate_chaining import HashTableSeparateChaining
 
 
 class TestHTLinearProbing(unittest.TestCase):
@@ -60,6 +65,43 @@ class TestHTLinearProbing(unittest.TestCase):
         self.ht.add(2, 2)
         self.assertEqual(self.ht.get(1), -7)
 
+    def test_probe_sequence(self):
+        # incremental walk of the engine must match probe(x)
+        ht = HashTableLinearProbing(capacity=18)
+        for k in range(-50, 50):
+            h = hash(k)
+            ht.setup_probing(k)
+            offset = ht.normalize_index(h)
+            step = ht.probe_step(h, ht.capacity)
+            i = offset
+            for x in range(1, ht.capacity):
+                i = (i + step) % ht.capacity
+                step += ht.PROBE_GROWTH
+                self.assertEqual(i, ht.normalize_index(offset + ht.probe(x)))
+
+    def test_resize_does_not_rehash(self):
+        class CountingKey:
+            calls = 0
+
+            def __init__(self, x):
+                self.x = x
+
+            def __hash__(self):
+                CountingKey.calls += 1
+                return self.x
+
+            def __eq__(self, other):
+                return isinstance(other, CountingKey) and self.x == other.x
+
+        ht = HashTableLinearProbing()
+        keys = [CountingKey(x) for x in range(100)]
+        for k in keys:
+            ht.put(k, k.x)
+        # one hash per insert, resize_table reuses the cached hashes
+        self.assertEqual(CountingKey.calls, len(keys))
+        for k in keys:
+            self.assertEqual(ht.get(k), k.x)
+
     def test_iterator(self):
         ht2 = HashTableLinearProbing()
         for i in range(self.LOOPS):
@@ -108,7 +150,7 @@ class TestHTLinearProbing(unittest.TestCase):
 
             self.assertEqual(ht.size(), len(keys_set))
 
-            keys = [x for x in ht.keys if x is not None]
+            keys = [x for x in ht.slot_keys if x is not None]
             for k in keys:
                 ht.remove(k)
 
@@ -235,6 +277,191 @@ class TestHTLinearProbing(unittest.TestCase):
                 self.assertEqual(m.size(), len(hm))
                 self.assertEqual(l1, l2)
 
+    def test_incremental_resize(self):
+        ht = HashTableLinearProbing(incremental=True, migrate_step=1)
+        d = {}
+        migrated = False
+        for i in range(2000):
+            key = random.randint(-self.MAX_RAND_NUM, self.MAX_RAND_NUM)
+            if random.random() < 0.3:
+                self.assertEqual(ht.remove(key), d.pop(key, None))
+            else:
+                d[key] = i
+                ht.put(key, i)
+            migrated = migrated or ht.is_migrating()
+            self.assertEqual(ht.get(key), d.get(key))
+            self.assertEqual(ht.contains(key), key in d)
+            self.assertEqual(ht.size(), len(d))
+        self.assertTrue(migrated)
+        for k in d:
+            self.assertEqual(ht.get(k), d[k])
+        self.assertEqual(sorted(ht), sorted(d))
+
+    def test_bulk_operations(self):
+        ht = HashTableLinearProbing()
+        ht.put(-1, -1)
+        pairs = [(k, k * 2) for k in range(1000)]
+        ht.reserve(len(pairs))
+        capacity = ht.get_capacity()
+        # pre-sized once, no resize while loading
+        self.assertEqual(ht.put_many(iter(pairs)), [v for _, v in pairs])
+        self.assertEqual(ht.get_capacity(), capacity)
+        self.assertEqual(ht.size(), 1001)
+
+        keys = [k for k, _ in pairs] + [5000]
+        self.assertEqual(ht.get_many(keys), [v for _, v in pairs] + [None])
+        self.assertEqual(ht.remove_many(keys[:500]), [k * 2 for k in range(500)])
+        self.assertEqual(ht.size(), 501)
+        self.assertEqual(ht.get(-1), -1)
+
+        ht2 = HashTableLinearProbing()
+        ht2.put_many({k: v for k, v in pairs})
+        self.assertEqual(sorted(ht2), keys[:-1])
+
+    def test_tombstone_compaction(self):
+        ht = HashTableLinearProbing(capacity=64, compact_threshold=0.25)
+        capacity = ht.get_capacity()
+        # churn within a fixed number of live keys never grows the table
+        for i in range(5000):
+            ht.put(i, i)
+            if i >= 10:
+                self.assertEqual(ht.remove(i - 10), i - 10)
+            stats = ht.stats()
+            self.assertLessEqual(stats["tombstones"], capacity * 0.25)
+        self.assertEqual(ht.get_capacity(), capacity)
+        self.assertEqual(sorted(ht), list(range(4990, 5000)))
+
+    def test_stats(self):
+        ht = HashTableLinearProbing(capacity=100, compact_threshold=None)
+        cap = ht.get_capacity()
+        self.assertEqual(ht.stats()["max_probe_length"], 0)
+        # all keys share the home bucket
+        for x in range(4):
+            ht.put(x * cap, x)
+        ht.remove(0)
+        stats = ht.stats()
+        self.assertEqual(stats["keys"], 3)
+        self.assertEqual(stats["tombstones"], 1)
+        self.assertEqual(stats["capacity"], cap)
+        self.assertEqual(stats["max_probe_length"], 4)
+        self.assertEqual(stats["avg_probe_length"], 3)
+        ht.compact()
+        self.assertEqual(ht.stats()["tombstones"], 0)
+        self.assertEqual(ht.stats()["max_probe_length"], 3)
+
+    def test_deepcopy_object_keys(self):
+        class Key:
+            pass
+
+        ht = HashTableLinearProbing()
+        keys = [Key() for _ in range(20)]
+        for i, k in enumerate(keys):
+            ht.put(k, i)
+        # the copied keys hash by identity, the cached hashes are not reused
+        copied = copy.deepcopy(ht)
+        for k, i in copied.items():
+            self.assertEqual(copied.get(k), i)
+        self.assertEqual(sorted(copied.values()), list(range(20)))
+
+    def test_pickle(self):
+        ht = HashTableLinearProbing(incremental=True, migrate_step=2)
+        for x in range(500):
+            ht.put(f"key{x}", x)
+        for x in range(0, 500, 3):
+            ht.remove(f"key{x}")
+        expected = {f"key{x}": x for x in range(500) if x % 3}
+
+        copy = pickle.loads(pickle.dumps(ht))
+        self.assertEqual(copy.get_capacity(), ht.get_capacity())
+        self.assertEqual(copy.stats()["tombstones"], 0)
+        self.assertEqual({k: copy.get(k) for k in list(copy)}, expected)
+
+        # same process, same hashes, no tombstones: the slots did not move
+        ht.compact()
+        copy = pickle.loads(pickle.dumps(ht))
+        self.assertEqual(copy.slot_keys, ht.slot_keys)
+        for k in expected:
+            self.assertEqual(copy.find_slot(k), ht.find_slot(k))
+
+        # hashes of another process, the keys are placed again
+        state = ht.__getstate__()
+        state["fingerprint"] += 1
+        copy = HashTableLinearProbing.__new__(HashTableLinearProbing)
+        copy.__setstate__(state)
+        self.assertEqual({k: copy.get(k) for k in list(copy)}, expected)
+        copy.put("new", 1)
+        self.assertEqual(copy.size(), len(expected) + 1)
+
+    def test_dump_load(self):
+        ht = HashTableLinearProbing(instrument=True)
+        ht.put_many({x: -x for x in range(100)})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table")
+            ht.dump(path)
+            copy = HashTableLinearProbing.load(path)
+            with self.assertRaises(ValueError):
+                HashTableSeparateChaining.load(path)
+        self.assertEqual(copy.get_many(range(100)), [-x for x in range(100)])
+        self.assertEqual(copy.counters.ops["get"], 100)
+
+    def test_views(self):
+        ht = HashTableLinearProbing()
+        d = {x: str(x) for x in range(50)}
+        ht.put_many(d)
+        for x in range(0, 50, 5):
+            ht.remove(x)
+            del d[x]
+
+        keys = ht.keys()
+        self.assertEqual(len(keys), 40)
+        self.assertIn(1, keys)
+        self.assertNotIn(5, keys)
+        self.assertNotIn(None, keys)
+        self.assertEqual(set(keys), d.keys())
+        self.assertEqual(keys & {1, 5, 7}, {1, 7})
+        self.assertEqual(sorted(ht.values()), sorted(d.values()))
+        self.assertIn("7", ht.values())
+        self.assertEqual(dict(ht.items()), d)
+        self.assertIn((7, "7"), ht.items())
+        self.assertNotIn((7, "8"), ht.items())
+
+        # views are live
+        ht.put(100, "100")
+        self.assertEqual(len(keys), 41)
+        self.assertIn(100, keys)
+
+        # nested iterations and lookups during an iteration are fine
+        pairs = [(a, b) for a in ht for b in ht if ht.get(a) is not None]
+        self.assertEqual(len(pairs), 41 * 41)
+
+        with self.assertRaises(RuntimeError):
+            for k in ht.keys():
+                ht.put(k + 1000, k)
+        with self.assertRaises(RuntimeError):
+            for k in ht:
+                ht.remove(k)
+
+    def test_seeded(self):
+        ht = HashTableLinearProbing(seeded=True)
+        self.assertIsNotNone(ht.seed)
+        ht.reserve(1000)
+        cap = ht.get_capacity()
+        # multiples of the capacity share the home bucket without a seed
+        for x in range(1000):
+            ht.put(x * cap, x)
+        self.assertLess(ht.stats()["max_probe_length"], 100)
+        for x in range(1000):
+            self.assertEqual(ht.get(x * cap), x)
+
+        same = HashTableLinearProbing(seed=ht.seed)
+        same.reserve(1000)
+        for x in range(1000):
+            same.put(x * cap, x)
+        self.assertEqual(same.slot_keys, ht.slot_keys)
+        copy = pickle.loads(pickle.dumps(ht))
+        self.assertEqual(copy.seed, ht.seed)
+        self.assertEqual(copy.get(999 * cap), 999)
+
     def get_rand_list(self, sz: int):
         # for simplicity we are not going to use sz for creationg of the list
         # however, it is possible to do something like this:
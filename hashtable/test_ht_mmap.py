@@ -0,0 +1,142 @@
+"""
+HashTable Open Addressing: memory-mapped file
+"""
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from ht_mmap import HashTableMmap
+
+
+class TestHTMmap(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "table")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_none_key(self):
+        with HashTableMmap(self.path) as ht:
+            with self.assertRaises(ValueError):
+                ht.put(None, 5)
+
+    def test_missing_readonly_table(self):
+        with self.assertRaises(ValueError):
+            HashTableMmap(self.path, readonly=True)
+
+    def test_not_a_table(self):
+        with open(self.path, "wb") as f:
+            f.write(b"x" * 100)
+        with self.assertRaises(ValueError):
+            HashTableMmap(self.path)
+
+    def test_key_encoding(self):
+        with HashTableMmap(self.path) as ht:
+            keys = [
+                ("abc", "abc"),
+                (1, (b"x", -(2**70)), ()),
+                "\u00e9\ud800",
+                0,
+                -128,
+            ]
+            for i, k in enumerate(keys):
+                ht.put(k, i)
+            # equal keys built differently, pickle would memoize the first
+            self.assertEqual(ht.get(("abc", "".join(["ab", "c"]))), 0)
+            self.assertEqual(sorted(map(repr, ht)), sorted(map(repr, keys)))
+            for bad in (1.0, True, frozenset([1, 2]), ("a", [1])):
+                with self.assertRaises(TypeError):
+                    ht.put(bad, 1)
+
+    def test_random_map_operations(self):
+        d = {}
+        with HashTableMmap(self.path, capacity=4) as ht:
+            for i in range(2000):
+                key = random.choice([random.randint(-300, 300), f"key{i % 300}"])
+                if random.random() < 0.3:
+                    self.assertEqual(ht.remove(key), d.pop(key, None))
+                else:
+                    d[key] = [i]
+                    self.assertEqual(ht.put(key, [i]), [i])
+                self.assertEqual(ht.get(key), d.get(key))
+                self.assertEqual(ht.contains(key), key in d)
+                self.assertEqual(ht.size(), len(d))
+            self.assertEqual(dict(ht.items()), d)
+
+    def test_reopen(self):
+        with HashTableMmap(self.path, capacity=8) as ht:
+            for i in range(1000):
+                ht.put(f"key{i}", i)
+            ht.remove("key0")
+            capacity = ht.get_capacity()
+
+        with HashTableMmap(self.path) as ht:
+            self.assertEqual(ht.size(), 999)
+            self.assertEqual(ht.get_capacity(), capacity)
+            self.assertEqual(ht.get("key0"), None)
+            self.assertEqual(ht.get("key999"), 999)
+            ht.put("key0", "back")
+
+        with HashTableMmap(self.path, readonly=True) as ht:
+            self.assertEqual(ht.get("key0"), "back")
+            self.assertEqual(sorted(ht), sorted(f"key{i}" for i in range(1000)))
+            with self.assertRaises(ValueError):
+                ht.put("key1", 1)
+            with self.assertRaises(ValueError):
+                ht.remove("key1")
+
+    def test_reader_next_to_writer(self):
+        with HashTableMmap(self.path) as ht:
+            ht.put("a", 1)
+            with HashTableMmap(self.path, readonly=True) as reader:
+                self.assertEqual(reader.get("a"), 1)
+                # records appended after the reader mapped the heap
+                ht.put("b", [2] * 1000)
+                ht.put("a", 3)
+                self.assertEqual(reader.get("b"), [2] * 1000)
+                self.assertEqual(reader.get("a"), 3)
+
+    def test_reader_maps_partial_record(self):
+        value = [2] * 1000
+        with HashTableMmap(self.path) as ht:
+            ht.put("a", 1)
+            # the reader maps the heap while the writer's file buffer has
+            # written the value record of "b" and only a part of its key record
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            key = ht.serialize("b")
+            ht.heap_file.seek(ht.heap_size)
+            ht.heap_file.write(ht.RECORD_LEN.pack(len(data)) + data)
+            ht.heap_file.write(ht.RECORD_LEN.pack(len(key)) + key[:2])
+            ht.heap_file.flush()
+            with HashTableMmap(self.path, readonly=True) as reader:
+                ht.put("b", value)
+                self.assertEqual(reader.get("b"), value)
+                self.assertEqual(reader.get("a"), 1)
+
+    def test_read_from_another_process(self):
+        with HashTableMmap(self.path) as ht:
+            ht.put("answer", 42)
+
+        # str hashes are randomized per process, the table must not use them
+        code = (
+            "from ht_mmap import HashTableMmap\n"
+            f"print(HashTableMmap({self.path!r}, readonly=True).get('answer'))"
+        )
+        env = dict(os.environ, PYTHONHASHSEED="12345")
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(out.stdout.strip(), "42")
+
+
+if __name__ == "__main__":
+    unittest.main()
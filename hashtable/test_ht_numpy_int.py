@@ -0,0 +1,81 @@
+"""
+Tests for HashTable Open Addressing: NumPy int64 keys
+"""
+import random
+import unittest
+
+try:
+    import numpy as np
+    from ht_numpy_int import HashTableInt64
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestHTInt64(unittest.TestCase):
+    LOOPS = 50
+
+    def test_illegal_creation(self):
+        with self.assertRaises(ValueError):
+            HashTableInt64(capacity=0)
+        with self.assertRaises(ValueError):
+            HashTableInt64(load_factor=1)
+
+    def test_batches_like_dict(self):
+        rng = np.random.default_rng()
+        for _ in range(self.LOOPS):
+            ht = HashTableInt64(capacity=random.randint(1, 64))
+            d = {}
+            for _ in range(10):
+                n = random.randint(0, 500)
+                # small range, a batch repeats keys and hits existing ones
+                keys = rng.integers(-300, 300, n)
+                values = rng.integers(-(2**63), 2**63 - 1, n)
+                if random.random() < 0.3:
+                    found = ht.remove_many(keys)
+                    self.assertEqual(found.tolist(), [k in d for k in keys.tolist()])
+                    for k in keys.tolist():
+                        d.pop(k, None)
+                else:
+                    ht.put_many(keys, values)
+                    d.update(zip(keys.tolist(), values.tolist()))
+                self.assertEqual(ht.size(), len(d))
+
+                probe = rng.integers(-400, 400, 200)
+                expected = [d.get(k, -1) for k in probe.tolist()]
+                self.assertEqual(ht.get_many(probe, default=-1).tolist(), expected)
+                self.assertEqual(
+                    ht.contains_many(probe).tolist(), [k in d for k in probe.tolist()]
+                )
+            keys, values = ht.items()
+            self.assertEqual(dict(zip(keys.tolist(), values.tolist())), d)
+
+    def test_extreme_keys(self):
+        ht = HashTableInt64()
+        keys = [0, -1, 2**63 - 1, -(2**63), 1 << 32]
+        ht.put_many(keys, 7)
+        self.assertEqual(ht.get_many(keys).tolist(), [7] * 5)
+        self.assertEqual(sorted(ht), sorted(keys))
+
+    def test_single_key_operations(self):
+        ht = HashTableInt64()
+        ht.put(5, 10)
+        ht.add(5, 11)
+        self.assertEqual(ht.get(5), 11)
+        self.assertTrue(ht.contains(5))
+        self.assertEqual(ht.remove(5), 11)
+        self.assertEqual(ht.remove(5), None)
+        self.assertEqual(ht.get(5), None)
+        self.assertTrue(ht.is_empty())
+
+    def test_deleted_slots_are_dropped(self):
+        ht = HashTableInt64(capacity=64)
+        for i in range(100):
+            ht.put_many(np.arange(20) + 20 * i, 1)
+            ht.remove_many(np.arange(20) + 20 * i)
+        self.assertTrue(ht.is_empty())
+        self.assertEqual(ht.get_capacity(), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
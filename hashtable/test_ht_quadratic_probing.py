@@ -60,6 +60,20 @@ class TestHTQuadraticProbing(unittest.TestCase):
         self.ht.add(2, 2)
         self.assertEqual(self.ht.get(1), -7)
 
+    def test_probe_sequence(self):
+        # incremental walk of the engine must match probe(x)
+        ht = HashTableQuadraticProbing(capacity=16)
+        for k in range(-50, 50):
+            h = hash(k)
+            ht.setup_probing(k)
+            offset = ht.normalize_index(h)
+            step = ht.probe_step(h, ht.capacity)
+            i = offset
+            for x in range(1, ht.capacity):
+                i = (i + step) % ht.capacity
+                step += ht.PROBE_GROWTH
+                self.assertEqual(i, ht.normalize_index(offset + ht.probe(x)))
+
     def test_iterator(self):
         ht2 = HashTableQuadraticProbing()
         for i in range(self.LOOPS):
@@ -108,7 +122,7 @@ class TestHTQuadraticProbing(unittest.TestCase):
 
             self.assertEqual(ht.size(), len(keys_set))
 
-            keys = [x for x in ht.keys if x is not None]
+            keys = [x for x in ht.slot_keys if x is not None]
             for k in keys:
                 ht.remove(k)
 
@@ -0,0 +1,118 @@
+"""
+HashTable Open Addressing: Robin Hood Hashing
+"""
+import pickle
+import random
+import unittest
+from ht_robin_hood import HashTableRobinHood
+
+
+class TestHTRobinHood(unittest.TestCase):
+    LOOPS = 200
+    MAX_SIZE = random.randint(1, 750)
+    MAX_RAND_NUM = random.randint(1, 350)
+
+    def setUp(self):
+        self.ht = HashTableRobinHood()
+
+    def test_none_key(self):
+        with self.assertRaises(ValueError):
+            self.ht.put(None, 5)
+
+    def test_illegal_creation(self):
+        with self.assertRaises(ValueError):
+            HashTableRobinHood(capacity=-3, load_factor=0.5)
+
+    def test_capacity_power_of_two(self):
+        ht = HashTableRobinHood(capacity=6)
+        self.assertEqual(ht.get_capacity(), 8)
+        for i in range(100):
+            ht.put(i, i)
+        self.assertEqual(ht.get_capacity() & (ht.get_capacity() - 1), 0)
+
+    def test_update_value(self):
+        self.ht.add(1, 1)
+        self.assertEqual(self.ht.get(1), 1)
+        self.ht.add(1, 5)
+        self.assertEqual(self.ht.get(1), 5)
+        self.ht.add(2, 2)
+        self.assertEqual(self.ht.get(1), 5)
+        self.assertEqual(self.ht.size(), 2)
+
+    def test_remove_leaves_no_tombstones(self):
+        for i in range(100):
+            self.ht.put(i, i)
+        for i in range(0, 100, 2):
+            self.assertEqual(self.ht.remove(i), i)
+        self.assertEqual(self.ht.remove(0), None)
+        self.assertEqual(self.ht.size(), 50)
+        self.assertEqual(self.ht.used_buckets, 50)
+        self.assertNotIn(self.ht.TOMBSTONE, self.ht.slot_keys)
+        self.assert_invariant(self.ht)
+
+    def test_colliding_keys(self):
+        # all keys share the same home bucket
+        cap = self.ht.get_capacity()
+        keys = [cap * x for x in range(1, 5)]
+        for k in keys:
+            self.ht.put(k, k)
+        self.ht.remove(keys[1])
+        self.assertEqual(self.ht.get(keys[1]), None)
+        for k in keys[:1] + keys[2:]:
+            self.assertEqual(self.ht.get(k), k)
+        self.assert_invariant(self.ht)
+
+    def test_random_churn(self):
+        for _ in range(self.LOOPS):
+            ht = HashTableRobinHood()
+            d = {}
+            for i in range(self.MAX_SIZE):
+                key = random.randint(-self.MAX_RAND_NUM, self.MAX_RAND_NUM)
+                if random.random() < 0.4:
+                    self.assertEqual(ht.remove(key), d.pop(key, None))
+                else:
+                    d[key] = i
+                    ht.put(key, i)
+                self.assertEqual(ht.get(key), d.get(key))
+                self.assertEqual(ht.contains(key), key in d)
+                self.assertEqual(ht.size(), len(d))
+            self.assert_invariant(ht)
+            self.assertEqual(sorted(ht), sorted(d))
+
+    def test_stats(self):
+        cap = self.ht.get_capacity()
+        for x in range(3):
+            self.ht.put(x * cap, x)
+        stats = self.ht.stats()
+        self.assertEqual(stats["tombstones"], 0)
+        self.assertEqual(stats["max_probe_length"], 3)
+        self.assertEqual(stats["avg_probe_length"], 2)
+
+    def test_pickle(self):
+        for x in range(1000):
+            self.ht.put(x, str(x))
+        for x in range(0, 1000, 4):
+            self.ht.remove(x)
+        copy = pickle.loads(pickle.dumps(self.ht))
+        self.assertEqual(copy.slot_keys, self.ht.slot_keys)
+        self.assert_invariant(copy)
+        for x in range(1000):
+            self.assertEqual(copy.get(x), None if x % 4 == 0 else str(x))
+
+    def assert_invariant(self, ht):
+        # every dist is the distance from the home bucket and a poorer entry
+        # never follows a richer one by more than one bucket
+        cap = ht.get_capacity()
+        for i in range(cap):
+            if ht.slot_keys[i] is None:
+                continue
+            home = ht.normalize_index(hash(ht.slot_keys[i]))
+            self.assertEqual(ht.dists[i], (i - home) % cap)
+            prev = (i - 1) % cap
+            if ht.dists[i] > 0:
+                self.assertIsNotNone(ht.slot_keys[prev])
+                self.assertGreaterEqual(ht.dists[prev], ht.dists[i] - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
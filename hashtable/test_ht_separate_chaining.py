@@ -1,6 +1,10 @@
 """
 TODO: implement all tests
 """
+import copy
+import os
+import pickle
+import tempfile
 import unittest
 from ht_separate_chaining import HashTableSeparateChaining
 import random
@@ -65,12 +69,139 @@ class TestHTSeparateChaining(unittest.TestCase):
 
             self.assertEqual(map1.size(), len(arr))
 
-            keys = map1.keys()
+            keys = list(map1.keys())
             for k in keys:
                 map1.remove(k)
 
             self.assertTrue(map1.is_empty())
 
+    def test_incremental_resize(self):
+        map1 = HashTableSeparateChaining(incremental=True, migrate_step=1)
+        d = {}
+        migrated = False
+        for i in range(2000):
+            key = random.randint(-self.MAX_RAND_NUM, self.MAX_RAND_NUM)
+            if random.random() < 0.3:
+                self.assertEqual(map1.remove(key), d.pop(key, None))
+            else:
+                d[key] = i
+                map1.put(key, i)
+            migrated = migrated or map1.is_migrating()
+            self.assertEqual(map1.get(key), d.get(key))
+            self.assertEqual(map1.has_key(key), key in d)
+            self.assertEqual(map1.size(), len(d))
+        self.assertTrue(migrated)
+        self.assertEqual(sorted(map1.keys()), sorted(d))
+
+    def test_bulk_operations(self):
+        map1 = HashTableSeparateChaining()
+        pairs = [(k, k * 2) for k in range(1000)]
+        map1.reserve(len(pairs))
+        capacity = map1.capacity
+        self.assertEqual(map1.put_many(iter(pairs)), len(pairs) * [None])
+        self.assertEqual(map1.capacity, capacity)
+        self.assertEqual(map1.size(), 1000)
+
+        keys = [k for k, _ in pairs] + [5000]
+        self.assertEqual(map1.get_many(keys), [v for _, v in pairs] + [None])
+        self.assertEqual(map1.remove_many(keys[:500]), [k * 2 for k in range(500)])
+        self.assertEqual(map1.size(), 500)
+
+    def test_entries_are_reused(self):
+        map1 = HashTableSeparateChaining()
+        for k in range(100):
+            map1.put(k, k)
+        for k in range(0, 100, 2):
+            self.assertEqual(map1.remove(k), k)
+        for k in range(100, 150):
+            map1.put(k, k)
+        # removed entries are taken from the free list
+        self.assertEqual(len(map1.entry_keys), 100)
+        self.assertEqual(map1.size(), 100)
+        expected = list(range(1, 100, 2)) + list(range(100, 150))
+        self.assertEqual(sorted(map1.keys()), expected)
+        self.assertEqual(sorted(map1.values()), sorted(map1.keys()))
+        for k in range(150):
+            self.assertEqual(map1.get(k), None if k < 100 and k % 2 == 0 else k)
+
+    def test_views(self):
+        map1 = HashTableSeparateChaining()
+        for k in range(30):
+            map1.put(k, -k)
+        keys = map1.keys()
+        self.assertEqual(len(keys), 30)
+        self.assertIn(3, keys)
+        self.assertNotIn(30, keys)
+        self.assertEqual(keys - set(range(29)), {29})
+        self.assertEqual(dict(map1.items()), {k: -k for k in range(30)})
+        self.assertIn(-3, map1.values())
+        self.assertEqual(sorted(map1.hash_iterator()), list(range(30)))
+
+        map1.remove(3)
+        self.assertEqual(len(keys), 29)
+        self.assertNotIn((3, -3), map1.items())
+        self.assertEqual(len([(a, b) for a in map1 for b in map1]), 29 * 29)
+        with self.assertRaises(RuntimeError):
+            for k in map1.keys():
+                map1.put(k, 0)
+
+    def test_seeded(self):
+        map1 = HashTableSeparateChaining(capacity=1024, max_load_factor=2)
+        map2 = HashTableSeparateChaining(capacity=1024, max_load_factor=2, seed=7)
+        for k in range(1000):
+            map1.put(k * 1024, k)
+            map2.put(k * 1024, k)
+        # one chain without the seed
+        self.assertEqual(map1.probe_count(0), 1000)
+        self.assertLess(max(map2.probe_count(k * 1024) for k in range(1000)), 20)
+        copy = pickle.loads(pickle.dumps(map2))
+        self.assertEqual(copy.seed, 7)
+        self.assertEqual(copy.get(5 * 1024), 5)
+
+    def test_deepcopy_object_keys(self):
+        class Key:
+            pass
+
+        ht = HashTableSeparateChaining()
+        keys = [Key() for _ in range(20)]
+        for i, k in enumerate(keys):
+            ht.put(k, i)
+        # the copied keys hash by identity, the cached hashes are not reused
+        copied = copy.deepcopy(ht)
+        for k, i in copied.items():
+            self.assertEqual(copied.get(k), i)
+        self.assertEqual(sorted(copied.values()), list(range(20)))
+
+    def test_pickle(self):
+        map1 = HashTableSeparateChaining()
+        for k in range(300):
+            map1.put(str(k), k)
+        for k in range(0, 300, 2):
+            map1.remove(str(k))
+        expected = {str(k): k for k in range(1, 300, 2)}
+
+        copy = pickle.loads(pickle.dumps(map1))
+        # the free list is not saved
+        self.assertEqual(len(copy.entry_keys), 150)
+        self.assertEqual(copy.capacity, map1.capacity)
+        self.assertEqual({k: copy.get(k) for k in copy.keys()}, expected)
+        for k in expected:
+            self.assertEqual(copy.probe_count(k), map1.probe_count(k))
+
+        state = map1.__getstate__()
+        state["fingerprint"] += 1
+        copy = HashTableSeparateChaining.__new__(HashTableSeparateChaining)
+        copy.__setstate__(state)
+        self.assertEqual({k: copy.get(k) for k in copy.keys()}, expected)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table")
+            map1.dump(path)
+            copy = HashTableSeparateChaining.load(path)
+        self.assertEqual(copy.size(), 150)
+        copy.put("new", 1)
+        self.assertEqual(copy.get("new"), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,110 @@
+"""
+Tests for HashTable Open Addressing: Swiss table
+"""
+import random
+import unittest
+from ht_hashing import mix64
+from ht_swiss import HashTableSwiss
+
+
+class TestHTSwiss(unittest.TestCase):
+    LOOPS = 100
+    MAX_SIZE = random.randint(1, 750)
+    MAX_RAND_NUM = random.randint(1, 350)
+
+    class CountedKey:
+        eq_calls = 0
+
+        def __init__(self, data, h=None):
+            self.data = data
+            self.h = hash(data) if h is None else h
+
+        def __hash__(self):
+            return self.h
+
+        def __eq__(self, other):
+            TestHTSwiss.CountedKey.eq_calls += 1
+            return self.data == other.data
+
+    def test_none_key(self):
+        with self.assertRaises(ValueError):
+            HashTableSwiss().put(None, 5)
+
+    def test_illegal_creation(self):
+        with self.assertRaises(ValueError):
+            HashTableSwiss(capacity=0)
+
+    def test_update_value(self):
+        ht = HashTableSwiss()
+        ht.add(1, 1)
+        ht.add(1, -7)
+        self.assertEqual(ht.get(1), -7)
+        self.assertEqual(ht.size(), 1)
+
+    def test_few_key_comparisons(self):
+        ht = HashTableSwiss()
+        keys = [self.CountedKey(f"key{i}") for i in range(5000)]
+        for k in keys:
+            ht.put(k, k.data)
+        self.CountedKey.eq_calls = 0
+        # equal but distinct objects, every hit needs one __eq__
+        for k in keys:
+            self.assertEqual(ht.get(self.CountedKey(k.data)), k.data)
+        for i in range(5000):
+            self.assertIsNone(ht.get(self.CountedKey(f"missing{i}")))
+        self.assertEqual(self.CountedKey.eq_calls, 5000)
+
+    def test_colliding_hashes(self):
+        # equal hashes, the whole probe sequence is shared
+        ht = HashTableSwiss()
+        keys = [self.CountedKey(i, h=42) for i in range(100)]
+        for k in keys:
+            ht.put(k, k.data)
+        for k in keys[::2]:
+            self.assertEqual(ht.remove(k), k.data)
+        for k in keys:
+            self.assertEqual(ht.get(k), None if k.data % 2 == 0 else k.data)
+        self.assertEqual(ht.size(), 50)
+
+    def test_sequential_int_keys(self):
+        # ints hash to themselves, unmixed they would share their first group
+        ht = HashTableSwiss()
+        n = 20000
+        for i in range(n):
+            ht.put(i, i)
+        probes = [ht.probe_count(i) for i in range(n)]
+        self.assertLess(sum(probes) / n, 1.2)
+        self.assertLessEqual(max(probes), 8)
+        # 128 consecutive keys are spread over many groups
+        groups = {ht.find_slot(i, mix64(i)) // ht.GROUP for i in range(128)}
+        self.assertGreater(len(groups), 100)
+
+    def test_deleted_slots_are_reused(self):
+        ht = HashTableSwiss()
+        for i in range(100000):
+            ht.put(i, i)
+            ht.remove(i - 10)
+        self.assertEqual(ht.size(), 10)
+        self.assertLessEqual(ht.get_capacity(), 64)
+
+    def test_random_map_operations(self):
+        for _ in range(self.LOOPS):
+            ht = HashTableSwiss(capacity=random.randint(1, 40))
+            d = {}
+            for i in range(self.MAX_SIZE):
+                key = random.randint(-self.MAX_RAND_NUM, self.MAX_RAND_NUM)
+                if random.random() < 0.3:
+                    self.assertEqual(ht.remove(key), d.pop(key, None))
+                else:
+                    d[key] = i
+                    self.assertEqual(ht.put(key, i), i)
+                self.assertEqual(ht.get(key), d.get(key))
+                self.assertEqual(ht.contains(key), key in d)
+                self.assertEqual(ht.size(), len(d))
+            self.assertEqual(sorted(ht), sorted(d))
+            ht.clear()
+            self.assertTrue(ht.is_empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
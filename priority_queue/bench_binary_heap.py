@@ -0,0 +1,104 @@
+"""
+Benchmark: BinaryHeap and MinIndexedDHeap against heapq
+
+Time per operation of n pushes followed by n polls of random floats, for
+BinaryHeap, MinIndexedDHeap with degree 2 and 4, and heapq.
+
+Building: compares, for n elements added to a heap of n elements:
+
+    add         n calls to add
+    push_many   one call to push_many
+    heapq       heapq.heappush per element, the C baseline
+
+for random elements and for descending ones, where every add swims up to
+the root. from_iterable is timed against n adds into an empty heap.
+
+usage: python bench_binary_heap.py [n ...]
+"""
+import heapq
+import random
+import sys
+import time
+from binary_heap import BinaryHeap
+from min_indexed_d_heap import MinIndexedDHeap
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def add_all(heap, xs):
+    add = heap.add
+    for x in xs:
+        add(x)
+
+
+def heappush_all(heap, xs):
+    push = heapq.heappush
+    for x in xs:
+        push(heap, x)
+
+
+# ns per push and per poll
+def push_poll(push, poll, n):
+    start = time.perf_counter()
+    for i in range(n):
+        push(i)
+    mid = time.perf_counter()
+    for _ in range(n):
+        poll()
+    end = time.perf_counter()
+    return (mid - start) / n * 1e9, (end - mid) / n * 1e9
+
+
+def per_op(n):
+    xs = [random.random() for _ in range(n)]
+
+    h = BinaryHeap()
+    yield "BinaryHeap", push_poll(lambda i: h.add(xs[i]), h.poll, n)
+
+    for degree in (2, 4):
+        d = MinIndexedDHeap(degree, n)
+        yield f"MinIndexedDHeap({degree})", push_poll(
+            lambda i: d.insert(i, xs[i]), d.poll_min_key_index, n
+        )
+
+    q = []
+    yield "heapq", push_poll(
+        lambda i: heapq.heappush(q, xs[i]), lambda: heapq.heappop(q), n
+    )
+
+
+def main(sizes):
+    for n in sizes:
+        for name, (push, poll) in per_op(n):
+            print(f"ops n={n:<8} {name:<20} push {push:6.0f} ns  poll {poll:6.0f} ns")
+
+        base = [random.random() + 1 for _ in range(n)]
+        inputs = [
+            ("random", [random.random() for _ in range(n)]),
+            ("descending", sorted((random.random() for _ in range(n)), reverse=True)),
+        ]
+        for name, xs in inputs:
+            h = BinaryHeap(list(base))
+            t_add = timed(lambda: add_all(h, xs))
+            h = BinaryHeap(list(base))
+            t_many = timed(lambda: h.push_many(xs))
+            h = list(base)
+            heapq.heapify(h)
+            t_heapq = timed(lambda: heappush_all(h, xs))
+            print(
+                f"push n={n:<8} {name:<10} add {t_add:8.3f}s  "
+                f"push_many {t_many:8.3f}s  heapq {t_heapq:8.3f}s"
+            )
+
+        xs = [random.random() for _ in range(n)]
+        t_add = timed(lambda: add_all(BinaryHeap(), xs))
+        t_build = timed(lambda: BinaryHeap.from_iterable(xs))
+        print(f"build n={n:<8} add {t_add:8.3f}s  from_iterable {t_build:8.3f}s")
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or [100_000])
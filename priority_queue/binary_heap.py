@@ -9,17 +9,79 @@ https://github.com/williamfiset/Algorithms/
 class BinaryHeap:
     heap = []
 
-    def __init__(self, xs=None):
+    # el => set of the indices of el in the heap, kept up to date by swap,
+    # add and remove_at. None unless the heap is created with indexed=True,
+    # which requires hashable elements and makes remove O(log(n)) and
+    # contains O(1)
+    positions = None
+
+    # key(el) is computed once, when el is added. With a key or reverse=True
+    # (max heap) the heap holds (key, seq, el) entries: seq numbers the
+    # entries in insertion order, so equal keys come out first in first out
+    # and the elements themselves are never compared. Entries of a max heap
+    # have -seq, so that the whole entry can be compared with >=
+    key = None
+    reverse = False
+    decorated = False
+    seq = 0
+
+    # the heap is built in the list xs itself, see from_iterable for a copy.
+    # A heap with a key or reverse=True builds a new list of entries
+    def __init__(self, xs=None, indexed=False, key=None, reverse=False):
+        self.key = key
+        self.reverse = reverse
+        self.decorated = key is not None or reverse
+        if indexed:
+            self.positions = {}
         if xs is None:
             self.heap = []
         else:
-            self.heap = xs
+            self.heap = [self.decorate(x) for x in xs] if self.decorated else xs
+            if indexed:
+                for i, x in enumerate(xs):
+                    self.index_add(x, i)
             self.heapify(self.heap)
 
+    # heap of the elements of any iterable, which is left untouched. O(n)
+    @classmethod
+    def from_iterable(cls, xs, indexed=False, key=None, reverse=False):
+        xs = list(xs)
+        if any(x is None for x in xs):
+            raise ValueError("None element cannot be added")
+        return cls(xs, indexed=indexed, key=key, reverse=reverse)
+
+    # heap entry of the element
+    def decorate(self, el):
+        if not self.decorated:
+            return el
+        self.seq += 1
+        key = el if self.key is None else self.key(el)
+        return (key, -self.seq if self.reverse else self.seq, el)
+
+    # element of the heap entry
+    def item(self, entry):
+        return entry[2] if self.decorated else entry
+
+    def is_indexed(self) -> bool:
+        return self.positions is not None
+
+    def index_add(self, el, i):
+        indices = self.positions.get(el)
+        if indices is None:
+            self.positions[el] = {i}
+        else:
+            indices.add(i)
+
+    def index_discard(self, el, i):
+        indices = self.positions[el]
+        indices.discard(i)
+        if not indices:
+            del self.positions[el]
+
     def heapify(self, xs):
         # heapify, O(n)
         heap_size = len(xs)
-        i = max(0, heap_size // 2 - 1)
+        i = heap_size // 2 - 1
         while i >= 0:
             self.sink(i)
             i -= 1
@@ -29,6 +91,8 @@ class BinaryHeap:
 
     def clear(self):
         self.heap.clear()
+        if self.positions is not None:
+            self.positions.clear()
 
     def size(self):
         return len(self.heap)
@@ -36,96 +100,239 @@ class BinaryHeap:
     def peek(self):
         if self.is_empty():
             return None
-        return self.heap[0]
+        return self.item(self.heap[0])
 
     # remote root
     def poll(self):
         return self.remove_at(0)
 
-    # O(n)
+    # O(n), O(1) if indexed
     def contains(self, el):
+        if self.positions is not None:
+            return el is not None and el in self.positions
+        if self.decorated:
+            return any(el == entry[2] for entry in self.heap)
         # solved in python way, another approach - iterate and if el ==
         # self.heap[x] => return True
         return el in self.heap
 
+    # the sifts move a hole instead of swapping: the element is lifted out,
+    # the elements on its way shift into the hole one write each, and the
+    # element is written once where the hole stops. Attributes are cached in
+    # locals and entries are compared inline, without less and swap calls
+
     # top down node sink O(log(n))
     def sink(self, k):
-        heap_size = self.size()
+        heap = self.heap
+        heap_size = len(heap)
+        positions = self.positions
+        reverse = self.reverse
+        el = heap[k]
+        if positions is not None:
+            indices = positions[self.item(el)]
+            indices.discard(k)
         while True:
             left = 2 * k + 1
-            right = 2 * k + 2
+            if left >= heap_size:
+                break
             # just an assumption that left is the smallest
             smallest = left
-
-            if right < heap_size and self.less(right, left):
-                smallest = right
+            right = left + 1
+            if right < heap_size:
+                a = heap[right]
+                b = heap[left]
+                if (a >= b) if reverse else (a <= b):
+                    smallest = right
 
             # stop if cannot sink anymore
-            if left >= heap_size or self.less(k, smallest):
+            child = heap[smallest]
+            if (el >= child) if reverse else (el <= child):
                 break
 
-            self.swap(smallest, k)
+            heap[k] = child
+            if positions is not None:
+                self.index_move(child, smallest, k)
             k = smallest
+        heap[k] = el
+        if positions is not None:
+            indices.add(k)
 
     # bottom up node swim O(log(n))
     def swim(self, k):
-        parent = (k - 1) // 2
-        while k > 0 and self.less(k, parent):
-            self.swap(parent, k)
+        heap = self.heap
+        positions = self.positions
+        reverse = self.reverse
+        el = heap[k]
+        if positions is not None:
+            indices = positions[self.item(el)]
+            indices.discard(k)
+        while k > 0:
+            parent = (k - 1) >> 1
+            p = heap[parent]
+            if (el <= p) if reverse else (el >= p):
+                break
+            heap[k] = p
+            if positions is not None:
+                self.index_move(p, parent, k)
             k = parent
-            parent = (k - 1) // 2
+        heap[k] = el
+        if positions is not None:
+            indices.add(k)
+
+    # the entry moved from index i to index j
+    def index_move(self, entry, i, j):
+        indices = self.positions[self.item(entry)]
+        indices.discard(i)
+        indices.add(j)
 
     def less(self, i, j):
+        if self.reverse:
+            return self.heap[i] >= self.heap[j]
         return self.heap[i] <= self.heap[j]
 
     def swap(self, i, j):
-        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+        heap = self.heap
+        if self.positions is not None:
+            a = self.positions[self.item(heap[i])]
+            b = self.positions[self.item(heap[j])]
+            # equal elements share the set, which stays the same
+            if a is not b:
+                a.discard(i)
+                a.add(j)
+                b.discard(j)
+                b.add(i)
+        heap[i], heap[j] = heap[j], heap[i]
 
     def add(self, el):
         if el is None:
             raise ValueError("None element cannot be added")
 
-        self.heap.append(el)
+        self.heap.append(self.decorate(el))
 
         index_of_last_el = self.size() - 1
+        if self.positions is not None:
+            self.index_add(el, index_of_last_el)
         self.swim(index_of_last_el)
 
-    # removes a particular element in the heap O(n)
+    # adds all elements of the iterable. A batch smaller than the heap swims
+    # element by element, O(k log(n)) but O(k) on average for random input;
+    # a larger one is appended and the whole heap is heapified, O(n + k)
+    def push_many(self, xs):
+        xs = list(xs)
+        if any(x is None for x in xs):
+            raise ValueError("None element cannot be added")
+
+        heap_size = self.size()
+        if self.decorated:
+            self.heap.extend([self.decorate(x) for x in xs])
+        else:
+            self.heap.extend(xs)
+        if self.positions is not None:
+            for i, x in enumerate(xs, heap_size):
+                self.index_add(x, i)
+        if len(xs) >= heap_size:
+            self.heapify(self.heap)
+        else:
+            for i in range(heap_size, self.size()):
+                self.swim(i)
+
+    # removes a particular element in the heap O(n), O(log(n)) if indexed
     def remove(self, el) -> bool:
         if el is None:
             return False
 
+        if self.positions is not None:
+            indices = self.positions.get(el)
+            if indices is None:
+                return False
+            self.remove_at(next(iter(indices)))
+            return True
+
         for i, x in enumerate(self.heap):
-            if el == x:
+            if el == self.item(x):
                 self.remove_at(i)
                 return True
 
         return False
 
-    # removes a node at particular index O(log(n))
+    # removes a node at particular index O(log(n)). Floyd's bottom up
+    # variant: the hole at i moves down to a leaf along the smaller children,
+    # one comparison per level, then the last element fills it and swims up.
+    # The last element is a leaf, it rarely swims far, while sinking it from
+    # i would take two comparisons per level all the way down
     def remove_at(self, i):
-        if self.is_empty():
+        heap = self.heap
+        if not heap:
             return None
 
-        index_of_last_el = self.size() - 1
-        removed_data = self.heap[i]
-        self.swap(i, index_of_last_el)
-
-        # removes the last el
-        self.heap.pop()
-
+        positions = self.positions
+        last = heap.pop()
+        index_of_last_el = len(heap)
         if i == index_of_last_el:
+            removed_data = self.item(last)
+            if positions is not None:
+                self.index_discard(removed_data, i)
             return removed_data
-        el = self.heap[i]
 
-        self.sink(i)
+        removed_data = self.item(heap[i])
+        if positions is not None:
+            self.index_discard(removed_data, i)
+            positions[self.item(last)].discard(index_of_last_el)
 
-        # if sinking does not work - try swim
-        if self.heap[i] == el:
-            self.swim(i)
+        reverse = self.reverse
+        heap_size = index_of_last_el
+        k = i
+        while True:
+            smallest = 2 * k + 1
+            if smallest >= heap_size:
+                break
+            right = smallest + 1
+            if right < heap_size:
+                a = heap[right]
+                b = heap[smallest]
+                if (a > b) if reverse else (a < b):
+                    smallest = right
+            child = heap[smallest]
+            heap[k] = child
+            if positions is not None:
+                self.index_move(child, smallest, k)
+            k = smallest
 
+        heap[k] = last
+        if positions is not None:
+            positions[self.item(last)].add(k)
+        self.swim(k)
         return removed_data
 
+    # replaces one occurrence of el by new and restores the heap property.
+    # O(n), O(log(n)) if indexed. Returns False if el is not in the heap
+    def update_priority(self, el, new) -> bool:
+        if el is None:
+            return False
+        if new is None:
+            raise ValueError("None element cannot be added")
+
+        if self.positions is not None:
+            indices = self.positions.get(el)
+            if indices is None:
+                return False
+            i = next(iter(indices))
+            self.index_discard(el, i)
+            self.index_add(new, i)
+        else:
+            for i, x in enumerate(self.heap):
+                if el == self.item(x):
+                    break
+            else:
+                return False
+
+        new = self.decorate(new)
+        self.heap[i] = new
+        self.sink(i)
+        if self.heap[i] == new:
+            self.swim(i)
+        return True
+
     # checks if heap is min
     # k is 0 - root of the heap, needs for recursion
     def is_min_heap(self, k) -> bool:
@@ -155,7 +362,7 @@ class BinaryHeap:
             level_nodes = 2**level
             for j in range(level_nodes):
                 if i < n:
-                    r += str(self.heap[i]) + " "
+                    r += str(self.item(self.heap[i])) + " "
                     i += 1
                 else:
                     break
@@ -0,0 +1,99 @@
+"""
+Indexed Priority Queue with hashable keys
+
+MinIndexedDHeap takes key indexes (ki) from [0, N). This wrapper gives any
+hashable key (str, tuple, ...) a ki of its own while the key is in the
+queue and takes it back when the key leaves, so the ki of removed keys are
+reused (free list) and the heap never grows beyond the largest number of
+keys it held at once.
+
+    pq = KeyedMinIndexedDHeap()
+    pq.insert("a", 5)
+    pq.decrease("a", 2)
+    pq.poll_min_key()   # "a"
+"""
+from min_indexed_d_heap import MinIndexedDHeap
+
+
+class KeyedMinIndexedDHeap:
+    def __init__(self, degree: int = 2, max_size: int = 16):
+        self.heap = MinIndexedDHeap(degree, max_size, growable=True)
+
+        # key => ki
+        self.slots = {}
+
+        # ki => key, None for a free ki
+        self.keys = []
+
+        # ki released by removed keys, used before new ones
+        self.free = []
+
+    def size(self) -> int:
+        return self.heap.size()
+
+    def is_empty(self) -> bool:
+        return self.heap.is_empty()
+
+    def contains(self, key) -> bool:
+        return key in self.slots
+
+    def insert(self, key, value):
+        if key in self.slots:
+            raise ValueError(f"Key already exists; received {key}")
+        self.heap.value_not_null_or_throw(value)
+
+        if self.free:
+            ki = self.free.pop()
+            self.keys[ki] = key
+        else:
+            ki = len(self.keys)
+            self.keys.append(key)
+        self.slots[key] = ki
+        self.heap.insert(ki, value)
+
+    def value_of(self, key):
+        return self.heap.value_of(self.slot_or_throw(key))
+
+    def peek_min_key(self):
+        return self.keys[self.heap.peek_min_key_index()]
+
+    def poll_min_key(self):
+        key = self.peek_min_key()
+        self.delete(key)
+        return key
+
+    def peek_min_value(self):
+        return self.heap.peek_min_value()
+
+    def poll_min_value(self):
+        value = self.peek_min_value()
+        self.delete(self.peek_min_key())
+        return value
+
+    # removes the key and returns its value
+    def delete(self, key):
+        ki = self.slot_or_throw(key)
+        value = self.heap.delete(ki)
+        del self.slots[key]
+        self.keys[ki] = None
+        self.free.append(ki)
+        return value
+
+    def update(self, key, value):
+        return self.heap.update(self.slot_or_throw(key), value)
+
+    def decrease(self, key, value):
+        self.heap.decrease(self.slot_or_throw(key), value)
+
+    def increase(self, key, value):
+        self.heap.increase(self.slot_or_throw(key), value)
+
+    def slot_or_throw(self, key) -> int:
+        ki = self.slots.get(key)
+        if ki is None:
+            raise ValueError(f"Key does not exist; {key}")
+        return ki
+
+    # test fn
+    def is_min_heap(self) -> bool:
+        return self.heap.is_min_heap()
@@ -8,5 +8,5 @@ from min_indexed_d_heap import MinIndexedDHeap
 
 
 class MinIndexedBinaryHeap(MinIndexedDHeap):
-    def __init__(self, max_size: int):
-        super().__init__(2, max_size)
+    def __init__(self, max_size: int, growable=False):
+        super().__init__(2, max_size, growable)
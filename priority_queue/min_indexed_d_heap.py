@@ -4,10 +4,15 @@ Indexed Priority Queue
 Inspired by William Fiset Java implementation
 https://github.com/williamfiset/Algorithms/
 """
+from array import array
 
 
 class MinIndexedDHeap:
-    def __init__(self, degree: int, max_size: int):
+    # growable=True: max_size is only the initial size, the arrays double
+    # when a key index does not fit. The index arrays are then 64 bit int
+    # arrays, a list holds a pointer and an int object per index, about 4x
+    # the memory, but reads from a list are faster as no int is created
+    def __init__(self, degree: int, max_size: int, growable=False):
         if max_size <= 0:
             raise ValueError("max_size <= 0")
 
@@ -17,16 +22,17 @@ class MinIndexedDHeap:
         # max number of elements in the heap
         self.N = max(self.D + 1, max_size)
 
+        self.growable = growable
+
         # inverse map = stores indexes of the keys in the range (0, sz] which
         # make up the PQ. im is inverse of pm, so pm[im[i]] = im[pm[i]] = i
-        self.im = [-1] * self.N
+        self.im = self.index_array(self.N)
 
         # position map maps Key Indexes (ki)
-        self.pm = [-1] * self.N
+        self.pm = self.index_array(self.N)
 
-        # lookup arrays to track the child/parent indexes of each node
-        self.child = [0] * self.N
-        self.parent = [0] * self.N
+        # children of node i are i * D + 1 ... i * D + D, its parent is
+        # (i - 1) // D
 
         # values associated with the key. This array is indexed by the key
         # indexes (ki)
@@ -36,9 +42,19 @@ class MinIndexedDHeap:
         # current number of elements in the heap
         self.sz = 0
 
-        for i in range(self.N):
-            self.parent[i] = (i - 1) // self.D
-            self.child[i] = i * self.D + 1
+    def index_array(self, n: int):
+        if self.growable:
+            return array("q", [-1]) * n
+        return [-1] * n
+
+    # grows the arrays to at least n, doubling them
+    def grow(self, n: int):
+        n = max(n, 2 * self.N)
+        extra = n - self.N
+        self.im.extend(self.index_array(extra))
+        self.pm.extend(self.index_array(extra))
+        self.values.extend([None] * extra)
+        self.N = n
 
     def size(self) -> int:
         return self.sz
@@ -48,7 +64,7 @@ class MinIndexedDHeap:
 
     def contains(self, ki: int) -> bool:
         self.key_in_bounds_or_throw(ki)
-        return self.pm[ki] != -1
+        return ki < self.N and self.pm[ki] != -1
 
     def peek_min_key_index(self) -> int:
         self.is_not_empty_or_throw()
@@ -73,6 +89,8 @@ class MinIndexedDHeap:
             raise ValueError(f"Index already exists; received {ki}")
         self.value_not_null_or_throw(value)
 
+        if ki >= self.N:
+            self.grow(ki + 1)
         self.pm[ki] = self.sz
         self.im[self.sz] = ki
         self.values[ki] = value
@@ -83,13 +101,38 @@ class MinIndexedDHeap:
         self.key_exists_or_throw(ki)
         return self.values[ki]
 
+    # Floyd's bottom up variant: the hole left by ki moves down to a leaf
+    # along the smallest children, D - 1 comparisons per level, then the last
+    # key fills it and swims up, usually not far
     def delete(self, ki: int):
         self.key_exists_or_throw(ki)
-        i = self.pm[ki]
-        self.swap(i, self.sz - 1)
+        im = self.im
+        pm = self.pm
+        values = self.values
+        D = self.D
+        i = pm[ki]
         self.sz -= 1
-        self.sink(i)
-        self.swim(i)
+        sz = self.sz
+        last = im[sz]
+        if i != sz:
+            while True:
+                start = i * D + 1
+                if start >= sz:
+                    break
+                j = start
+                min_value = values[im[start]]
+                for c in range(start + 1, min(sz, start + D)):
+                    v = values[im[c]]
+                    if v < min_value:
+                        j = c
+                        min_value = v
+                cki = im[j]
+                im[i] = cki
+                pm[cki] = i
+                i = j
+            im[i] = last
+            pm[last] = i
+            self.swim(i)
         value = self.values[ki]
         self.values[ki] = None
         self.pm[ki] = -1
@@ -118,21 +161,58 @@ class MinIndexedDHeap:
             self.sink(self.pm[ki])
 
     # helper fn
+    # sink and swim move a hole: the key index is lifted out of im, the ones
+    # on its way shift into the hole and it is written once where the hole
+    # stops. Locals instead of attributes, no less/swap/min_child calls
     def sink(self, i: int):
-        j = self.min_child(i)
-        while j != -1:
-            self.swap(i, j)
+        im = self.im
+        pm = self.pm
+        values = self.values
+        D = self.D
+        sz = self.sz
+        ki = im[i]
+        value = values[ki]
+        while True:
+            start = i * D + 1
+            if start >= sz:
+                break
+            j = start
+            min_value = values[im[start]]
+            for c in range(start + 1, min(sz, start + D)):
+                v = values[im[c]]
+                if v < min_value:
+                    j = c
+                    min_value = v
+            if not min_value < value:
+                break
+            cki = im[j]
+            im[i] = cki
+            pm[cki] = i
             i = j
-            j = self.min_child(i)
+        im[i] = ki
+        pm[ki] = i
 
     def swim(self, i: int):
-        while i > 0 and self.less(i, self.parent[i]):
-            self.swap(i, self.parent[i])
-            i = self.parent[i]
+        im = self.im
+        pm = self.pm
+        values = self.values
+        D = self.D
+        ki = im[i]
+        value = values[ki]
+        while i > 0:
+            p = (i - 1) // D
+            pki = im[p]
+            if not value < values[pki]:
+                break
+            im[i] = pki
+            pm[pki] = i
+            i = p
+        im[i] = ki
+        pm[ki] = i
 
     def min_child(self, i: int) -> int:
         index = -1
-        start = self.child[i]
+        start = i * self.D + 1
         end = min(self.sz, start + self.D)
         j = start
         for j in range(start, end):
@@ -182,7 +262,7 @@ class MinIndexedDHeap:
             raise ValueError("value cannot be None")
 
     def key_in_bounds_or_throw(self, ki: int):
-        if ki < 0 or ki >= self.N:
+        if ki < 0 or ki >= self.N and not self.growable:
             raise ValueError(f"Key index out of bounds; {ki}")
 
     # test fn
@@ -190,11 +270,11 @@ class MinIndexedDHeap:
         return self._is_min_heap(0)
 
     def _is_min_heap(self, i: int) -> bool:
-        from_ = self.child[i]
+        from_ = i * self.D + 1
         to_ = min(self.sz, from_ + self.D)
         j = from_
         while j < to_:
-            if not self.less(i, j):
+            if self.less(j, i):
                 return False
             if not self._is_min_heap(j):
                 return False
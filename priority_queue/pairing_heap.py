@@ -0,0 +1,291 @@
+"""
+Pairing Heap
+
+A heap ordered multiway tree: every node is before its children, the root
+is the first element. Children of a node form a doubly linked list (child,
+sibling, prev; prev of the first child is the parent).
+
+    add, meld, decrease_key     O(1)
+    poll, delete                O(log(n)) amortized
+
+add returns the node of the element, a handle for decrease_key, update and
+delete. meld takes all nodes of another heap in O(1), the handles stay
+valid.
+
+Every node refers to the token of its heap (owner). meld forwards the token
+of the other heap to this one instead of visiting the nodes, clear gives the
+heap a new token. A handle whose owner does not lead to the token of the
+heap, because it was polled, deleted, cleared or belongs to another heap, is
+rejected with ValueError.
+
+https://en.wikipedia.org/wiki/Pairing_heap
+"""
+
+
+class PairingHeapToken:
+    __slots__ = ("melded_into",)
+
+    def __init__(self):
+        # token of the heap this one was melded into
+        self.melded_into = None
+
+
+class PairingHeapNode:
+    __slots__ = ("item", "key", "child", "sibling", "prev", "owner")
+
+    def __init__(self, item, key, owner):
+        self.item = item
+        self.key = key
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+        # token of the heap, None once the node is polled or deleted
+        self.owner = owner
+
+
+class PairingHeap:
+    root = None
+    sz = 0
+
+    # key(el) is computed once, when el is added, the elements themselves
+    # are never compared. reverse=True makes a max heap
+    key = None
+    reverse = False
+
+    # owner of the nodes, see PairingHeapToken
+    token = None
+
+    def __init__(self, xs=None, key=None, reverse=False):
+        self.key = key
+        self.reverse = reverse
+        self.token = PairingHeapToken()
+        if xs is not None:
+            self.push_many(xs)
+
+    @classmethod
+    def from_iterable(cls, xs, key=None, reverse=False):
+        return cls(xs, key=key, reverse=reverse)
+
+    def is_empty(self):
+        return self.sz == 0
+
+    # outstanding handles become invalid
+    def clear(self):
+        self.root = None
+        self.sz = 0
+        self.token = PairingHeapToken()
+
+    def size(self):
+        return self.sz
+
+    def peek(self):
+        if self.root is None:
+            return None
+        return self.root.item
+
+    # whether key a goes before key b
+    def before(self, a, b) -> bool:
+        if self.reverse:
+            return a >= b
+        return a <= b
+
+    def key_of(self, el):
+        if el is None:
+            raise ValueError("None element cannot be added")
+        return el if self.key is None else self.key(el)
+
+    # the node which goes first becomes the parent of the other one
+    def link(self, a, b):
+        if not self.before(a.key, b.key):
+            a, b = b, a
+        child = a.child
+        b.prev = a
+        b.sibling = child
+        if child is not None:
+            child.prev = b
+        a.child = b
+        a.sibling = None
+        a.prev = None
+        return a
+
+    # two pass pairing of a list of siblings: link them in pairs from left
+    # to right, then link the pairs from right to left into one tree
+    def merge_pairs(self, first):
+        pairs = []
+        while first is not None:
+            a = first
+            b = a.sibling
+            if b is None:
+                first = None
+            else:
+                first = b.sibling
+                a = self.link(a, b)
+            pairs.append(a)
+
+        if not pairs:
+            return None
+        root = pairs.pop()
+        while pairs:
+            root = self.link(pairs.pop(), root)
+        root.sibling = None
+        root.prev = None
+        return root
+
+    # takes the node with its subtree out of the list of its siblings
+    def cut(self, node):
+        prev = node.prev
+        sibling = node.sibling
+        if prev.child is node:
+            prev.child = sibling
+        else:
+            prev.sibling = sibling
+        if sibling is not None:
+            sibling.prev = prev
+        node.sibling = None
+        node.prev = None
+
+    # returns the node of the element, O(1)
+    def add(self, el):
+        node = PairingHeapNode(el, self.key_of(el), self.token)
+        self.root = node if self.root is None else self.link(self.root, node)
+        self.sz += 1
+        return node
+
+    def push_many(self, xs):
+        return [self.add(x) for x in xs]
+
+    # removes the root O(log(n)) amortized
+    def poll(self):
+        root = self.root
+        if root is None:
+            return None
+        self.root = self.merge_pairs(root.child)
+        root.child = None
+        root.owner = None
+        self.sz -= 1
+        return root.item
+
+    # moves all elements of other into this heap in O(1), other is empty
+    # afterwards. The nodes keep the keys other computed for them, only the
+    # order must be the same
+    def meld(self, other):
+        if other.reverse != self.reverse:
+            raise ValueError("Heaps with different order cannot be melded")
+        if other is self or other.root is None:
+            return
+        if self.root is None:
+            self.root = other.root
+        else:
+            self.root = self.link(self.root, other.root)
+        self.sz += other.sz
+        other.token.melded_into = self.token
+        other.clear()
+
+    # replaces the element of the node by el, which must not go after it.
+    # O(1): the subtree of the node is cut off and linked with the root
+    def decrease_key(self, node, el):
+        self.attached_or_throw(node)
+        key = self.key_of(el)
+        if not self.before(key, node.key):
+            raise ValueError("New element goes after the current one")
+
+        node.item = el
+        node.key = key
+        if node is not self.root:
+            self.cut(node)
+            self.root = self.link(self.root, node)
+
+    # removes the node from the heap O(log(n)) amortized
+    def delete(self, node):
+        self.attached_or_throw(node)
+        if node is self.root:
+            return self.poll()
+
+        self.cut(node)
+        subtree = self.merge_pairs(node.child)
+        node.child = None
+        node.owner = None
+        if subtree is not None:
+            self.root = self.link(self.root, subtree)
+        self.sz -= 1
+        return node.item
+
+    # replaces the element of the node by any el
+    def update(self, node, el):
+        self.attached_or_throw(node)
+        key = self.key_of(el)
+        if self.before(key, node.key):
+            self.decrease_key(node, el)
+            return
+
+        # the node goes later: its children take its place, it is linked
+        # again as a single node
+        self.delete(node)
+        node.item = el
+        node.key = key
+        node.owner = self.token
+        self.root = node if self.root is None else self.link(self.root, node)
+        self.sz += 1
+
+    def attached_or_throw(self, node):
+        token = node.owner
+        if token is None:
+            raise ValueError("Node is not in the heap")
+        while token.melded_into is not None:
+            token = token.melded_into
+        # path compression, the next check is one step
+        node.owner = token
+        if token is not self.token:
+            raise ValueError("Node is not in the heap")
+
+    # node of the element O(n)
+    def find(self, el):
+        if el is None or self.root is None:
+            return None
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.item == el:
+                return node
+            if node.child is not None:
+                stack.append(node.child)
+            if node.sibling is not None:
+                stack.append(node.sibling)
+        return None
+
+    # O(n)
+    def contains(self, el):
+        return self.find(el) is not None
+
+    # removes a particular element in the heap O(n)
+    def remove(self, el) -> bool:
+        node = self.find(el)
+        if node is None:
+            return False
+        self.delete(node)
+        return True
+
+    # replaces one occurrence of el by new O(n). Returns False if el is not
+    # in the heap
+    def update_priority(self, el, new) -> bool:
+        node = self.find(el)
+        if node is None:
+            return False
+        self.update(node, new)
+        return True
+
+    # checks that every node goes before its children
+    def is_min_heap(self) -> bool:
+        if self.root is None:
+            return True
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            child = node.child
+            while child is not None:
+                if not self.before(node.key, child.key):
+                    return False
+                stack.append(child)
+                child = child.sibling
+        return True
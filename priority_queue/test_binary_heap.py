@@ -54,6 +54,106 @@ class TestBinaryHeap(unittest.TestCase):
             while len(pq2) > 0:
                 self.assertEqual(pq.poll(), heapq.heappop(pq2))
 
+    def test_from_iterable(self):
+        lst = self.gen_rand_array(self.MAX_SZ)
+        copy = list(lst)
+        pq = BinaryHeap.from_iterable(x for x in lst)
+        self.assertEqual(lst, copy)
+        self.assertTrue(pq.is_min_heap(0))
+        for x in sorted(lst):
+            self.assertEqual(pq.poll(), x)
+
+        with self.assertRaises(ValueError):
+            BinaryHeap.from_iterable([1, None])
+
+    def test_push_many(self):
+        for i in range(self.LOOPS):
+            lst = self.gen_rand_array(i)
+            # batches smaller and larger than the heap
+            batch = self.gen_rand_array(random.randint(0, 2 * i))
+            pq = BinaryHeap(list(lst))
+            pq.push_many(iter(batch))
+            self.assertTrue(pq.is_min_heap(0))
+            for x in sorted(lst + batch):
+                self.assertEqual(pq.poll(), x)
+
+        with self.assertRaises(ValueError):
+            BinaryHeap().push_many([None])
+
+    def test_indexed_randomized(self):
+        for i in range(self.LOOPS):
+            lst = self.gen_rand_array(i)
+            pq = BinaryHeap(list(lst), indexed=True)
+            pq.push_many(self.gen_rand_array(i // 3))
+            h = list(pq.heap)
+            heapq.heapify(h)
+
+            for _ in range(2 * i):
+                x = random.randint(0, self.MAX_SZ)
+                op = random.random()
+                if op < 0.3:
+                    pq.add(x)
+                    heapq.heappush(h, x)
+                elif op < 0.6:
+                    self.assertEqual(pq.remove(x), x in h)
+                    if x in h:
+                        h.remove(x)
+                        heapq.heapify(h)
+                elif op < 0.8:
+                    new = random.randint(0, self.MAX_SZ)
+                    self.assertEqual(pq.update_priority(x, new), x in h)
+                    if x in h:
+                        h[h.index(x)] = new
+                        heapq.heapify(h)
+                elif h:
+                    self.assertEqual(pq.poll(), heapq.heappop(h))
+
+                self.assertTrue(pq.is_min_heap(0))
+                self.assertEqual(pq.contains(x), x in h)
+                for el, indices in pq.positions.items():
+                    self.assertTrue(all(pq.heap[j] == el for j in indices))
+                self.assertEqual(sum(map(len, pq.positions.values())), pq.size())
+
+            pq.clear()
+            self.assertFalse(pq.contains(0))
+
+    def test_update_priority(self):
+        for indexed in (False, True):
+            pq = BinaryHeap([5, 3, 8, 1], indexed=indexed)
+            self.assertTrue(pq.update_priority(8, 0))
+            self.assertEqual(pq.peek(), 0)
+            self.assertTrue(pq.update_priority(0, 9))
+            self.assertFalse(pq.update_priority(42, 1))
+            self.assertEqual([pq.poll() for _ in range(4)], [1, 3, 5, 9])
+
+    def test_key(self):
+        # dicts are not comparable, only their keys are compared
+        tasks = [{"name": str(i), "due": random.randint(0, 20)} for i in range(50)]
+        pq = BinaryHeap.from_iterable(tasks, key=lambda t: t["due"])
+        out = [pq.poll() for _ in range(len(tasks))]
+        # stable: equal keys come out in insertion order
+        self.assertEqual(out, sorted(tasks, key=lambda t: t["due"]))
+
+    def test_reverse(self):
+        for i in range(self.LOOPS):
+            lst = self.gen_rand_array(i)
+            pq = BinaryHeap(reverse=True)
+            pq.push_many(lst[: i // 2])
+            for x in lst[i // 2 :]:
+                pq.add(x)
+            self.assertTrue(pq.is_min_heap(0))
+            self.assertEqual([pq.poll() for _ in lst], sorted(lst, reverse=True))
+
+    def test_reverse_key_indexed(self):
+        words = ["bb", "a", "dddd", "ccc", "ee"]
+        pq = BinaryHeap(list(words), indexed=True, key=len, reverse=True)
+        self.assertEqual(pq.peek(), "dddd")
+        self.assertTrue(pq.contains("a"))
+        self.assertTrue(pq.remove("ccc"))
+        self.assertFalse(pq.contains("ccc"))
+        self.assertTrue(pq.update_priority("a", "fffff"))
+        self.assertEqual([pq.poll() for _ in range(4)], ["fffff", "dddd", "bb", "ee"])
+
     def test_clear(self):
         lst = ["aa", "bb", "cc", "dd", "ee"]
         q = BinaryHeap(lst)
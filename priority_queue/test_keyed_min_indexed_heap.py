@@ -0,0 +1,96 @@
+"""
+Tests for Indexed Priority Queue with hashable keys
+"""
+import random
+import unittest
+from keyed_min_indexed_d_heap import KeyedMinIndexedDHeap
+
+
+class TestKeyedMinIndexedDHeap(unittest.TestCase):
+    def test_empty(self):
+        pq = KeyedMinIndexedDHeap()
+        self.assertTrue(pq.is_empty())
+        self.assertFalse(pq.contains("a"))
+        with self.assertRaises(ValueError):
+            pq.poll_min_key()
+
+    def test_keys(self):
+        pq = KeyedMinIndexedDHeap(degree=4)
+        pq.insert("a", 5)
+        pq.insert(("x", 1), 3)
+        pq.insert("c", 7)
+        with self.assertRaises(ValueError):
+            pq.insert("a", 1)
+        with self.assertRaises(ValueError):
+            pq.decrease("missing", 1)
+
+        pq.decrease("c", 1)
+        self.assertEqual(pq.peek_min_key(), "c")
+        pq.increase("c", 10)
+        self.assertEqual(pq.update("a", 2), 5)
+        self.assertEqual(pq.value_of("a"), 2)
+        self.assertEqual(pq.poll_min_key(), "a")
+        self.assertFalse(pq.contains("a"))
+        self.assertEqual(pq.poll_min_value(), 3)
+        self.assertEqual(pq.delete("c"), 10)
+        self.assertTrue(pq.is_empty())
+
+    def test_slots_are_reused(self):
+        pq = KeyedMinIndexedDHeap(max_size=4)
+        for round_ in range(100):
+            for i in range(10):
+                pq.insert(f"{round_}:{i}", random.random())
+            for _ in range(10):
+                pq.poll_min_key()
+        self.assertEqual(len(pq.keys), 10)
+        self.assertLessEqual(pq.heap.N, 16)
+
+    def test_randomized(self):
+        pq = KeyedMinIndexedDHeap()
+        expected = {}
+        for _ in range(2000):
+            key = (random.randint(0, 50), "node")
+            value = random.randint(0, 1000)
+            op = random.random()
+            if key not in expected:
+                pq.insert(key, value)
+                expected[key] = value
+            elif op < 0.3:
+                self.assertEqual(pq.delete(key), expected.pop(key))
+            elif op < 0.6:
+                pq.update(key, value)
+                expected[key] = value
+            else:
+                min_value = min(expected.values())
+                key = pq.poll_min_key()
+                self.assertEqual(expected.pop(key), min_value)
+            self.assertEqual(pq.size(), len(expected))
+            self.assertTrue(pq.is_min_heap())
+            if expected:
+                self.assertEqual(pq.peek_min_value(), min(expected.values()))
+
+    def test_dijkstra(self):
+        graph = {
+            "a": {"b": 4, "c": 1},
+            "b": {"d": 1},
+            "c": {"b": 2, "d": 5},
+            "d": {},
+        }
+        dist = {"a": 0}
+        pq = KeyedMinIndexedDHeap()
+        pq.insert("a", 0)
+        while not pq.is_empty():
+            d = pq.peek_min_value()
+            node = pq.poll_min_key()
+            for nxt, w in graph[node].items():
+                if d + w < dist.get(nxt, float("inf")):
+                    dist[nxt] = d + w
+                    if pq.contains(nxt):
+                        pq.decrease(nxt, d + w)
+                    else:
+                        pq.insert(nxt, d + w)
+        self.assertEqual(dist, {"a": 0, "b": 3, "c": 1, "d": 4})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -246,6 +246,27 @@ class TestMinIndexedBinaryHeap(unittest.TestCase):
             if pq2:
                 self.assertEqual(pq1.peek_min_value(), pq2[0])
 
+    def test_growable(self):
+        pq = MinIndexedBinaryHeap(1, growable=True)
+        self.assertFalse(pq.contains(1000))
+        with self.assertRaises(ValueError):
+            pq.contains(-1)
+
+        indexes = self.gen_unique_rand_list(500)
+        pq2 = []
+        for ki in indexes:
+            pq.insert(ki * 7, ki)
+            heapq.heappush(pq2, ki)
+            self.assertTrue(pq.contains(ki * 7))
+        self.assertGreaterEqual(pq.N, 7 * 499 + 1)
+        self.assertTrue(pq.is_min_heap())
+        while pq2:
+            self.assertEqual(pq.poll_min_value(), heapq.heappop(pq2))
+        self.assertTrue(pq.is_empty())
+
+        with self.assertRaises(ValueError):
+            MinIndexedBinaryHeap(10).insert(10, 1)
+
     def sort_pairs_by_value(self, pairs):
         return sorted(pairs, key=lambda x: x[1])
 
@@ -0,0 +1,189 @@
+"""
+Tests for Pairing Heap
+"""
+import heapq
+import random
+import unittest
+from pairing_heap import PairingHeap
+
+
+class TestPairingHeap(unittest.TestCase):
+    LOOPS = 100
+    MAX_SZ = 100
+
+    def test_empty(self):
+        q = PairingHeap()
+        self.assertEqual(q.size(), 0)
+        self.assertTrue(q.is_empty())
+        self.assertEqual(q.poll(), None)
+        self.assertEqual(q.peek(), None)
+
+    def test_none_element(self):
+        with self.assertRaises(ValueError):
+            PairingHeap().add(None)
+
+    def test_randomized_polling(self):
+        for i in range(self.LOOPS):
+            lst = self.gen_rand_array(i)
+            pq = PairingHeap.from_iterable(lst)
+            self.assertTrue(pq.is_min_heap())
+            self.assertEqual(pq.size(), len(lst))
+            self.assertEqual([pq.poll() for _ in lst], sorted(lst))
+            self.assertTrue(pq.is_empty())
+
+    def test_meld(self):
+        for i in range(self.LOOPS):
+            a = self.gen_rand_array(i)
+            b = self.gen_rand_array(self.MAX_SZ - i)
+            pa = PairingHeap(a)
+            pb = PairingHeap(b)
+            handles = pb.push_many([-1, -2])
+            pa.meld(pb)
+            self.assertTrue(pb.is_empty())
+            self.assertEqual(pa.size(), len(a) + len(b) + 2)
+            # handles of the melded heap stay valid
+            pa.decrease_key(handles[0], -3)
+            self.assertEqual(pa.poll(), -3)
+            rest = [pa.poll() for _ in range(pa.size())]
+            self.assertEqual(rest, sorted(a + b + [-2]))
+
+        with self.assertRaises(ValueError):
+            PairingHeap().meld(PairingHeap(reverse=True))
+
+        pa = PairingHeap(["bb", "a"], key=len)
+        pa.meld(PairingHeap(["ccc"], key=lambda w: len(w)))
+        self.assertEqual([pa.poll() for _ in range(3)], ["a", "bb", "ccc"])
+
+    def test_decrease_key(self):
+        pq = PairingHeap()
+        nodes = {x: pq.add(x) for x in range(10, 30)}
+        pq.decrease_key(nodes[25], 5)
+        self.assertEqual(pq.peek(), 5)
+        pq.decrease_key(nodes[20], 12)
+        with self.assertRaises(ValueError):
+            pq.decrease_key(nodes[15], 16)
+        self.assertTrue(pq.is_min_heap())
+        expected = sorted([x for x in range(10, 30) if x not in (20, 25)] + [5, 12])
+        self.assertEqual([pq.poll() for _ in range(20)], expected)
+
+    def test_stale_handle(self):
+        pq = PairingHeap()
+        nodes = pq.push_many([1, 2, 3, 4])
+        self.assertEqual(pq.poll(), 1)
+        self.assertEqual(pq.delete(nodes[2]), 3)
+        for node in (nodes[0], nodes[2]):
+            with self.assertRaises(ValueError):
+                pq.delete(node)
+            with self.assertRaises(ValueError):
+                pq.decrease_key(node, 0)
+            with self.assertRaises(ValueError):
+                pq.update(node, 5)
+        self.assertEqual(pq.size(), 2)
+        pq.update(nodes[1], 5)
+        pq.decrease_key(nodes[1], 0)
+        self.assertEqual([pq.poll() for _ in range(2)], [0, 4])
+
+    def test_handles_after_clear(self):
+        pq = PairingHeap()
+        a = pq.add(5)
+        b = pq.add(7)
+        pq.clear()
+        with self.assertRaises(ValueError):
+            pq.delete(b)
+        with self.assertRaises(ValueError):
+            pq.decrease_key(a, 1)
+        self.assertEqual(pq.size(), 0)
+        c = pq.add(3)
+        pq.decrease_key(c, 1)
+        self.assertEqual(pq.poll(), 1)
+
+    def test_handles_of_other_heap(self):
+        pa, pb, pc = PairingHeap(), PairingHeap(), PairingHeap()
+        a = pa.add(1)
+        b = pb.add(2)
+        with self.assertRaises(ValueError):
+            pc.decrease_key(b, 0)
+        with self.assertRaises(ValueError):
+            pa.delete(b)
+        self.assertEqual((pb.size(), pb.peek()), (1, 2))
+        # after meld the handles of pb belong to pa, then to pc
+        pa.meld(pb)
+        with self.assertRaises(ValueError):
+            pb.delete(b)
+        pa.decrease_key(b, 0)
+        pc.meld(pa)
+        with self.assertRaises(ValueError):
+            pa.delete(a)
+        self.assertEqual(pc.delete(a), 1)
+        self.assertEqual([pc.poll(), pc.size()], [0, 0])
+
+    def test_randomized_handles(self):
+        for i in range(self.LOOPS):
+            pq = PairingHeap()
+            nodes = []
+            h = []
+            for _ in range(2 * i):
+                op = random.random()
+                if op < 0.4 or not nodes:
+                    x = random.randint(0, self.MAX_SZ)
+                    nodes.append(pq.add(x))
+                    h.append(x)
+                elif op < 0.6:
+                    node = nodes.pop(random.randrange(len(nodes)))
+                    h.remove(pq.delete(node))
+                elif op < 0.8:
+                    node = random.choice(nodes)
+                    new = random.randint(-self.MAX_SZ, self.MAX_SZ)
+                    h.remove(node.item)
+                    h.append(new)
+                    pq.update(node, new)
+                else:
+                    x = pq.poll()
+                    self.assertEqual(x, min(h))
+                    h.remove(x)
+                    nodes = self.live_nodes(pq)
+                self.assertTrue(pq.is_min_heap())
+                self.assertEqual(pq.size(), len(h))
+            self.assertEqual([pq.poll() for _ in h], sorted(h))
+
+    def test_key_and_reverse(self):
+        words = ["bb", "a", "dddd", "ccc", "ee"]
+        pq = PairingHeap(words, key=len, reverse=True)
+        self.assertEqual(pq.peek(), "dddd")
+        self.assertTrue(pq.remove("ccc"))
+        self.assertFalse(pq.contains("ccc"))
+        self.assertTrue(pq.update_priority("a", "fffff"))
+        self.assertFalse(pq.update_priority("zz", "z"))
+        self.assertEqual(pq.poll(), "fffff")
+        self.assertEqual(pq.poll(), "dddd")
+        self.assertEqual(sorted([pq.poll(), pq.poll()]), ["bb", "ee"])
+
+    def test_against_heapq(self):
+        lst = self.gen_rand_array(self.MAX_SZ)
+        pq = PairingHeap()
+        h = []
+        for x in lst:
+            pq.add(x)
+            heapq.heappush(h, x)
+            if random.random() < 0.3:
+                self.assertEqual(pq.poll(), heapq.heappop(h))
+            self.assertEqual(pq.peek(), h[0] if h else None)
+
+    def live_nodes(self, pq):
+        nodes = []
+        stack = [pq.root] if pq.root is not None else []
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            if node.child is not None:
+                stack.append(node.child)
+            if node.sibling is not None:
+                stack.append(node.sibling)
+        return nodes
+
+    def gen_rand_array(self, sz: int):
+        return [random.randint(0, self.MAX_SZ) for _ in range(sz)]
+
+
+if __name__ == "__main__":
+    unittest.main()